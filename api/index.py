@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Vercel's Python runtime serves the WSGI `app` from this module; every path
+# without a file in the exported public/ folder is rewritten here
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402,F401
@@ -1,43 +1,144 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file, make_response, abort, get_template_attribute, g, has_app_context, has_request_context
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SecureCookieSession, SecureCookieSessionInterface
+from flask.signals import request_started, request_finished, before_render_template, template_rendered
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, select, func, text, and_, or_, bindparam
+from sqlalchemy.orm import with_loader_criteria
+from sqlalchemy.schema import CreateTable, CreateIndex
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from flask_mail import Mail, Message
 from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
+from werkzeug.utils import secure_filename, send_file as werkzeug_send_file
+from werkzeug.middleware.proxy_fix import ProxyFix
+from markupsafe import Markup, escape
+from jinja2 import FileSystemBytecodeCache
+import click
 import os
-from datetime import datetime
+import sys
+import io
+import shutil
+import sqlite3
+import re
+import json
+import tempfile
+import subprocess
+import smtplib
+import uuid
+import hashlib
+import secrets
+import base64
+import bisect
+import gzip
+import urllib.parse
+import urllib.request
+import threading
+import time
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///portfolio.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///portfolio.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['UPLOAD_FOLDER'] = 'static/uploads'
+app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', 'static/uploads')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
 # Email Configuration
-app.config['MAIL_SERVER'] = 'smtp.gmail.com'
-app.config['MAIL_PORT'] = 587
-app.config['MAIL_USE_TLS'] = True
-app.config['MAIL_USERNAME'] = 'your-email@gmail.com'  # Change this to your email
-app.config['MAIL_PASSWORD'] = 'your-app-password'     # Change this to your app password
-app.config['MAIL_DEFAULT_SENDER'] = 'your-email@gmail.com'
+app.config['MAIL_SERVER'] = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
+app.config['MAIL_PORT'] = int(os.environ.get('MAIL_PORT', 587))
+app.config['MAIL_USE_TLS'] = os.environ.get('MAIL_USE_TLS', 'true').lower() == 'true'
+app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME', 'your-email@gmail.com')  # Change this to your email
+app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD', 'your-app-password')     # Change this to your app password
+app.config['MAIL_DEFAULT_SENDER'] = os.environ.get('MAIL_DEFAULT_SENDER', app.config['MAIL_USERNAME'])
 
-# Ensure upload folder exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Contact form mail goes through a database outbox drained by background workers
+app.config['OUTBOX_WORKERS'] = int(os.environ.get('OUTBOX_WORKERS', 1))
+app.config['OUTBOX_BATCH_SIZE'] = 20           # messages sent per SMTP connection
+app.config['OUTBOX_POLL_INTERVAL'] = 30        # seconds between checks for due retries
+app.config['OUTBOX_MAX_ATTEMPTS'] = 8
+app.config['OUTBOX_RETRY_BASE'] = 30           # seconds, doubled after each failure
+app.config['OUTBOX_RETRY_MAX'] = 3600
+app.config['OUTBOX_CLAIM_TIMEOUT'] = 300       # reclaim messages from a crashed worker
+
+# Resume downloads can be handed to the front proxy instead of being streamed
+# by the worker: None, 'x-accel-redirect' (nginx) or 'x-sendfile' (Apache, lighttpd)
+app.config['RESUME_OFFLOAD'] = os.environ.get('RESUME_OFFLOAD') or None
+app.config['RESUME_ACCEL_PREFIX'] = '/protected-uploads/'  # nginx internal location for UPLOAD_FOLDER
+
+# Cold starts
+# Serverless hosts import this module on every cold start. LAZY_INIT (on by
+# default on Vercel) leaves Flask-Mail, the upload folder check and the outbox
+# workers until something needs them, and TEMPLATE_CACHE_FOLDER loads
+# templates precompiled by `flask compile-templates` instead of parsing them.
+app.config['LAZY_INIT'] = os.environ.get('LAZY_INIT', 'true' if os.environ.get('VERCEL') else 'false').lower() == 'true'
+app.config['TEMPLATE_CACHE_FOLDER'] = os.environ.get('TEMPLATE_CACHE_FOLDER') or None
+
+# SQLite engine profile
+# 'production' switches to WAL so readers are never blocked by an admin write,
+# and tunes the page cache and mmap for a small read-mostly database.
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,         # ms to wait for a writer instead of failing
+        'cache_size': -16000,         # KiB
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+app.config['SQLITE_PROFILE'] = os.environ.get('SQLITE_PROFILE', 'production')
+if app.config['SQLALCHEMY_DATABASE_URI'] not in ('sqlite://', 'sqlite:///:memory:'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 8)),  # one per worker thread
+        'max_overflow': 4,
+        'pool_timeout': 10,
+        'connect_args': {'check_same_thread': False},
+    }
+
+@event.listens_for(Engine, 'connect')
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PROFILES[app.config['SQLITE_PROFILE']].items():
+        cursor.execute(f'PRAGMA {pragma}={value}')
+    cursor.close()
+
+# Ensure upload folder exists (store_upload creates it on demand with LAZY_INIT)
+if not app.config['LAZY_INIT']:
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 db = SQLAlchemy(app)
-mail = Mail(app)
+mail_state = {'mail': None}
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'admin_login'
 
 # Database Models
-class Admin(UserMixin, db.Model):
+class TenantScoped:
+    # Rows belong to the tenant the request's host maps to; queries are
+    # filtered to it by scope_to_tenant
+    tenant_id = db.Column(db.Integer, nullable=False, index=True, default=lambda: current_tenant_id())
+
+class Tenant(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), unique=True, nullable=False)
+    host = db.Column(db.String(253), unique=True, nullable=False)
+    name = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Admin(TenantScoped, UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), nullable=False)
     password_hash = db.Column(db.String(120), nullable=False)
 
-class Profile(db.Model):
+    __table_args__ = (db.UniqueConstraint('tenant_id', 'username'),)
+
+class Profile(TenantScoped, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     title = db.Column(db.String(200))
@@ -50,13 +151,16 @@ class Profile(db.Model):
     github = db.Column(db.String(200))
     twitter = db.Column(db.String(200))
 
-class Skill(db.Model):
+class Skill(TenantScoped, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     percentage = db.Column(db.Integer, default=0)
     category = db.Column(db.String(50))
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.Index('ix_skill_position', 'position', 'id'),)
 
-class Project(db.Model):
+class Project(TenantScoped, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -64,91 +168,1212 @@ class Project(db.Model):
     link = db.Column(db.String(200))
     github_link = db.Column(db.String(200))
     technologies = db.Column(db.String(200))
+    position = db.Column(db.Integer, nullable=False, default=0)
 
-class Experience(db.Model):
+    __table_args__ = (db.Index('ix_project_position', 'position', 'id'),)
+
+class Experience(TenantScoped, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(200))
     location = db.Column(db.String(100))
-    start_date = db.Column(db.Date)
+    start_date = db.Column(db.Date, index=True)
     end_date = db.Column(db.Date)
     current = db.Column(db.Boolean, default=False)
     description = db.Column(db.Text)
 
-class Education(db.Model):
+class Education(TenantScoped, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     degree = db.Column(db.String(200), nullable=False)
     institution = db.Column(db.String(200))
     location = db.Column(db.String(100))
-    start_date = db.Column(db.Date)
+    start_date = db.Column(db.Date, index=True)
     end_date = db.Column(db.Date)
     current = db.Column(db.Boolean, default=False)
     description = db.Column(db.Text)
 
-class Certificate(db.Model):
+class Certificate(TenantScoped, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     issuer = db.Column(db.String(200))
-    date_earned = db.Column(db.Date)
+    date_earned = db.Column(db.Date, index=True)
     link = db.Column(db.String(200))
     image = db.Column(db.String(200))
 
-class Resume(db.Model):
+class Resume(TenantScoped, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     file_name = db.Column(db.String(200), nullable=False)
     original_name = db.Column(db.String(200), nullable=False)
-    upload_date = db.Column(db.DateTime, default=datetime.utcnow)
+    upload_date = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     description = db.Column(db.Text)
 
+class ContentVersion(db.Model):
+    id = db.Column(db.Integer, primary_key=True)  # the tenant's id
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class SectionStat(db.Model):
+    tenant_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    section = db.Column(db.String(50), primary_key=True)
+    row_count = db.Column(db.Integer, nullable=False, default=0)
+    last_modified = db.Column(db.DateTime)
+
+class OutboxMessage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(300), nullable=False)
+    recipient = db.Column(db.String(200), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claim_token = db.Column(db.String(32))
+    claimed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (db.Index('ix_outbox_message_status_next_attempt', 'status', 'next_attempt_at'),)
+
+class UploadSession(TenantScoped, db.Model):
+    token = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)            # 'image' or 'resume'
+    original_name = db.Column(db.String(200), nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    chunk_size = db.Column(db.Integer, nullable=False)
+    file_name = db.Column(db.String(200))                      # set once the upload is complete
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class UploadChunk(db.Model):
+    token = db.Column(db.String(32), db.ForeignKey('upload_session.token'), primary_key=True)
+    index = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    sha256 = db.Column(db.String(64), nullable=False)
+
+class UploadReference(db.Model):
+    # Kept up to date by triggers on the tables that point at uploads
+    source = db.Column(db.String(20), primary_key=True)
+    row_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    file_name = db.Column(db.String(200), nullable=False, index=True)
+
+class LoginThrottle(db.Model):
+    key = db.Column(db.String(200), primary_key=True)  # 'ip:<address>' or 'user:<tenant>:<username>'
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)    # unix time the tokens were last refilled
+    strikes = db.Column(db.Integer, nullable=False, default=0)
+    locked_until = db.Column(db.Float, nullable=False, default=0)
+
+class StoredSession(db.Model):
+    sid = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.Float, nullable=False, index=True)  # unix time
+
 @login_manager.user_loader
 def load_user(user_id):
-    return Admin.query.get(int(user_id))
+    principal = cached_principal(user_id)
+    if principal is None:
+        admin = Admin.query.get(int(user_id))
+        if admin is None:
+            return None
+        principal = remember_principal(admin)
+    # A login is only good on the tenant it was made on
+    if principal.tenant_id != current_tenant_id():
+        return None
+    return principal
+
+# Tenants
+# One process can serve many portfolios. With MULTI_TENANT on, the Host
+# header picks a row in tenant, every ORM query on a TenantScoped model is
+# filtered to it and new rows are stamped with its id. Background jobs run as
+# the tenant in g.tenant_id, and CLI commands as the one whose host is in
+# TENANT. Snapshots, rendered pages and dashboard stats are cached per tenant
+# in LRUs bounded by an estimate of the memory they hold.
+app.config['MULTI_TENANT'] = os.environ.get('MULTI_TENANT', 'false').lower() == 'true'
+app.config['TENANT'] = os.environ.get('TENANT')  # host of the tenant CLI commands work on
+app.config['DEFAULT_TENANT_HOST'] = os.environ.get('DEFAULT_TENANT_HOST', 'localhost')
+# Seconds a worker trusts its copy of the host table, so a host moved with
+# set-tenant-host reaches every worker within this time without a restart
+app.config['TENANT_HOSTS_RELOAD'] = 5
+DEFAULT_TENANT_ID = 1
+PORT_SUFFIX = re.compile(r':\d+$')
+TENANT_UPLOAD = re.compile(r'^uploads/(?:variants/)?tenants/(\d+)/')
+
+tenant_state = {'hosts': {}, 'loaded_at': float('-inf')}
+
+def tenant_for_host(host):
+    host = PORT_SUFFIX.sub('', host.lower())
+    if time.monotonic() - tenant_state['loaded_at'] > app.config['TENANT_HOSTS_RELOAD']:
+        tenant_state['loaded_at'] = time.monotonic()
+        with db.engine.connect() as conn:
+            tenant_state['hosts'] = dict(conn.execute(select(Tenant.host, Tenant.id)).all())
+    return tenant_state['hosts'].get(host)
+
+def current_tenant_id():
+    tenant_id = g.get('tenant_id') if has_app_context() else None
+    if tenant_id is not None:
+        return tenant_id
+    if not app.config['MULTI_TENANT']:
+        tenant_id = DEFAULT_TENANT_ID
+    elif has_request_context():
+        tenant_id = tenant_for_host(request.host)
+        if tenant_id is None:
+            abort(404)
+    elif app.config['TENANT']:
+        tenant_id = tenant_for_host(app.config['TENANT'])
+        if tenant_id is None:
+            raise click.ClickException(f"No tenant has the host {app.config['TENANT']}")
+    else:
+        tenant_id = DEFAULT_TENANT_ID
+    if has_app_context():
+        g.tenant_id = tenant_id
+    return tenant_id
+
+@event.listens_for(db.session, 'do_orm_execute')
+def scope_to_tenant(execute_state):
+    if execute_state.is_column_load or execute_state.is_relationship_load:
+        return
+    if execute_state.is_select or execute_state.is_update or execute_state.is_delete:
+        tenant_id = current_tenant_id()
+        execute_state.statement = execute_state.statement.options(with_loader_criteria(
+            TenantScoped, lambda cls: cls.tenant_id == tenant_id, include_aliases=True))
+
+def upload_namespace():
+    # The first tenant keeps the original layout
+    tenant_id = current_tenant_id()
+    return '' if tenant_id == DEFAULT_TENANT_ID else f'tenants/{tenant_id}/'
+
+class MemoryLRU:
+    # Evicts least recently used entries once their estimated size passes
+    # the byte limit in app.config[limit_key]
+    def __init__(self, limit_key):
+        self.limit_key = limit_key
+        self.entries = OrderedDict()
+        self.size = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size):
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > app.config[self.limit_key] and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+def records_size(records):
+    # Rough bytes held by a tuple of records and their values
+    return sys.getsizeof(records) + sum(sys.getsizeof(record) + sum(map(sys.getsizeof, record))
+                                        for record in records)
+
+# Content snapshot
+# Public pages never query the ORM. All portfolio content is loaded once into
+# read-only tuple records and swapped atomically whenever the version stamp in
+# the content_version table moves. Every commit that touches portfolio content
+# bumps that stamp in the same transaction, so other worker processes pick the
+# change up on their next request.
+SECTION_MODELS = {
+    'profile': Profile,
+    'skills': Skill,
+    'projects': Project,
+    'experience': Experience,
+    'education': Education,
+    'certificates': Certificate,
+    'resumes': Resume,
+}
+SECTION_BY_MODEL = {model: section for section, model in SECTION_MODELS.items()}
+CONTENT_MODELS = tuple(SECTION_MODELS.values())
+
+def record_type(model):
+    return namedtuple(model.__name__ + 'Record', [column.key for column in model.__table__.columns])
+
+ProfileRecord = record_type(Profile)
+SkillRecord = record_type(Skill)
+ProjectRecord = record_type(Project)
+ExperienceRecord = record_type(Experience)
+EducationRecord = record_type(Education)
+CertificateRecord = record_type(Certificate)
+ResumeRecord = record_type(Resume)
+
+# Sort keys for the paginated sections, as ascending tuples that follow the
+# snapshot order so a cursor can be found with bisect
+def project_sort_key(project):
+    return (project.position, project.id)
+
+def certificate_sort_key(certificate):
+    # date_earned DESC with NULLs last, then id DESC
+    earned = certificate.date_earned
+    return (earned is None, -earned.toordinal() if earned else 0, -certificate.id)
+
+FEED_SORT_KEYS = {'projects': project_sort_key, 'certificates': certificate_sort_key}
+
+class ContentSnapshot:
+    __slots__ = ('version', 'profile', 'skills', 'projects', 'experiences',
+                 'education', 'certificates', 'resumes', 'resumes_by_id', 'sort_keys', 'size')
+
+    def __init__(self, version, profile, skills, projects, experiences, education, certificates, resumes):
+        self.version = version
+        self.profile = profile
+        self.skills = skills
+        self.projects = projects
+        self.experiences = experiences
+        self.education = education
+        self.certificates = certificates
+        self.resumes = resumes
+        self.resumes_by_id = {resume.id: resume for resume in resumes}
+        self.sort_keys = {name: tuple(map(key, getattr(self, name))) for name, key in FEED_SORT_KEYS.items()}
+        # Counted twice over for the lookup tables built from the records
+        self.size = 2 * sum(records_size(records) for records in (
+            (profile,) if profile else (), skills, projects, experiences, education, certificates, resumes))
+
+    @property
+    def resume(self):
+        return self.resumes[0] if self.resumes else None
+
+class TenantContent:
+    __slots__ = ('snapshot', 'checked_at')
+
+    def __init__(self, snapshot, checked_at):
+        self.snapshot = snapshot
+        self.checked_at = checked_at
+
+content_state = {'schema_ready': False}
+snapshot_lock = threading.Lock()
+
+app.config.setdefault('CONTENT_VERSION_CHECK_INTERVAL', 0)  # seconds between stamp reads
+# Shared by all tenants
+app.config.setdefault('SNAPSHOT_CACHE_MAX_BYTES', int(os.environ.get('SNAPSHOT_CACHE_MB', 64)) * 1024 * 1024)
+app.config.setdefault('PAGE_CACHE_MAX_BYTES', int(os.environ.get('PAGE_CACHE_MB', 64)) * 1024 * 1024)
+app.config.setdefault('STATS_CACHE_MAX_BYTES', 4 * 1024 * 1024)
+
+tenant_content = MemoryLRU('SNAPSHOT_CACHE_MAX_BYTES')
+page_cache = MemoryLRU('PAGE_CACHE_MAX_BYTES')
+
+content_version_table = ContentVersion.__table__
+read_version_stmt = (select(content_version_table.c.version)
+                     .where(content_version_table.c.id == bindparam('tenant_id')))
+bump_version_stmt = (content_version_table.update()
+                     .where(content_version_table.c.id == bindparam('tenant_id'))
+                     .values(version=content_version_table.c.version + 1))
+
+def ensure_content_version(tenant_id=DEFAULT_TENANT_ID):
+    content_version_table.create(db.engine, checkfirst=True)
+    with db.engine.begin() as conn:
+        conn.execute(sqlite_insert(content_version_table).values(id=tenant_id, version=0)
+                     .on_conflict_do_nothing())
+
+# Schema migrations
+# db.create_all() only creates missing tables. Changes to existing tables are
+# versioned steps recorded in schema_migration, applied in order under an
+# exclusive lock so several workers starting at once apply each step once.
+def create_index(name, table, columns):
+    return lambda cursor: cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})')
+
+def add_column(table, column, ddl):
+    def migrate(cursor):
+        existing = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+        if column not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}')
+    return migrate
+
+# Full-text search
+# One FTS5 table indexes several content tables and is kept in sync by
+# triggers, so every write path (ORM, bulk Core inserts, the sqlite3 shell)
+# updates it. Each entry's rowid encodes its source as id * SEARCH_KINDS + kind,
+# and its tenant column holds 't<tenant_id>' for queries to match on.
+SearchSource = namedtuple('SearchSource', 'kind table columns title body anchor edit_endpoint')
+SEARCH_KINDS = 8  # room for more sources without renumbering rows
+SEARCH_SOURCES = (
+    SearchSource('project', 'project', ('title', 'description', 'technologies'), '{0}.title',
+                 "coalesce({0}.description, '') || ' ' || coalesce({0}.technologies, '')", 'projects', 'edit_project'),
+    SearchSource('experience', 'experience', ('title', 'company', 'description'), '{0}.title',
+                 "coalesce({0}.company, '') || ' ' || coalesce({0}.description, '')", 'experience', 'edit_experience'),
+    SearchSource('education', 'education', ('degree', 'institution'), '{0}.degree',
+                 "coalesce({0}.institution, '')", 'education', 'edit_education'),
+    SearchSource('skill', 'skill', ('name', 'category'), '{0}.name',
+                 "coalesce({0}.category, '')", 'skills', 'edit_skill'),
+)
+
+# Migration 2 built the index before content had a tenant_id; migration 6
+# rebuilds it with the tenant column. tenants=False gives the old layout.
+def search_index_ddl(tenants=True):
+    return ("CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            f"title, body, {'tenant, ' if tenants else ''}tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+
+SEARCH_INDEX_DDL = search_index_ddl()
+
+def search_index_tenant(tenants, row):
+    # The extra column and value for INSERTs into the index
+    return (', tenant', f", 't' || {row}tenant_id") if tenants else ('', '')
+
+def rebuild_search_index(cursor, tenants=True):
+    cursor.execute('DELETE FROM search_index')
+    column, value = search_index_tenant(tenants, '')
+    for number, source in enumerate(SEARCH_SOURCES):
+        cursor.execute(f"INSERT INTO search_index (rowid, title, body{column}) "
+                       f"SELECT id * {SEARCH_KINDS} + {number}, {source.title.format(source.table)}, "
+                       f"{source.body.format(source.table)}{value} FROM {source.table}")
+
+def build_search_index(cursor, tenants):
+    cursor.execute(search_index_ddl(tenants))
+    column, value = search_index_tenant(tenants, 'new.')
+    for number, source in enumerate(SEARCH_SOURCES):
+        insert_new = (f"INSERT INTO search_index (rowid, title, body{column}) VALUES "
+                      f"(new.id * {SEARCH_KINDS} + {number}, {source.title.format('new')}, "
+                      f"{source.body.format('new')}{value});")
+        delete_old = f'DELETE FROM search_index WHERE rowid = old.id * {SEARCH_KINDS} + {number};'
+        columns = ', '.join(source.columns)
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS search_{source.table}_insert '
+                       f'AFTER INSERT ON {source.table} BEGIN {insert_new} END')
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS search_{source.table}_update '
+                       f'AFTER UPDATE OF {columns} ON {source.table} BEGIN {delete_old} {insert_new} END')
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS search_{source.table}_delete '
+                       f'AFTER DELETE ON {source.table} BEGIN {delete_old} END')
+    rebuild_search_index(cursor, tenants)
+
+def create_search_index(cursor):
+    build_search_index(cursor, tenants=False)
+
+def recreate_search_index(cursor):
+    for source in SEARCH_SOURCES:
+        for event_name in ('insert', 'update', 'delete'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS search_{source.table}_{event_name}')
+    cursor.execute('DROP TABLE IF EXISTS search_index')
+    build_search_index(cursor, tenants=True)
+
+def recreate_table(model, copy_columns):
+    # For changes ALTER TABLE can't make, like a new column in the primary key
+    # or unique constraint. The copied rows go to the first tenant.
+    def migrate(cursor):
+        table = model.__table__
+        existing = {row[1] for row in cursor.execute(f'PRAGMA table_info({table.name})')}
+        if 'tenant_id' in existing:
+            return
+        cursor.execute(f'ALTER TABLE {table.name} RENAME TO {table.name}_old')
+        cursor.execute(str(CreateTable(table).compile(db.engine)))
+        cursor.execute(f'INSERT INTO {table.name} (tenant_id, {copy_columns}) '
+                       f'SELECT {DEFAULT_TENANT_ID}, {copy_columns} FROM {table.name}_old')
+        cursor.execute(f'DROP TABLE {table.name}_old')
+        for index in table.indexes:
+            cursor.execute(str(CreateIndex(index).compile(db.engine)))
+    return migrate
+
+def tenant_column(table):
+    return [
+        add_column(table, 'tenant_id', f'INTEGER NOT NULL DEFAULT {DEFAULT_TENANT_ID}'),
+        create_index(f'ix_{table}_tenant_id', table, 'tenant_id'),
+    ]
+
+def create_default_tenant(cursor):
+    cursor.execute('INSERT OR IGNORE INTO tenant (id, host, created_at) VALUES (?, ?, ?)',
+                   (DEFAULT_TENANT_ID, app.config['DEFAULT_TENANT_HOST'], datetime.utcnow().isoformat(' ')))
+
+UploadSource = namedtuple('UploadSource', 'table column')
+UPLOAD_SOURCES = (
+    UploadSource('profile', 'photo'),
+    UploadSource('project', 'image'),
+    UploadSource('certificate', 'image'),
+    UploadSource('resume', 'file_name'),
+)
+
+def rebuild_upload_references(cursor):
+    cursor.execute('DELETE FROM upload_reference')
+    for source in UPLOAD_SOURCES:
+        cursor.execute(f"INSERT INTO upload_reference (source, row_id, file_name) "
+                       f"SELECT '{source.table}', id, {source.column} FROM {source.table} "
+                       f"WHERE coalesce({source.column}, '') != ''")
+
+def create_upload_reference_triggers(cursor):
+    for source in UPLOAD_SOURCES:
+        insert_new = (f"INSERT INTO upload_reference (source, row_id, file_name) "
+                      f"SELECT '{source.table}', new.id, new.{source.column} "
+                      f"WHERE coalesce(new.{source.column}, '') != '';")
+        delete_old = f"DELETE FROM upload_reference WHERE source = '{source.table}' AND row_id = old.id;"
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS upload_{source.table}_insert '
+                       f'AFTER INSERT ON {source.table} BEGIN {insert_new} END')
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS upload_{source.table}_update '
+                       f'AFTER UPDATE OF {source.column} ON {source.table} BEGIN {delete_old} {insert_new} END')
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS upload_{source.table}_delete '
+                       f'AFTER DELETE ON {source.table} BEGIN {delete_old} END')
+    rebuild_upload_references(cursor)
+
+MIGRATIONS = [
+    (1, 'index sort columns', [
+        create_index('ix_experience_start_date', 'experience', 'start_date'),
+        create_index('ix_education_start_date', 'education', 'start_date'),
+        create_index('ix_certificate_date_earned', 'certificate', 'date_earned'),
+        create_index('ix_resume_upload_date', 'resume', 'upload_date'),
+    ]),
+    (2, 'full-text search index', [create_search_index]),
+    (3, 'manual ordering for skills and projects', [
+        add_column('skill', 'position', 'INTEGER NOT NULL DEFAULT 0'),
+        add_column('project', 'position', 'INTEGER NOT NULL DEFAULT 0'),
+        # Keep the existing (insertion) order
+        lambda cursor: cursor.execute('UPDATE skill SET position = id'),
+        lambda cursor: cursor.execute('UPDATE project SET position = id'),
+        create_index('ix_skill_position', 'skill', 'position, id'),
+        create_index('ix_project_position', 'project', 'position, id'),
+    ]),
+    (4, 'upload reference index', [create_upload_reference_triggers]),
+    (5, 'tenants', [
+        create_default_tenant,
+        *(step for table in ('profile', 'skill', 'project', 'experience', 'education',
+                             'certificate', 'resume', 'upload_session') for step in tenant_column(table)),
+        recreate_table(Admin, 'id, username, password_hash'),
+        recreate_table(SectionStat, 'section, row_count, last_modified'),
+    ]),
+    (6, 'tenant column in the search index', [recreate_search_index]),
+]
+
+def run_migrations():
+    raw = db.engine.raw_connection()
+    try:
+        return apply_migrations(raw.driver_connection)
+    finally:
+        raw.close()
+
+def apply_migrations(connection):
+    # Takes a sqlite3 connection, so the tests can migrate a copy of an old database
+    isolation_level = connection.isolation_level
+    connection.isolation_level = None  # manage the transaction ourselves
+    cursor = connection.cursor()
+    cursor.execute('CREATE TABLE IF NOT EXISTS schema_migration '
+                   '(version INTEGER PRIMARY KEY, name VARCHAR(200), applied_at DATETIME)')
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        applied = {row[0] for row in cursor.execute('SELECT version FROM schema_migration')}
+        done = []
+        for version, name, steps in MIGRATIONS:
+            if version in applied:
+                continue
+            for step in steps:
+                step(cursor)
+            cursor.execute('INSERT INTO schema_migration (version, name, applied_at) VALUES (?, ?, ?)',
+                           (version, name, datetime.utcnow().isoformat(' ')))
+            done.append((version, name))
+        cursor.execute('COMMIT')
+    except Exception:
+        cursor.execute('ROLLBACK')
+        raise
+    finally:
+        connection.isolation_level = isolation_level
+    return done
+
+def prepare_database():
+    db.create_all()
+    run_migrations()
+    ensure_content_version()
+    ensure_section_stats()
+
+@app.before_request
+def prepare_schema():
+    if not content_state['schema_ready']:
+        prepare_database()
+        content_state['schema_ready'] = True
+        # Pick up retries left over from a previous process; with LAZY_INIT the
+        # workers start on the next contact message (or `flask drain-outbox`)
+        if not app.config['LAZY_INIT']:
+            outbox.start()
+
+@app.before_request
+def resolve_tenant():
+    # Unknown hosts get a 404 before any view, static files included
+    tenant_id = current_tenant_id()
+    # Other tenants' uploads aren't served on this host
+    if request.endpoint == 'static':
+        match = TENANT_UPLOAD.match(request.view_args.get('filename', ''))
+        if match and int(match.group(1)) != tenant_id:
+            abort(404)
+
+@app.cli.command("add-tenant")
+@click.argument('host')
+@click.option('--name', help='Shown in list-tenants')
+@click.option('--admin-username', default='admin', show_default=True)
+@click.password_option('--admin-password')
+def add_tenant(host, name, admin_username, admin_password):
+    prepare_database()
+    host = host.lower()
+    if Tenant.query.filter_by(host=host).first():
+        raise click.ClickException(f"A tenant already has the host {host}")
+    tenant = Tenant(host=host, name=name)
+    db.session.add(tenant)
+    db.session.flush()
+    db.session.add(Admin(tenant_id=tenant.id, username=admin_username,
+                         password_hash=generate_password_hash(admin_password)))
+    db.session.commit()
+    ensure_content_version(tenant.id)
+    ensure_section_stats()
+    tenant_state['loaded_at'] = float('-inf')
+    print(f"Tenant {tenant.id} created for {host} with admin user '{admin_username}'")
+
+@app.cli.command("list-tenants")
+def list_tenants():
+    prepare_database()
+    for tenant in Tenant.query.order_by(Tenant.id):
+        print(f"{tenant.id:>6}  {tenant.host:<40} {tenant.name or ''}")
+
+@app.cli.command("set-tenant-host")
+@click.argument('tenant_id', type=int)
+@click.argument('host')
+def set_tenant_host(tenant_id, host):
+    prepare_database()
+    tenant = db.session.get(Tenant, tenant_id)
+    if tenant is None:
+        raise click.ClickException(f"No tenant {tenant_id}")
+    tenant.host = host.lower()
+    db.session.commit()
+    tenant_state['loaded_at'] = float('-inf')
+    print(f"Tenant {tenant_id} now answers on {tenant.host}")
+
+def read_content_version(conn, tenant_id):
+    return conn.execute(read_version_stmt, {'tenant_id': tenant_id}).scalar() or 0
+
+def load_records(conn, record, model, tenant_id, *order_by):
+    stmt = select(model.__table__).where(model.tenant_id == tenant_id)
+    if order_by:
+        stmt = stmt.order_by(*order_by)
+    return tuple(record._make(row) for row in conn.execute(stmt))
+
+def load_snapshot(tenant_id):
+    with db.engine.connect() as conn:
+        # Read the stamp first: content newer than its label only causes an
+        # extra reload, never a stale page under a fresh version.
+        version = read_content_version(conn, tenant_id)
+        profiles = load_records(conn, ProfileRecord, Profile, tenant_id, Profile.id)
+        return ContentSnapshot(
+            version=version,
+            profile=profiles[0] if profiles else None,
+            skills=load_records(conn, SkillRecord, Skill, tenant_id, Skill.position, Skill.id),
+            projects=load_records(conn, ProjectRecord, Project, tenant_id, Project.position, Project.id),
+            experiences=load_records(conn, ExperienceRecord, Experience, tenant_id, Experience.start_date.desc()),
+            education=load_records(conn, EducationRecord, Education, tenant_id, Education.start_date.desc()),
+            certificates=load_records(conn, CertificateRecord, Certificate, tenant_id,
+                                      Certificate.date_earned.desc(), Certificate.id.desc()),
+            resumes=load_records(conn, ResumeRecord, Resume, tenant_id, Resume.upload_date.desc()),
+        )
+
+def current_snapshot():
+    tenant_id = current_tenant_id()
+    content = tenant_content.get(tenant_id)
+    now = time.monotonic()
+    if content is not None and now - content.checked_at < app.config['CONTENT_VERSION_CHECK_INTERVAL']:
+        return content.snapshot
+
+    with db.engine.connect() as conn:
+        version = read_content_version(conn, tenant_id)
+    if content is not None and content.snapshot.version == version:
+        content.checked_at = now
+        return content.snapshot
+
+    with snapshot_lock:
+        content = tenant_content.get(tenant_id)
+        if content is None or content.snapshot.version != version:
+            snapshot = load_snapshot(tenant_id)
+            content = TenantContent(snapshot, now)
+            tenant_content.put(tenant_id, content, snapshot.size)
+    return content.snapshot
+
+def expire_snapshot(tenant_id):
+    content = tenant_content.get(tenant_id)
+    if content is not None:
+        content.checked_at = float('-inf')
+
+def touch_content():
+    # For writes made outside the ORM session (background jobs, bulk loads)
+    tenant_id = current_tenant_id()
+    with db.engine.begin() as conn:
+        conn.execute(bump_version_stmt, {'tenant_id': tenant_id})
+    expire_snapshot(tenant_id)
+    purge_edge_cache([ALL_CONTENT_TAG])
+
+@event.listens_for(db.session, 'after_flush')
+def track_content_changes(session, flush_context):
+    deltas = {}
+    for objects, delta in ((session.new, 1), (session.dirty, 0), (session.deleted, -1)):
+        for obj in objects:
+            section = SECTION_BY_MODEL.get(type(obj))
+            if section:
+                deltas[section] = deltas.get(section, 0) + delta
+    if not deltas:
+        return
+
+    tenant_id = current_tenant_id()
+    if session.info.get('content_changed') is None:
+        session.info['content_changed'] = tenant_id
+        session.execute(bump_version_stmt, {'tenant_id': tenant_id})
+    record_section_changes(session, tenant_id, deltas)
+
+@event.listens_for(db.session, 'after_commit')
+def expire_content_check(session):
+    tenant_id = session.info.pop('content_changed', None)
+    if tenant_id is not None:
+        expire_snapshot(tenant_id)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_content_changes(session):
+    session.info.pop('content_changed', None)
+
+# Dashboard statistics
+# Row counts and last-modified times live in section_stat, updated in the same
+# transaction as every content write, so the dashboard reads them with one
+# query (and only when the content version has moved).
+section_stat_table = SectionStat.__table__
+stats_cache = MemoryLRU('STATS_CACHE_MAX_BYTES')
+
+def ensure_section_stats():
+    with db.engine.begin() as conn:
+        existing = set(conn.execute(select(section_stat_table.c.tenant_id, section_stat_table.c.section)).all())
+        tenants = conn.execute(select(content_version_table.c.id)).scalars().all()
+        missing = [(tenant_id, section) for tenant_id in tenants for section in SECTION_MODELS
+                   if (tenant_id, section) not in existing]
+        if not missing:
+            return
+        # One grouped count per section covers every tenant
+        counts = {}
+        for section in {section for tenant_id, section in missing}:
+            model = SECTION_MODELS[section]
+            for tenant_id, count in conn.execute(select(model.tenant_id, func.count()).group_by(model.tenant_id)):
+                counts[tenant_id, section] = count
+        conn.execute(section_stat_table.insert(), [
+            {'tenant_id': tenant_id, 'section': section, 'row_count': counts.get((tenant_id, section), 0)}
+            for tenant_id, section in missing
+        ])
+
+def record_section_changes(session, tenant_id, deltas):
+    now = datetime.utcnow()
+    for section, delta in deltas.items():
+        stmt = sqlite_insert(section_stat_table).values(tenant_id=tenant_id, section=section,
+                                                        row_count=delta, last_modified=now)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=[section_stat_table.c.tenant_id, section_stat_table.c.section],
+            set_={'row_count': section_stat_table.c.row_count + delta, 'last_modified': now},
+        ))
+
+def section_stats(version):
+    tenant_id = current_tenant_id()
+    cached = stats_cache.get(tenant_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    with db.engine.connect() as conn:
+        stats = {row.section: row for row in conn.execute(
+            select(section_stat_table).where(section_stat_table.c.tenant_id == tenant_id))}
+    stats_cache.put(tenant_id, (version, stats), 256 * (len(stats) + 1))
+    return stats
+
+def cached_page(render, key=None, mimetype=None):
+    tenant_id = current_tenant_id()
+    snapshot = current_snapshot()
+    key = (tenant_id, key or request.path, snapshot.version)
+    entry = page_cache.get(key)
+    if entry is None:
+        body = render(snapshot)
+        entry = (body, hashlib.sha1(body.encode('utf-8')).hexdigest())
+        # Don't store a page rendered from a snapshot swapped out meanwhile;
+        # pages of older versions are left for the LRU to evict
+        content = tenant_content.get(tenant_id)
+        if content is not None and content.snapshot is snapshot:
+            page_cache.put(key, entry, sys.getsizeof(body) + 200)
+
+    body, etag = entry
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+
+    response = make_response(body)
+    if mimetype:
+        response.mimetype = mimetype
+    response.set_etag(etag)
+    return response
 
 # Routes
 @app.route('/')
 def index():
-    profile = Profile.query.first()
-    skills = Skill.query.all()
-    projects = Project.query.all()
-    experiences = Experience.query.order_by(Experience.start_date.desc()).all()
-    education = Education.query.order_by(Education.start_date.desc()).all()
-    certificates = Certificate.query.order_by(Certificate.date_earned.desc()).all()
-    resume = Resume.query.order_by(Resume.upload_date.desc()).first()
-    
-    return render_template('index.html', 
-                         profile=profile, 
-                         skills=skills, 
+    return cached_page(render_index)
+
+def render_index(snapshot, static_export=False):
+    # The exported site has no API to page through, so it lists everything
+    page_size = None if static_export else app.config['API_PAGE_SIZE']
+    projects, projects_next = feed_page(snapshot, 'projects', None, page_size)
+    certificates, certificates_next = feed_page(snapshot, 'certificates', None, page_size)
+    return render_template('index.html',
+                         static_export=static_export,
+                         profile=snapshot.profile,
+                         skills=snapshot.skills,
                          projects=projects,
-                         experiences=experiences,
-                         education=education,
+                         projects_next=projects_next,
+                         experiences=snapshot.experiences,
+                         education=snapshot.education,
                          certificates=certificates,
-                         resume=resume)
+                         certificates_next=certificates_next,
+                         resume=snapshot.resume)
 
-@app.route('/resume/<int:id>')
-def view_resume(id):
-    resume = Resume.query.get_or_404(id)
+# Public JSON API
+# Projects and certificates are paged with opaque cursors that encode the
+# sort key of the last item sent. The next page starts right after that key,
+# so pages stay consistent while entries are added or removed. Pages are
+# served from the content snapshot and cached per version with an ETag.
+app.config['API_PAGE_SIZE'] = 12
+app.config['API_MAX_PAGE_SIZE'] = 50
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        return None
+    if not isinstance(key, list) or not 0 < len(key) <= 3 or not all(isinstance(part, int) for part in key):
+        return None
+    return tuple(key)
+
+def feed_page(snapshot, name, cursor, limit):
+    items = getattr(snapshot, name)
+    keys = snapshot.sort_keys[name]
+    start = bisect.bisect_right(keys, cursor) if cursor is not None else 0
+    if limit is None or start + limit >= len(items):
+        return items[start:], None
+    return items[start:start + limit], encode_cursor(keys[start + limit - 1])
+
+# Only these columns are part of the public API; new or internal columns
+# (position, tenant_id) stay out until they are added here
+FEED_FIELDS = {
+    'projects': ('id', 'title', 'description', 'image', 'link', 'github_link', 'technologies'),
+    'certificates': ('id', 'name', 'issuer', 'date_earned', 'link', 'image'),
+}
+
+def feed_item(name, record):
+    item = {}
+    for field in FEED_FIELDS[name]:
+        value = getattr(record, field)
+        item[field] = value.isoformat() if isinstance(value, (date, datetime)) else value
+    return item
+
+def feed_response(name, macro):
+    limit = request.args.get('limit', app.config['API_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, app.config['API_MAX_PAGE_SIZE']))
+    cursor = request.args.get('cursor')
+    key = None
+    if cursor:
+        key = decode_cursor(cursor)
+        if key is None:
+            abort(400)
+    # The "More" link under each list asks for a plain page, for browsers
+    # that can't load the next items in place
+    as_html = request.args.get('format') == 'html'
+    render_card = get_template_attribute('macros.html', macro)
+
+    def render(snapshot):
+        items, next_cursor = feed_page(snapshot, name, key, limit)
+        if as_html:
+            return render_template('feed.html', title=name.title(), endpoint=request.endpoint,
+                                   cards=[render_card(record) for record in items], next_cursor=next_cursor)
+        return json.dumps({
+            # Cards are rendered with the same macros as the page itself
+            'items': [dict(feed_item(name, record), html=str(render_card(record))) for record in items],
+            'next_cursor': next_cursor,
+        })
+
+    return cached_page(render, key=(request.path, cursor, limit, as_html),
+                       mimetype=None if as_html else 'application/json')
+
+@app.route('/api/projects')
+def api_projects():
+    return feed_response('projects', 'project_card')
+
+@app.route('/api/certificates')
+def api_certificates():
+    return feed_response('certificates', 'certificate_card')
+
+file_etags = {}
+
+def file_etag(filename, file_path):
+    # Content-addressed uploads carry their hash in the name; older uploads
+    # are hashed once per (mtime, size) and remembered.
+    match = CONTENT_ADDRESSED_UPLOAD.match(filename)
+    if match:
+        return filename.rsplit('/', 1)[-1].split('.', 1)[0]
+
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    etag = file_etags.get(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        etag = file_etags[key] = digest.hexdigest()
+    return etag
+
+def send_resume(id, force_download):
+    resume = current_snapshot().resumes_by_id.get(id)
+    if resume is None:
+        abort(404)
     file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume.file_name)
-    
-    if os.path.exists(file_path):
-        # For PDF files, display in browser
-        if resume.file_name.lower().endswith('.pdf'):
-            return send_file(file_path, as_attachment=False, download_name=resume.original_name)
-        else:
-            # For other files, force download
-            return send_file(file_path, as_attachment=True, download_name=resume.original_name)
-    else:
+    # PDF files display in the browser unless a download was asked for
+    as_attachment = force_download or not resume.file_name.lower().endswith('.pdf')
+
+    try:
+        etag = file_etag(resume.file_name, file_path)
+    except FileNotFoundError:
         flash('Resume file not found')
         return redirect(url_for('index'))
 
+    offload = app.config['RESUME_OFFLOAD']
+    if not offload:
+        # Werkzeug answers Range/If-Range and If-None-Match itself
+        return send_file(file_path, as_attachment=as_attachment,
+                         download_name=resume.original_name, etag=etag)
+
+    # The proxy serves the body and byte ranges; only 304s are answered here
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+
+    if offload == 'x-sendfile':
+        response = werkzeug_send_file(os.path.abspath(file_path), request.environ,
+                                      as_attachment=as_attachment, download_name=resume.original_name,
+                                      etag=etag, use_x_sendfile=True, conditional=False)
+    else:
+        response = send_file(io.BytesIO(), as_attachment=as_attachment,
+                             download_name=resume.original_name, etag=etag, conditional=False)
+        response.headers['X-Accel-Redirect'] = app.config['RESUME_ACCEL_PREFIX'] + resume.file_name
+    # The body is empty here; the proxy sets the real length
+    del response.headers['Content-Length']
+    return response
+
+@app.route('/resume/<int:id>')
+def view_resume(id):
+    return send_resume(id, force_download=False)
+
+# Login throttling
+# check_password_hash is deliberately slow, so every login attempt first takes
+# a token from a bucket for the client IP and one for the username. Running a
+# bucket dry locks its key out, twice as long each time it happens again. The
+# buckets live in login_throttle and are updated by a single UPSERT so all
+# workers share them, and each worker remembers active lockouts so repeated
+# attempts are turned away without a query or a password hash.
+app.config['LOGIN_THROTTLE_ENABLED'] = os.environ.get('LOGIN_THROTTLE_ENABLED', 'true').lower() == 'true'
+app.config['LOGIN_IP_BURST'] = 10             # attempts allowed back to back from one IP
+app.config['LOGIN_IP_REFILL'] = 1 / 30        # attempts regained per second
+app.config['LOGIN_USER_BURST'] = 5
+app.config['LOGIN_USER_REFILL'] = 1 / 60
+app.config['LOGIN_LOCKOUT_BASE'] = 30         # seconds, doubled for each further lockout
+app.config['LOGIN_LOCKOUT_MAX'] = 3600
+app.config['LOGIN_THROTTLE_FORGET'] = 86400   # idle keys and their lockout history are dropped
+app.config['LOGIN_THROTTLE_MEMORY'] = 10000   # lockouts remembered per worker
+
+# Behind a reverse proxy every request comes from the proxy's address, so all
+# clients would share one IP bucket. PROXY_FIX_HOPS is the number of proxies in
+# front of the app; that many X-Forwarded-For entries are trusted. Leave it at
+# 0 when clients connect directly, or they could pick their own address.
+app.config['PROXY_FIX_HOPS'] = int(os.environ.get('PROXY_FIX_HOPS', 0))
+if app.config['PROXY_FIX_HOPS']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_HOPS'],
+                            x_proto=app.config['PROXY_FIX_HOPS'])
+
+login_throttle_table = LoginThrottle.__table__
+login_lockouts = OrderedDict()
+login_lockouts_lock = threading.Lock()
+throttle_state = {'pruned_at': 0.0}
+
+# SET expressions see the row as it was before the update. The bucket is frozen
+# while locked out (updated_at stays put), and the first attempt after the
+# lockout ends always gets a token, so Retry-After is honest even when the
+# lockout is shorter than one refill.
+LOGIN_REFILLED = '''max(min(:burst, tokens + (:now - updated_at) * :refill),
+                        CASE WHEN updated_at < locked_until THEN 1 ELSE 0 END)'''
+take_login_token_stmt = text(f'''
+    INSERT INTO login_throttle (key, tokens, updated_at, strikes, locked_until)
+    VALUES (:key, :burst - 1, :now, 0, 0)
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = CASE WHEN locked_until > :now THEN tokens
+                      WHEN {LOGIN_REFILLED} >= 1 THEN {LOGIN_REFILLED} - 1
+                      ELSE {LOGIN_REFILLED} END,
+        updated_at = CASE WHEN locked_until > :now THEN updated_at ELSE :now END,
+        strikes = CASE WHEN locked_until <= :now AND {LOGIN_REFILLED} < 1 THEN strikes + 1
+                       ELSE strikes END,
+        locked_until = CASE WHEN locked_until <= :now AND {LOGIN_REFILLED} < 1
+                            THEN :now + min(:lockout_max, :lockout_base * (1 << min(strikes, 20)))
+                            ELSE locked_until END
+    RETURNING locked_until
+''')
+
+def remember_lockout(key, locked_until):
+    with login_lockouts_lock:
+        login_lockouts[key] = locked_until
+        login_lockouts.move_to_end(key)
+        while len(login_lockouts) > app.config['LOGIN_THROTTLE_MEMORY']:
+            login_lockouts.popitem(last=False)
+
+def take_login_token(key, burst, refill):
+    # Returns how many seconds the caller has to wait, 0 if it may go ahead
+    now = time.time()
+    locked_until = login_lockouts.get(key)
+    if locked_until is not None:
+        if locked_until > now:
+            return locked_until - now
+        login_lockouts.pop(key, None)
+
+    with db.engine.begin() as conn:
+        locked_until = conn.execute(take_login_token_stmt, {
+            'key': key, 'now': now, 'burst': burst, 'refill': refill,
+            'lockout_base': app.config['LOGIN_LOCKOUT_BASE'], 'lockout_max': app.config['LOGIN_LOCKOUT_MAX'],
+        }).scalar()
+        if now - throttle_state['pruned_at'] > 600:
+            throttle_state['pruned_at'] = now
+            cutoff = now - app.config['LOGIN_THROTTLE_FORGET']
+            conn.execute(login_throttle_table.delete().where(login_throttle_table.c.updated_at < cutoff,
+                                                             login_throttle_table.c.locked_until < cutoff))
+    if locked_until > now:
+        remember_lockout(key, locked_until)
+        return locked_until - now
+    return 0
+
+def login_user_key(username):
+    return f'user:{current_tenant_id()}:{username.strip().lower()[:150]}'
+
+def login_throttle(username):
+    if not app.config['LOGIN_THROTTLE_ENABLED']:
+        return 0
+    # A client locked out by IP doesn't get to drain the username's bucket
+    return (take_login_token(f'ip:{request.remote_addr}', app.config['LOGIN_IP_BURST'],
+                             app.config['LOGIN_IP_REFILL'])
+            or take_login_token(login_user_key(username), app.config['LOGIN_USER_BURST'],
+                                app.config['LOGIN_USER_REFILL']))
+
+def reset_login_throttle(username):
+    key = login_user_key(username)
+    login_lockouts.pop(key, None)
+    with db.engine.begin() as conn:
+        conn.execute(login_throttle_table.delete().where(login_throttle_table.c.key == key))
+
+# Sessions
+# Session data is kept server-side under a random id, the only thing in the
+# cookie, and written back only when a request changes it. SESSION_STORE
+# picks where: 'sqlite' (the stored_session table, shared by all workers),
+# 'memory' (this process only) or a module:Class of your own; 'cookie' goes
+# back to Flask's signed cookies. The admin a session belongs to is cached
+# in each worker for ADMIN_CACHE_TTL seconds as a plain AdminPrincipal, so
+# admin pages don't query the admin table on every request.
+app.config['SESSION_STORE'] = os.environ.get('SESSION_STORE', 'sqlite')  # sqlite, memory, cookie or module:Class
+app.config['ADMIN_CACHE_TTL'] = 300
+SESSION_ID = re.compile(r'^[A-Za-z0-9_-]{43}$')
+session_serializer = TaggedJSONSerializer()
+
+class ServerSession(SecureCookieSession):
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        super().__init__(initial)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.stale_sid = None
+
+    def regenerate(self):
+        # A fresh id at login and logout, so an id planted before login is useless
+        if self.sid:
+            self.stale_sid = self.sid
+            self.sid = None
+        self.modified = True
+
+class MemorySessionStore:
+    def __init__(self, config):
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.pruned_at = time.time()
+
+    def load(self, sid):
+        entry = self.entries.get(sid)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry
+
+    def save(self, sid, data, expires_at):
+        now = time.time()
+        with self.lock:
+            self.entries[sid] = (data, expires_at)
+            if now - self.pruned_at > 600:
+                self.pruned_at = now
+                for expired in [key for key, entry in self.entries.items() if entry[1] <= now]:
+                    del self.entries[expired]
+
+    def delete(self, sid):
+        with self.lock:
+            self.entries.pop(sid, None)
+
+stored_session_table = StoredSession.__table__
+
+class SqliteSessionStore:
+    def __init__(self, config):
+        # Sessions are opened before prepare_schema runs
+        stored_session_table.create(db.engine, checkfirst=True)
+        self.pruned_at = time.time()
+
+    def load(self, sid):
+        with db.engine.connect() as conn:
+            row = conn.execute(select(stored_session_table.c.data, stored_session_table.c.expires_at)
+                               .where(stored_session_table.c.sid == sid,
+                                      stored_session_table.c.expires_at > time.time())).first()
+        return tuple(row) if row else None
+
+    def save(self, sid, data, expires_at):
+        now = time.time()
+        with db.engine.begin() as conn:
+            conn.execute(sqlite_insert(stored_session_table).values(sid=sid, data=data, expires_at=expires_at)
+                         .on_conflict_do_update(index_elements=[stored_session_table.c.sid],
+                                                set_={'data': data, 'expires_at': expires_at}))
+            if now - self.pruned_at > 600:
+                self.pruned_at = now
+                conn.execute(stored_session_table.delete().where(stored_session_table.c.expires_at <= now))
+
+    def delete(self, sid):
+        with db.engine.begin() as conn:
+            conn.execute(stored_session_table.delete().where(stored_session_table.c.sid == sid))
+
+SESSION_STORES = {'memory': MemorySessionStore, 'sqlite': SqliteSessionStore}
+session_store_state = {'name': None, 'store': None}
+
+def get_session_store():
+    name = app.config['SESSION_STORE']
+    if session_store_state['name'] != name:
+        if name in SESSION_STORES:
+            store_class = SESSION_STORES[name]
+        else:
+            import importlib
+            module, _, attribute = name.partition(':')
+            store_class = getattr(importlib.import_module(module), attribute)
+        session_store_state['store'] = store_class(app.config)
+        session_store_state['name'] = name
+    return session_store_state['store']
+
+class ServerSessionInterface(SessionInterface):
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        # Static files have no use for the session; don't look it up for them.
+        # An unknown id starts a new session rather than being adopted.
+        if not sid or not SESSION_ID.match(sid) or request.path.startswith(app.static_url_path + '/'):
+            return ServerSession()
+        entry = get_session_store().load(sid)
+        if entry is None:
+            return ServerSession()
+        data, expires_at = entry
+        try:
+            return ServerSession(session_serializer.loads(data), sid, expires_at)
+        except ValueError:
+            return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.accessed:
+            response.vary.add('Cookie')
+        store = get_session_store()
+        if session.stale_sid:
+            store.delete(session.stale_sid)
+
+        if not session:
+            if session.modified and (session.sid or session.stale_sid):
+                if session.sid:
+                    store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        now = time.time()
+        # Unchanged sessions are only written again once half their lifetime is gone
+        if not session.modified and session.sid and session.expires_at - now > lifetime / 2:
+            return
+        if not session.sid:
+            session.sid = secrets.token_urlsafe(32)
+        session.expires_at = now + lifetime
+        store.save(session.sid, session_serializer.dumps(dict(session)), session.expires_at)
+        response.set_cookie(name, session.sid, expires=self.get_expiration_time(app, session),
+                            httponly=self.get_cookie_httponly(app), domain=domain, path=path,
+                            secure=self.get_cookie_secure(app), samesite=self.get_cookie_samesite(app))
+        keep_cookies_off_the_edge(response)
+
+class CookieSessionInterface(SecureCookieSessionInterface):
+    def save_session(self, app, session, response):
+        super().save_session(app, session, response)
+        keep_cookies_off_the_edge(response)
+
+if app.config['SESSION_STORE'] != 'cookie':
+    app.session_interface = ServerSessionInterface()
+else:
+    app.session_interface = CookieSessionInterface()
+
+def regenerate_session():
+    if isinstance(session._get_current_object(), ServerSession):
+        session.regenerate()
+
+class AdminPrincipal(UserMixin):
+    # What load_user hands Flask-Login: detached from any database session,
+    # so it can outlive the request that loaded it
+    def __init__(self, admin):
+        self.id = admin.id
+        self.tenant_id = admin.tenant_id
+        self.username = admin.username
+
+principal_cache = {}
+principal_cache_lock = threading.Lock()
+
+def cached_principal(user_id):
+    entry = principal_cache.get(user_id)
+    if entry is None or entry[1] <= time.monotonic():
+        return None
+    return entry[0]
+
+def remember_principal(admin):
+    principal = AdminPrincipal(admin)
+    with principal_cache_lock:
+        principal_cache[str(admin.id)] = (principal, time.monotonic() + app.config['ADMIN_CACHE_TTL'])
+    return principal
+
+def forget_principal(user_id):
+    with principal_cache_lock:
+        principal_cache.pop(str(user_id), None)
+
+@event.listens_for(db.session, 'after_flush')
+def forget_changed_admins(session, flush_context):
+    # A changed password or username takes effect on the next request here;
+    # other workers pick it up within ADMIN_CACHE_TTL
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, Admin):
+            forget_principal(obj.id)
+
 @app.route('/admin/login', methods=['GET', 'POST'])
 def admin_login():
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
-        
+
+        wait = login_throttle(username)
+        if wait:
+            flash('Too many login attempts. Please try again later.')
+            response = make_response(render_template('admin/login.html'), 429)
+            response.headers['Retry-After'] = str(int(wait) + 1)
+            return response
+
         admin = Admin.query.filter_by(username=username).first()
         if admin and check_password_hash(admin.password_hash, password):
-            login_user(admin)
+            if app.config['LOGIN_THROTTLE_ENABLED']:
+                reset_login_throttle(username)
+            regenerate_session()
+            login_user(remember_principal(admin))
             return redirect(url_for('admin_dashboard'))
         else:
             flash('Invalid username or password')
@@ -158,28 +1383,27 @@ def admin_login():
 @app.route('/admin/logout')
 @login_required
 def admin_logout():
+    forget_principal(current_user.id)
     logout_user()
+    regenerate_session()
     return redirect(url_for('index'))
 
 @app.route('/admin/dashboard')
 @login_required
 def admin_dashboard():
-    profile = Profile.query.first()
-    skills_count = Skill.query.count()
-    projects_count = Project.query.count()
-    experiences_count = Experience.query.count()
-    education_count = Education.query.count()
-    certificates_count = Certificate.query.count()
-    resume_count = Resume.query.count()
+    snapshot = current_snapshot()
+    stats = section_stats(snapshot.version)
+    counts = {section: stat.row_count for section, stat in stats.items()}
     
     return render_template('admin/dashboard.html',
-                         profile=profile,
-                         skills_count=skills_count,
-                         projects_count=projects_count,
-                         experiences_count=experiences_count,
-                         education_count=education_count,
-                         certificates_count=certificates_count,
-                         resume_count=resume_count)
+                         profile=snapshot.profile,
+                         stats=stats,
+                         skills_count=counts.get('skills', 0),
+                         projects_count=counts.get('projects', 0),
+                         experiences_count=counts.get('experience', 0),
+                         education_count=counts.get('education', 0),
+                         certificates_count=counts.get('certificates', 0),
+                         resume_count=counts.get('resumes', 0))
 
 # Profile Management
 @app.route('/admin/profile', methods=['GET', 'POST'])
@@ -206,9 +1430,11 @@ def admin_profile():
         if 'photo' in request.files and request.files['photo'].filename:
             file = request.files['photo']
             if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                profile.photo = filename
+                profile.photo = save_image(file)
+        elif request.form.get('photo_upload'):
+            uploaded = claim_chunked_upload(request.form['photo_upload'], 'image')
+            if uploaded:
+                profile.photo = uploaded[0]
         
         db.session.commit()
         flash('Profile updated successfully!')
@@ -220,7 +1446,7 @@ def admin_profile():
 @app.route('/admin/skills')
 @login_required
 def admin_skills():
-    skills = Skill.query.all()
+    skills = Skill.query.order_by(Skill.position, Skill.id).all()
     return render_template('admin/skills.html', skills=skills)
 
 @app.route('/admin/skills/add', methods=['GET', 'POST'])
@@ -230,7 +1456,8 @@ def add_skill():
         skill = Skill(
             name=request.form['name'],
             percentage=int(request.form['percentage']),
-            category=request.form['category']
+            category=request.form['category'],
+            position=next_position(Skill)
         )
         db.session.add(skill)
         db.session.commit()
@@ -266,7 +1493,7 @@ def delete_skill(id):
 @app.route('/admin/projects')
 @login_required
 def admin_projects():
-    projects = Project.query.all()
+    projects = Project.query.order_by(Project.position, Project.id).all()
     return render_template('admin/projects.html', projects=projects)
 
 @app.route('/admin/projects/add', methods=['GET', 'POST'])
@@ -278,15 +1505,18 @@ def add_project():
             description=request.form['description'],
             link=request.form['link'],
             github_link=request.form['github_link'],
-            technologies=request.form['technologies']
+            technologies=request.form['technologies'],
+            position=next_position(Project)
         )
         
         if 'image' in request.files and request.files['image'].filename:
             file = request.files['image']
             if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                project.image = filename
+                project.image = save_image(file)
+        elif request.form.get('image_upload'):
+            uploaded = claim_chunked_upload(request.form['image_upload'], 'image')
+            if uploaded:
+                project.image = uploaded[0]
         
         db.session.add(project)
         db.session.commit()
@@ -309,9 +1539,11 @@ def edit_project(id):
         if 'image' in request.files and request.files['image'].filename:
             file = request.files['image']
             if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                project.image = filename
+                project.image = save_image(file)
+        elif request.form.get('image_upload'):
+            uploaded = claim_chunked_upload(request.form['image_upload'], 'image')
+            if uploaded:
+                project.image = uploaded[0]
         
         db.session.commit()
         flash('Project updated successfully!')
@@ -477,9 +1709,11 @@ def add_certificate():
         if 'image' in request.files and request.files['image'].filename:
             file = request.files['image']
             if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                certificate.image = filename
+                certificate.image = save_image(file)
+        elif request.form.get('image_upload'):
+            uploaded = claim_chunked_upload(request.form['image_upload'], 'image')
+            if uploaded:
+                certificate.image = uploaded[0]
         
         db.session.add(certificate)
         db.session.commit()
@@ -501,9 +1735,11 @@ def edit_certificate(id):
         if 'image' in request.files and request.files['image'].filename:
             file = request.files['image']
             if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                certificate.image = filename
+                certificate.image = save_image(file)
+        elif request.form.get('image_upload'):
+            uploaded = claim_chunked_upload(request.form['image_upload'], 'image')
+            if uploaded:
+                certificate.image = uploaded[0]
         
         db.session.commit()
         flash('Certificate updated successfully!')
@@ -520,6 +1756,83 @@ def delete_certificate(id):
     flash('Certificate deleted successfully!')
     return redirect(url_for('admin_certificates'))
 
+# Batch actions
+# List pages post several ids at once to delete, bulk edit or reorder them.
+# Each batch is a single flush and commit, so the content version, section
+# counters and search index move once per batch rather than once per row.
+BATCH_SECTIONS = {
+    'skills': (Skill, 'admin_skills', {'category': str, 'percentage': int}),
+    'projects': (Project, 'admin_projects', {}),
+    'experience': (Experience, 'admin_experience', {}),
+    'education': (Education, 'admin_education', {}),
+    'certificates': (Certificate, 'admin_certificates', {}),
+}
+REORDERABLE_MODELS = (Skill, Project)
+
+def next_position(model):
+    return (db.session.query(func.max(model.position)).scalar() or 0) + 1
+
+@app.route('/admin/<section>/batch', methods=['POST'])
+@login_required
+def admin_batch(section):
+    if section not in BATCH_SECTIONS:
+        abort(404)
+    model, list_endpoint, editable = BATCH_SECTIONS[section]
+    payload = request.get_json(silent=True)
+    if payload is None:
+        action = request.form.get('action')
+        ids = request.form.getlist('ids', type=int)
+        values = request.form
+    else:
+        ids = payload.get('ids', []) if isinstance(payload, dict) else None
+        if not isinstance(ids, list) or not all(type(id) is int for id in ids):
+            abort(400)
+        action = payload.get('action')
+        values = payload
+
+    rows = model.query.filter(model.id.in_(ids)).all() if ids else []
+    if action == 'delete':
+        for row in rows:
+            db.session.delete(row)
+        message = f'Deleted {len(rows)} {section}.'
+    elif action == 'update' and editable:
+        changes = {}
+        for field, kind in editable.items():
+            value = values.get(field)
+            if value in (None, ''):
+                continue
+            try:
+                changes[field] = kind(value)
+            except (TypeError, ValueError):
+                abort(400)
+        if 'percentage' in changes:
+            changes['percentage'] = max(0, min(100, changes['percentage']))
+        for row in rows:
+            for field, value in changes.items():
+                setattr(row, field, value)
+        message = f'Updated {len(rows)} {section}.'
+    elif action == 'reorder' and model in REORDERABLE_MODELS:
+        # ids list entries in their new order. They may be only part of the
+        # section: they are put back into the slots they held, in the new
+        # order, and the whole section is renumbered so no two rows share a
+        # position. Only rows whose position changes are written.
+        ordered = model.query.order_by(model.position, model.id).all()
+        by_id = {row.id: row for row in ordered}
+        moved = iter([by_id[id] for id in dict.fromkeys(ids) if id in by_id])
+        moved_ids = {row.id for row in rows}
+        for position, row in enumerate((next(moved) if row.id in moved_ids else row for row in ordered), 1):
+            if row.position != position:
+                row.position = position
+        message = f'Reordered {len(rows)} {section}.'
+    else:
+        abort(400)
+    db.session.commit()
+
+    if payload is not None:
+        return {'updated': len(rows)}
+    flash(message)
+    return redirect(url_for(list_endpoint))
+
 # Resume Management
 @app.route('/admin/resume')
 @login_required
@@ -531,6 +1844,21 @@ def admin_resume():
 @login_required
 def upload_resume():
     if request.method == 'POST':
+        if request.form.get('resume_file_upload'):
+            uploaded = claim_chunked_upload(request.form['resume_file_upload'], 'resume')
+            if not uploaded:
+                flash('The upload has expired. Please choose the file again.')
+                return redirect(request.url)
+            resume = Resume(
+                file_name=uploaded[0],
+                original_name=uploaded[1],
+                description=request.form.get('description', '')
+            )
+            db.session.add(resume)
+            db.session.commit()
+            flash('Resume uploaded successfully!')
+            return redirect(url_for('admin_resume'))
+
         if 'resume_file' not in request.files:
             flash('No file selected')
             return redirect(request.url)
@@ -541,12 +1869,7 @@ def upload_resume():
             return redirect(request.url)
         
         if file and allowed_resume_file(file.filename):
-            filename = secure_filename(file.filename)
-            # Add timestamp to avoid filename conflicts
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{timestamp}_{filename}"
-            
-            file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+            filename, created = store_upload(file)
             
             resume = Resume(
                 file_name=filename,
@@ -568,26 +1891,17 @@ def upload_resume():
 def delete_resume(id):
     resume = Resume.query.get_or_404(id)
     
-    # Delete file from filesystem
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume.file_name)
-    if os.path.exists(file_path):
-        os.remove(file_path)
-    
     db.session.delete(resume)
     db.session.commit()
+    
+    # Delete file from filesystem unless an identical upload still uses it
+    remove_upload_if_unused(resume.file_name)
     flash('Resume deleted successfully!')
     return redirect(url_for('admin_resume'))
 
 @app.route('/download/resume/<int:id>')
 def download_resume(id):
-    resume = Resume.query.get_or_404(id)
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume.file_name)
-    
-    if os.path.exists(file_path):
-        return send_file(file_path, as_attachment=True, download_name=resume.original_name)
-    else:
-        flash('Resume file not found')
-        return redirect(url_for('index'))
+    return send_resume(id, force_download=True)
 
 @app.route('/contact', methods=['POST'])
 def contact():
@@ -598,13 +1912,15 @@ def contact():
         message = request.form.get('message')
         
         try:
-            # Send email to admin
-            msg = Message(
+            # Email to admin; other tenants' messages go to their profile's address
+            recipient = app.config['MAIL_DEFAULT_SENDER']
+            profile = current_snapshot().profile
+            if current_tenant_id() != DEFAULT_TENANT_ID and profile and profile.email:
+                recipient = profile.email
+            db.session.add(OutboxMessage(
                 subject=f"Portfolio Contact: {subject}",
-                sender=app.config['MAIL_DEFAULT_SENDER'],
-                recipients=[app.config['MAIL_DEFAULT_SENDER']]
-            )
-            msg.body = f"""
+                recipient=recipient,
+                body=f"""
 New message from your portfolio website:
 
 Name: {name}
@@ -617,15 +1933,13 @@ Message:
 ---
 This message was sent from your portfolio contact form.
             """
-            mail.send(msg)
+            ))
             
-            # Send confirmation email to user
-            confirmation_msg = Message(
+            # Confirmation email to user
+            db.session.add(OutboxMessage(
                 subject="Thank you for contacting me!",
-                sender=app.config['MAIL_DEFAULT_SENDER'],
-                recipients=[email]
-            )
-            confirmation_msg.body = f"""
+                recipient=email,
+                body=f"""
 Dear {name},
 
 Thank you for reaching out to me through my portfolio website. I have received your message and will get back to you soon.
@@ -637,16 +1951,158 @@ Message: {message}
 Best regards,
 [Your Name]
             """
-            mail.send(confirmation_msg)
+            ))
+            db.session.commit()
+            outbox.wake()
             
             flash(f'Thank you {name}! Your message has been sent successfully. Check your email for confirmation.')
             
         except Exception as e:
+            db.session.rollback()
             flash(f'Sorry {name}, there was an error sending your message. Please try again later.')
             print(f"Email error: {e}")
         
         return redirect(url_for('index') + '#contact')
 
+# Mail outbox
+# /contact only inserts rows into outbox_message. Worker threads claim due
+# rows in batches, send each batch over a single SMTP connection and retry
+# failures with exponential backoff, so a slow or unavailable mail server
+# never holds up a request or loses a message.
+outbox_table = OutboxMessage.__table__
+
+def claim_outbox_batch(limit):
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+    due = or_(
+        and_(outbox_table.c.status == 'pending', outbox_table.c.next_attempt_at <= now),
+        and_(outbox_table.c.status == 'sending',
+             outbox_table.c.claimed_at < now - timedelta(seconds=app.config['OUTBOX_CLAIM_TIMEOUT'])),
+    )
+    with db.engine.begin() as conn:
+        ids = select(outbox_table.c.id).where(due).order_by(outbox_table.c.id).limit(limit)
+        # The status check is repeated in the UPDATE so two workers racing for
+        # the same rows can't both claim them; each keeps only its own token.
+        conn.execute(outbox_table.update()
+                     .where(outbox_table.c.id.in_(ids.scalar_subquery()), due)
+                     .values(status='sending', claim_token=token, claimed_at=now))
+        return conn.execute(select(outbox_table).where(outbox_table.c.claim_token == token,
+                                                       outbox_table.c.status == 'sending')).all()
+
+def retry_delay(attempts):
+    return min(app.config['OUTBOX_RETRY_BASE'] * 2 ** (attempts - 1), app.config['OUTBOX_RETRY_MAX'])
+
+def get_mail():
+    if mail_state['mail'] is None:
+        from flask_mail import Mail
+        mail_state['mail'] = Mail(app)
+    return mail_state['mail']
+
+if not app.config['LAZY_INIT']:
+    get_mail()
+
+def record_outbox_results(results):
+    now = datetime.utcnow()
+    with db.engine.begin() as conn:
+        for row, error, permanent, attempted in results:
+            # Messages the batch never got to keep their attempt count
+            attempts = row.attempts + 1 if attempted else row.attempts
+            if error is None:
+                values = {'status': 'sent', 'sent_at': now, 'attempts': attempts, 'last_error': None}
+            else:
+                print(f"Email error: {error}")
+                values = {
+                    'status': 'failed' if permanent or attempts >= app.config['OUTBOX_MAX_ATTEMPTS'] else 'pending',
+                    'attempts': attempts,
+                    'next_attempt_at': now + timedelta(seconds=retry_delay(max(attempts, 1))),
+                    'last_error': str(error),
+                }
+            conn.execute(outbox_table.update().where(outbox_table.c.id == row.id).values(claim_token=None, **values))
+
+def drain_outbox():
+    rows = claim_outbox_batch(app.config['OUTBOX_BATCH_SIZE'])
+    if not rows:
+        return 0
+
+    from flask_mail import Message
+    results = {}    # row id -> (row, error, permanent, attempted)
+    connection_error = None
+    try:
+        with get_mail().connect() as conn:
+            for row in rows:
+                try:
+                    conn.send(Message(subject=row.subject, sender=app.config['MAIL_DEFAULT_SENDER'],
+                                      recipients=[row.recipient], body=row.body))
+                except smtplib.SMTPRecipientsRefused as e:
+                    # The server won't take this address; retrying won't change that
+                    results[row.id] = (row, e, True, True)
+                except (smtplib.SMTPException, OSError) as e:
+                    # The connection is unusable; retry the rest of the batch later
+                    results[row.id] = (row, e, False, True)
+                    connection_error = e
+                    break
+                except Exception as e:
+                    # Something wrong with this message itself, such as a
+                    # newline in the subject (BadHeaderError)
+                    results[row.id] = (row, e, True, True)
+                else:
+                    results[row.id] = (row, None, False, True)
+    except (smtplib.SMTPException, OSError) as e:
+        connection_error = e
+    finally:
+        # Record what happened even if something unexpected escaped, so
+        # messages already sent are never claimed and sent again
+        for row in rows:
+            if row.id not in results:
+                results[row.id] = (row, connection_error or RuntimeError('batch interrupted'), False, False)
+        record_outbox_results(results.values())
+    return len(rows)
+
+class MailOutbox:
+    def __init__(self, app):
+        self.app = app
+        self.wakeup = threading.Event()
+        self.threads = []
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.threads:
+                return
+            for n in range(self.app.config['OUTBOX_WORKERS']):
+                thread = threading.Thread(target=self.run, name=f'mail-outbox-{n}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def wake(self):
+        self.start()
+        self.wakeup.set()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.app.config['OUTBOX_POLL_INTERVAL'])
+            self.wakeup.clear()
+            try:
+                with self.app.app_context():
+                    while drain_outbox():
+                        pass
+            except Exception as e:
+                print(f"Outbox worker error: {e}")
+
+outbox = MailOutbox(app)
+
+@app.cli.command("drain-outbox")
+def drain_outbox_command():
+    total = 0
+    while True:
+        claimed = drain_outbox()
+        if not claimed:
+            break
+        total += claimed
+    pending = OutboxMessage.query.filter(OutboxMessage.status.in_(['pending', 'sending'])).count()
+    failed = OutboxMessage.query.filter_by(status='failed').count()
+    print(f"Processed {total} messages; {pending} pending, {failed} failed")
+
 def allowed_file(filename):
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     return '.' in filename and \
@@ -657,10 +2113,1238 @@ def allowed_resume_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Content-addressed uploads
+# Uploads are hashed while they are streamed to disk and stored as
+# <aa>/<sha256>.<ext> under UPLOAD_FOLDER. Identical files share one copy,
+# and since a URL never changes content it can be cached forever. Tenants
+# other than the first get their own tenants/<id>/ subtree.
+UPLOAD_CHUNK_SIZE = 64 * 1024
+CONTENT_ADDRESSED_UPLOAD = re.compile(r'^(variants/)?(tenants/\d+/)?[0-9a-f]{2}/[0-9a-f]{64}[-.]')
+
+def store_upload(file):
+    upload_folder = app.config['UPLOAD_FOLDER']
+    extension = secure_filename(file.filename).rsplit('.', 1)[-1].lower()
+    digest = hashlib.sha256()
+
+    os.makedirs(upload_folder, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=upload_folder, prefix='.upload-', delete=False) as tmp:
+        for chunk in iter(lambda: file.stream.read(UPLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+            tmp.write(chunk)
+
+    return place_upload(tmp.name, digest.hexdigest(), extension)
+
+def place_upload(tmp_path, hexdigest, extension):
+    filename = f"{upload_namespace()}{hexdigest[:2]}/{hexdigest}.{extension}"
+    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        # Restart the garbage collector's grace period for the reused file
+        os.utime(path)
+        return filename, False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+    return filename, True
+
+def upload_references(filename):
+    return UploadReference.query.filter_by(file_name=filename).count()
+
+def remove_upload_if_unused(filename):
+    if upload_references(filename):
+        return
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+def is_immutable_static(filename):
+    return bool(filename.startswith('uploads/') and CONTENT_ADDRESSED_UPLOAD.match(filename[len('uploads/'):])
+                or FINGERPRINTED_ASSET.match(filename))
+
+@app.after_request
+def cache_immutable_uploads(response):
+    if request.endpoint == 'static' and response.status_code in (200, 206, 304):
+        if is_immutable_static(request.view_args.get('filename', '')):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = 31536000
+            response.cache_control.immutable = True
+    return response
+
+def save_image(file):
+    filename, created = store_upload(file)
+    if created:
+        schedule_image_variants(filename)
+    return filename
+
+# Chunked uploads
+# Large files are sent as a series of PUTs carrying one slice and its SHA-256
+# each. Slices are written straight into a preallocated file under
+# UPLOAD_FOLDER/.partial at their offset, so nothing is spooled or copied, and
+# a client that loses its connection asks which slices arrived and sends the
+# rest. Completing the upload renames the file to its content address, and
+# the admin form then submits the upload token in place of the file.
+app.config['CHUNKED_UPLOAD_CHUNK_SIZE'] = 4 * 1024 * 1024
+app.config['CHUNKED_UPLOAD_MAX_SIZE'] = 256 * 1024 * 1024
+app.config['CHUNKED_UPLOAD_EXPIRY'] = 24 * 3600   # seconds an unclaimed upload is kept
+
+UPLOAD_KINDS = {'image': allowed_file, 'resume': allowed_resume_file}
+upload_session_table = UploadSession.__table__
+upload_chunk_table = UploadChunk.__table__
+CHUNK_CHECKSUM = re.compile(r'^[0-9a-f]{64}$')
+
+def partial_upload_path(token):
+    return os.path.join(app.config['UPLOAD_FOLDER'], '.partial', token)
+
+def expire_upload_sessions():
+    cutoff = datetime.utcnow() - timedelta(seconds=app.config['CHUNKED_UPLOAD_EXPIRY'])
+    with db.engine.begin() as conn:
+        tokens = conn.execute(select(upload_session_table.c.token)
+                              .where(upload_session_table.c.created_at < cutoff)).scalars().all()
+        if not tokens:
+            return
+        conn.execute(upload_chunk_table.delete().where(upload_chunk_table.c.token.in_(tokens)))
+        conn.execute(upload_session_table.delete().where(upload_session_table.c.token.in_(tokens)))
+    for token in tokens:
+        if os.path.exists(partial_upload_path(token)):
+            os.remove(partial_upload_path(token))
+
+def received_chunks(conn, token):
+    return conn.execute(select(upload_chunk_table.c.index).where(upload_chunk_table.c.token == token)
+                        .order_by(upload_chunk_table.c.index)).scalars().all()
+
+def upload_status(conn, upload):
+    return {
+        'token': upload.token,
+        'size': upload.size,
+        'chunk_size': upload.chunk_size,
+        'received': [] if upload.file_name else received_chunks(conn, upload.token),
+        'file': upload.file_name,
+    }
+
+def find_upload(conn, token):
+    upload = conn.execute(select(upload_session_table).where(upload_session_table.c.token == token,
+                                                             upload_session_table.c.tenant_id == current_tenant_id())).first()
+    if upload is None:
+        abort(404)
+    return upload
+
+@app.route('/admin/uploads', methods=['POST'])
+@login_required
+def create_upload():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return {'error': 'Expected a JSON object'}, 400
+    kind = payload.get('kind')
+    name = secure_filename(str(payload.get('filename') or ''))
+    size = payload.get('size')
+    if kind not in UPLOAD_KINDS or not UPLOAD_KINDS[kind](name):
+        return {'error': 'This file type is not allowed'}, 400
+    # bool is an int too, but true is not a size
+    if type(size) is not int or not 0 < size <= app.config['CHUNKED_UPLOAD_MAX_SIZE']:
+        return {'error': 'The file is empty or too large'}, 400
+
+    expire_upload_sessions()
+    token = uuid.uuid4().hex
+    path = partial_upload_path(token)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.truncate(size)
+    values = {'token': token, 'kind': kind, 'original_name': str(payload['filename'])[:200], 'size': size,
+              'chunk_size': app.config['CHUNKED_UPLOAD_CHUNK_SIZE'], 'created_at': datetime.utcnow()}
+    with db.engine.begin() as conn:
+        conn.execute(upload_session_table.insert().values(**values))
+        return upload_status(conn, find_upload(conn, token)), 201
+
+@app.route('/admin/uploads/<token>')
+@login_required
+def get_upload(token):
+    with db.engine.connect() as conn:
+        return upload_status(conn, find_upload(conn, token))
+
+@app.route('/admin/uploads/<token>/<int:index>', methods=['PUT'])
+@login_required
+def put_upload_chunk(token, index):
+    with db.engine.connect() as conn:
+        upload = find_upload(conn, token)
+    offset = index * upload.chunk_size
+    if upload.file_name or offset >= upload.size:
+        return {'error': 'No such chunk'}, 400
+    expected = min(upload.chunk_size, upload.size - offset)
+    checksum = request.headers.get('X-Chunk-SHA256', '').lower()
+    if request.content_length != expected or not CHUNK_CHECKSUM.match(checksum):
+        return {'error': f'Expected {expected} bytes with an X-Chunk-SHA256 header'}, 400
+
+    digest = hashlib.sha256()
+    written = 0
+    with open(partial_upload_path(token), 'r+b') as f:
+        f.seek(offset)
+        for piece in iter(lambda: request.stream.read(UPLOAD_CHUNK_SIZE), b''):
+            digest.update(piece)
+            f.write(piece)
+            written += len(piece)
+    # A bad slice is simply sent again; it overwrites the same range
+    if written != expected or digest.hexdigest() != checksum:
+        return {'error': 'Checksum mismatch'}, 422
+
+    with db.engine.begin() as conn:
+        conn.execute(sqlite_insert(upload_chunk_table).values(token=token, index=index, sha256=checksum)
+                     .on_conflict_do_update(index_elements=['token', 'index'], set_={'sha256': checksum}))
+    return {'received': index}
+
+@app.route('/admin/uploads/<token>/complete', methods=['POST'])
+@login_required
+def complete_upload(token):
+    with db.engine.connect() as conn:
+        upload = find_upload(conn, token)
+        if upload.file_name:
+            return upload_status(conn, upload)
+        received = received_chunks(conn, token)
+    chunks = -(-upload.size // upload.chunk_size)
+    if len(received) != chunks:
+        missing = sorted(set(range(chunks)) - set(received))
+        return {'error': 'Upload is incomplete', 'missing': missing}, 409
+
+    # The content address covers the whole file, so read it back once (the
+    # slices were only checked one at a time)
+    path = partial_upload_path(token)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for piece in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(piece)
+    extension = secure_filename(upload.original_name).rsplit('.', 1)[-1].lower()
+    filename, created = place_upload(path, digest.hexdigest(), extension)
+    if created and upload.kind == 'image':
+        schedule_image_variants(filename)
+
+    with db.engine.begin() as conn:
+        conn.execute(upload_chunk_table.delete().where(upload_chunk_table.c.token == token))
+        conn.execute(upload_session_table.update().where(upload_session_table.c.token == token)
+                     .values(file_name=filename))
+        return upload_status(conn, find_upload(conn, token))
+
+def claim_chunked_upload(token, kind):
+    # Returns (file_name, original_name) of a completed upload and removes its
+    # session in the caller's transaction, or None if there is no such upload
+    upload = UploadSession.query.filter_by(token=token, kind=kind).first()
+    if upload is None or not upload.file_name:
+        return None
+    db.session.delete(upload)
+    return upload.file_name, upload.original_name
+
+# Responsive image variants
+# Uploaded images are re-encoded in the background into WebP and JPEG copies
+# at a few widths, with EXIF metadata dropped. A small JSON manifest next to
+# the variants records the dimensions the templates need for srcset/sizes.
+app.config['IMAGE_VARIANT_FOLDER'] = 'variants'  # relative to UPLOAD_FOLDER
+app.config['IMAGE_VARIANT_WIDTHS'] = (320, 640, 960, 1280)
+app.config['IMAGE_VARIANT_QUALITY'] = 80
+
+image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-variants')
+
+def variant_path(filename, suffix):
+    stem = os.path.splitext(filename)[0]
+    return f"{app.config['IMAGE_VARIANT_FOLDER']}/{stem}{suffix}"
+
+def schedule_image_variants(filename):
+    image_executor.submit(run_image_variants, filename, current_tenant_id())
+
+def run_image_variants(filename, tenant_id):
+    try:
+        build_image_variants(filename)
+        with app.app_context():
+            g.tenant_id = tenant_id
+            touch_content()
+    except Exception as e:
+        print(f"Image variant error for {filename}: {e}")
+
+def build_image_variants(filename):
+    # Pillow is only needed by the variant worker, so keep it off the import path
+    from PIL import Image, ImageOps
+    upload_folder = app.config['UPLOAD_FOLDER']
+    quality = app.config['IMAGE_VARIANT_QUALITY']
+
+    with Image.open(os.path.join(upload_folder, filename)) as original:
+        if getattr(original, 'is_animated', False):
+            return None
+        # Bake the EXIF orientation into the pixels; the metadata itself is
+        # not copied into any variant.
+        image = ImageOps.exif_transpose(original)
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+    widths = [w for w in app.config['IMAGE_VARIANT_WIDTHS'] if w < image.width]
+    widths.append(min(image.width, app.config['IMAGE_VARIANT_WIDTHS'][-1]))
+
+    variants = []
+    for width in sorted(set(widths)):
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS)
+        save_variant(resized, variant_path(filename, f'-{width}.webp'), 'WEBP', quality=quality, method=6)
+        save_variant(resized.convert('RGB'), variant_path(filename, f'-{width}.jpg'), 'JPEG',
+                     quality=quality, optimize=True, progressive=True)
+        variants.append([width, height])
+
+    manifest = {'width': image.width, 'height': image.height, 'variants': variants}
+    manifest_path = os.path.join(upload_folder, variant_path(filename, '.json'))
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    return manifest
+
+def save_variant(image, name, format, **options):
+    path = os.path.join(app.config['UPLOAD_FOLDER'], name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    image.save(path + '.tmp', format, **options)
+    os.replace(path + '.tmp', path)
+
+@app.template_global()
+def image_variants(filename):
+    # Only runs while rendering, and rendered pages are cached per snapshot
+    if not filename:
+        return None
+    manifest_path = os.path.join(app.config['UPLOAD_FOLDER'], variant_path(filename, '.json'))
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    def srcset(ext):
+        return ', '.join(
+            url_for('static', filename='uploads/' + variant_path(filename, f'-{width}.{ext}')) + f' {width}w'
+            for width, height in manifest['variants'])
+
+    width, height = manifest['variants'][-1]
+    return {
+        'webp': srcset('webp'),
+        'jpeg': srcset('jpg'),
+        'src': url_for('static', filename='uploads/' + variant_path(filename, f'-{width}.jpg')),
+        'width': width,
+        'height': height,
+    }
+
+@app.cli.command("build-image-variants")
+def build_image_variants_command():
+    filenames = {p.photo for p in Profile.query.all()}
+    filenames |= {p.image for p in Project.query.all()}
+    filenames |= {c.image for c in Certificate.query.all()}
+    for filename in sorted(f for f in filenames if f):
+        try:
+            manifest = build_image_variants(filename)
+        except (OSError, ValueError) as e:
+            print(f"Skipped {filename}: {e}")
+            continue
+        if manifest:
+            print(f"Built {len(manifest['variants'])} variants for {filename}")
+    touch_content()
+
+# Upload garbage collection
+# Replacing or deleting an image leaves its file and variants behind.
+# `flask gc-uploads` walks UPLOAD_FOLDER in sorted batches and checks each
+# batch against upload_reference with one indexed query, removing files that
+# no row points at. Files younger than the grace period are kept, since an
+# upload reaches the disk just before the row that references it commits.
+GC_VARIANT = re.compile(r'^(.+)(?:-\d+\.(?:webp|jpg)|\.json)$')
+GC_STEMS_PER_QUERY = 100
+
+def walk_uploads(upload_folder):
+    for root, dirs, files in os.walk(upload_folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, upload_folder).replace(os.sep, '/'), path
+
+def classify_upload(name):
+    # Returns (kind, key) where kind is 'original', 'variant', 'partial',
+    # 'temp', or None for files that are left alone
+    base = name.rsplit('/', 1)[-1]
+    if name.startswith('.partial/'):
+        return 'partial', base
+    if base.startswith('.upload-') or base.endswith('.tmp'):
+        return 'temp', None
+    if base.startswith('.'):
+        return None, None
+    if name.startswith(app.config['IMAGE_VARIANT_FOLDER'] + '/'):
+        match = GC_VARIANT.match(name[len(app.config['IMAGE_VARIANT_FOLDER']) + 1:])
+        return ('variant', match.group(1)) if match else (None, None)
+    return 'original', name
+
+def referenced_uploads(names, stems):
+    column = UploadReference.file_name
+    live = set()
+    if names:
+        live.update(db.session.execute(select(column).where(column.in_(names))).scalars())
+    stems = sorted(stems)
+    for start in range(0, len(stems), GC_STEMS_PER_QUERY):
+        # Every file name starting with '<stem>.' sorts between '<stem>.' and '<stem>/'
+        ranges = [and_(column >= f'{stem}.', column < f'{stem}/')
+                  for stem in stems[start:start + GC_STEMS_PER_QUERY]]
+        live.update(db.session.execute(select(column).where(or_(*ranges))).scalars())
+    return live
+
+def collect_upload_batch(batch, cutoff, sessions, dry_run):
+    candidates = []
+    names, stems = [], set()
+    for name, path in batch:
+        kind, key = classify_upload(name)
+        if kind is None:
+            continue
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if stat.st_mtime > cutoff:
+            continue
+        candidates.append((name, path, kind, key, stat.st_size))
+        if kind == 'original':
+            names.append(name)
+        elif kind == 'variant':
+            stems.add(key)
+
+    live = referenced_uploads(names, stems) | sessions['files']
+    live_stems = {os.path.splitext(name)[0] for name in live}
+    removed = []
+    for name, path, kind, key, size in candidates:
+        if (kind == 'original' and name in live or kind == 'variant' and key in live_stems
+                or kind == 'partial' and key in sessions['tokens']):
+            continue
+        if not dry_run:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+        removed.append((name, size))
+    return removed
+
+@app.cli.command("gc-uploads")
+@click.option('--dry-run', is_flag=True, help='Report what would be removed without deleting anything')
+@click.option('--batch-size', default=500, show_default=True, type=click.IntRange(1), help='Files examined per batch')
+@click.option('--grace', default=3600, show_default=True, type=click.IntRange(0),
+              help='Seconds a new file is kept even if nothing references it')
+@click.option('--rebuild-index', is_flag=True, help='Rebuild upload_reference from the content tables first')
+def gc_uploads(dry_run, batch_size, grace, rebuild_index):
+    prepare_database()
+    if rebuild_index:
+        with db.engine.begin() as conn:
+            rebuild_upload_references(conn.connection.cursor())
+    upload_folder = app.config['UPLOAD_FOLDER']
+    if not os.path.isdir(upload_folder):
+        click.echo(f"{upload_folder} does not exist")
+        return
+
+    # Uploads in progress, and finished ones a form hasn't claimed yet, are live.
+    # Core, not the session: the folder is shared, so every tenant's count
+    with db.engine.connect() as conn:
+        rows = conn.execute(select(upload_session_table.c.token, upload_session_table.c.file_name)).all()
+    sessions = {'tokens': {row.token for row in rows}, 'files': {row.file_name for row in rows if row.file_name}}
+    cutoff = time.time() - grace
+    verb = 'Would remove' if dry_run else 'Removed'
+    examined = removed = reclaimed = 0
+
+    def run_batch(batch):
+        nonlocal removed, reclaimed
+        for name, size in collect_upload_batch(batch, cutoff, sessions, dry_run):
+            click.echo(f"{verb} {name} ({size} bytes)")
+            removed += 1
+            reclaimed += size
+
+    batch = []
+    for entry in walk_uploads(upload_folder):
+        batch.append(entry)
+        examined += 1
+        if len(batch) == batch_size:
+            run_batch(batch)
+            batch = []
+    if batch:
+        run_batch(batch)
+    click.echo(f"Examined {examined} files: {verb.lower()} {removed} "
+               f"({reclaimed} bytes {'reclaimable' if dry_run else 'reclaimed'})")
+
+@app.cli.command("migrate-db")
+def migrate_db():
+    db.create_all()
+    for version, name in run_migrations():
+        print(f"Applied migration {version}: {name}")
+    journal_mode = db.session.execute(text('PRAGMA journal_mode')).scalar()
+    print(f"Schema is up to date (journal_mode={journal_mode})")
+
+# Front-end assets
+# Vendor libraries are downloaded once into static/vendor and the site's own
+# CSS/JS lives in static/src. `flask build-assets` minifies both into
+# static/dist under content-hashed names listed in dist/manifest.json, so every
+# asset comes from this origin and can be cached forever. Until it has been
+# run, templates fall back to the CDN copies and the unminified sources.
+VENDOR_ASSETS = {
+    'bootstrap.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'bootstrap.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'fontawesome.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+    'fonts.css': 'https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap',
+    'aos.css': 'https://unpkg.com/aos@2.3.1/dist/aos.css',
+    'aos.js': 'https://unpkg.com/aos@2.3.1/dist/aos.js',
+    'cropper.css': 'https://cdnjs.cloudflare.com/ajax/libs/cropperjs/1.5.12/cropper.min.css',
+    'cropper.js': 'https://cdnjs.cloudflare.com/ajax/libs/cropperjs/1.5.12/cropper.min.js',
+}
+SOURCE_ASSETS = ('critical.css', 'site.css', 'site.js', 'admin.js')
+ASSET_VENDOR_FOLDER = os.path.join(app.static_folder, 'vendor')
+ASSET_SOURCE_FOLDER = os.path.join(app.static_folder, 'src')
+ASSET_DIST_FOLDER = os.path.join(app.static_folder, 'dist')
+ASSET_MANIFEST = os.path.join(ASSET_DIST_FOLDER, 'manifest.json')
+FINGERPRINTED_ASSET = re.compile(r'^dist/[\w.-]+\.[0-9a-f]{12}\.\w+$')
+# Google Fonts picks the font format from the User-Agent; ask for woff2
+ASSET_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+
+CSS_URL = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+CSS_STRING = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+SOURCE_MAP_COMMENT = re.compile(r'^\s*(?://|/\*)# sourceMappingURL=.*$', re.M)
+
+asset_state = {'manifest': {}, 'mtime_ns': None, 'inline': {}}
+
+def asset_manifest():
+    try:
+        mtime_ns = os.stat(ASSET_MANIFEST).st_mtime_ns
+    except OSError:
+        return {}
+    if mtime_ns != asset_state['mtime_ns']:
+        with open(ASSET_MANIFEST) as f:
+            asset_state['manifest'] = json.load(f)
+        asset_state['inline'] = {}
+        asset_state['mtime_ns'] = mtime_ns
+    return asset_state['manifest']
+
+@app.template_global()
+def asset_url(name):
+    built = asset_manifest().get(name)
+    if built:
+        return url_for('static', filename='dist/' + built)
+    if name in VENDOR_ASSETS:
+        return VENDOR_ASSETS[name]
+    return url_for('static', filename='src/' + name)
+
+@app.template_global()
+def inline_asset(name):
+    built = asset_manifest().get(name)
+    path = os.path.join(ASSET_DIST_FOLDER, built) if built else os.path.join(ASSET_SOURCE_FOLDER, name)
+    if path not in asset_state['inline']:
+        with open(path, encoding='utf-8') as f:
+            asset_state['inline'][path] = Markup(f.read())
+    return asset_state['inline'][path]
+
+def minify_css(css):
+    # Leave quoted strings (data: URIs, content values) untouched
+    parts = CSS_STRING.split(css)
+    for i in range(0, len(parts), 2):
+        part = re.sub(r'/\*.*?\*/', '', parts[i], flags=re.S)
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        parts[i] = re.sub(r':\s+', ':', part).replace(';}', '}')
+    return ''.join(parts).strip()
+
+def minify_js(js):
+    # Only drops comment lines and indentation, which is safe for plain scripts
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+def download(url):
+    req = urllib.request.Request(url, headers={'User-Agent': ASSET_USER_AGENT})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return response.read()
+
+def vendor_asset(name, url):
+    # CSS files pull fonts and images through url(); fetch those too and point
+    # the stylesheet at the local copies.
+    body = download(url)
+    if name.endswith('.css'):
+        stem = os.path.splitext(name)[0]
+
+        def localize(match):
+            ref = match.group(2)
+            if ref.startswith(('data:', '#')):
+                return match.group(0)
+            source = urllib.parse.urljoin(url, ref)
+            local = f"{stem}-{os.path.basename(urllib.parse.urlsplit(source).path)}"
+            with open(os.path.join(ASSET_VENDOR_FOLDER, local), 'wb') as f:
+                f.write(download(source))
+            return f'url({local})'
+
+        body = CSS_URL.sub(localize, body.decode('utf-8')).encode('utf-8')
+    with open(os.path.join(ASSET_VENDOR_FOLDER, name), 'wb') as f:
+        f.write(body)
+
+def fingerprint(folder, name, body):
+    stem, ext = os.path.splitext(name)
+    built = f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}{ext}"
+    path = os.path.join(folder, built)
+    if not os.path.exists(path):
+        with open(path + '.tmp', 'wb') as f:
+            f.write(body)
+        os.replace(path + '.tmp', path)
+    return built
+
+@app.cli.command("build-assets")
+@click.option('--refresh', is_flag=True, help='Download vendor files again')
+def build_assets(refresh):
+    os.makedirs(ASSET_VENDOR_FOLDER, exist_ok=True)
+    os.makedirs(ASSET_DIST_FOLDER, exist_ok=True)
+    for name, url in VENDOR_ASSETS.items():
+        if refresh or not os.path.exists(os.path.join(ASSET_VENDOR_FOLDER, name)):
+            print(f"Downloading {name} from {url}")
+            vendor_asset(name, url)
+
+    sources = [(name, ASSET_VENDOR_FOLDER) for name in VENDOR_ASSETS]
+    sources += [(name, ASSET_SOURCE_FOLDER) for name in SOURCE_ASSETS]
+    manifest = {}
+    for name, folder in sources:
+        with open(os.path.join(folder, name), encoding='utf-8') as f:
+            body = SOURCE_MAP_COMMENT.sub('', f.read())
+        if name.endswith('.css'):
+            def rewrite(match):
+                ref = match.group(2)
+                path = os.path.join(folder, ref)
+                if ref.startswith(('data:', '#', 'http:', 'https:', '/')) or not os.path.isfile(path):
+                    return match.group(0)
+                with open(path, 'rb') as f:
+                    return f'url({fingerprint(ASSET_DIST_FOLDER, ref, f.read())})'
+            body = CSS_URL.sub(rewrite, body)
+            if folder == ASSET_SOURCE_FOLDER:
+                body = minify_css(body)
+        elif folder == ASSET_SOURCE_FOLDER:
+            body = minify_js(body)
+        manifest[name] = fingerprint(ASSET_DIST_FOLDER, name, body.encode('utf-8'))
+        print(f"{name} -> dist/{manifest[name]}")
+
+    with open(ASSET_MANIFEST + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(ASSET_MANIFEST + '.tmp', ASSET_MANIFEST)
+
+    keep = set(manifest.values())
+    for name in manifest.values():
+        if name.endswith('.css'):
+            with open(os.path.join(ASSET_DIST_FOLDER, name), encoding='utf-8') as f:
+                keep.update(m.group(2) for m in CSS_URL.finditer(f.read()))
+    for name in os.listdir(ASSET_DIST_FOLDER):
+        if name != os.path.basename(ASSET_MANIFEST) and name not in keep:
+            os.remove(os.path.join(ASSET_DIST_FOLDER, name))
+
+# Search
+SEARCH_TERM = re.compile(r'\w+')
+search_stmt = text(
+    "SELECT rowid, highlight(search_index, 0, char(1), char(2)) AS title, "
+    "snippet(search_index, 1, char(1), char(2), '…', 16) AS snippet "
+    "FROM search_index WHERE search_index MATCH :query "
+    "ORDER BY bm25(search_index, 10.0, 1.0, 0.0) LIMIT :limit"
+)
+
+def search_match_query(terms):
+    # Quote each word so user input can't use FTS5 syntax; match as a prefix
+    words = ' '.join(f'"{term}"*' for term in SEARCH_TERM.findall(terms)[:8])
+    if not words:
+        return ''
+    return f'tenant : t{current_tenant_id()} AND {{title body}} : ({words})'
+
+def highlight_markup(value):
+    return Markup(str(escape(value or '')).replace('\x01', '<mark>').replace('\x02', '</mark>'))
+
+def search_content(terms, limit=20):
+    query = search_match_query(terms)
+    if not query:
+        return []
+    with db.engine.connect() as conn:
+        rows = conn.execute(search_stmt, {'query': query, 'limit': limit}).all()
+    results = []
+    for row in rows:
+        source = SEARCH_SOURCES[row.rowid % SEARCH_KINDS]
+        results.append({
+            'kind': source.kind,
+            'id': row.rowid // SEARCH_KINDS,
+            'title': highlight_markup(row.title),
+            'snippet': highlight_markup(row.snippet),
+            'source': source,
+        })
+    return results
+
+@app.route('/search')
+def search():
+    limit = max(1, min(request.args.get('limit', 20, type=int), 50))
+    results = search_content(request.args.get('q', ''), limit)
+    return {
+        'query': request.args.get('q', ''),
+        'results': [{
+            'kind': result['kind'],
+            'id': result['id'],
+            'title': str(result['title']),
+            'snippet': str(result['snippet']),
+            'url': url_for('index') + '#' + result['source'].anchor,
+        } for result in results],
+    }
+
+@app.route('/admin/search')
+@login_required
+def admin_search():
+    query = request.args.get('q', '')
+    return render_template('admin/search.html', query=query, results=search_content(query, 50))
+
+@app.cli.command("rebuild-search-index")
+def rebuild_search_index_command():
+    prepare_database()
+    raw = db.engine.raw_connection()
+    try:
+        rebuild_search_index(raw.cursor())
+        raw.commit()
+    finally:
+        raw.close()
+    print("Search index rebuilt")
+
+# Response compression
+# Text responses are gzip- or Brotli-encoded depending on Accept-Encoding.
+# Anything with an ETag (the cached public page, static and dist assets) is
+# compressed once and kept in an LRU keyed by that ETag (up to
+# COMPRESS_CACHE_MB of compressed bodies), so the work is redone only when the
+# content changes. Encoded responses carry the ETag with an encoding suffix;
+# the suffix is stripped from If-None-Match before the views see it so
+# conditional requests keep matching.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+app.config['COMPRESS_MIN_SIZE'] = 500
+app.config['COMPRESS_MAX_SIZE'] = 4 * 1024 * 1024
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_BROTLI_QUALITY'] = 5
+app.config.setdefault('COMPRESS_CACHE_MAX_BYTES', int(os.environ.get('COMPRESS_CACHE_MB', 32)) * 1024 * 1024)
+app.config['COMPRESS_MIMETYPES'] = {
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/javascript',
+    'application/javascript', 'application/json', 'application/xml', 'image/svg+xml',
+}
+ENCODED_ETAG = re.compile(r'-(?:br|gzip)"')
+
+compressed_cache = MemoryLRU('COMPRESS_CACHE_MAX_BYTES')
+
+def accepted_encoding():
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br'
+    if request.accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=app.config['COMPRESS_BROTLI_QUALITY'])
+    return gzip.compress(body, compresslevel=app.config['COMPRESS_LEVEL'], mtime=0)
+
+def compressed_body(response, encoding, etag):
+    key = (etag, encoding)
+    if etag:
+        body = compressed_cache.get(key)
+        if body is not None:
+            if hasattr(response.response, 'close'):
+                response.response.close()
+            return body
+    response.direct_passthrough = False
+    body = compress(response.get_data(), encoding)
+    if etag:
+        compressed_cache.put(key, body, len(body))
+    return body
+
+@app.before_request
+def strip_encoded_etags():
+    header = request.environ.get('HTTP_IF_NONE_MATCH')
+    if header and ENCODED_ETAG.search(header):
+        request.environ['portfolio.if_none_match'] = header
+        request.environ['HTTP_IF_NONE_MATCH'] = ENCODED_ETAG.sub('"', header)
+
+@app.after_request
+def compress_response(response):
+    encoding = accepted_encoding()
+    etag, weak = response.get_etag()
+
+    if response.status_code == 304:
+        # Answer with the encoded ETag the client actually holds
+        original = request.environ.get('portfolio.if_none_match', '')
+        if etag and encoding and f'"{etag}-{encoding}"' in original:
+            response.set_etag(f'{etag}-{encoding}', weak)
+            response.vary.add('Accept-Encoding')
+        return response
+
+    if (response.status_code != 200
+            or response.mimetype not in app.config['COMPRESS_MIMETYPES']
+            or 'Content-Encoding' in response.headers
+            or response.cache_control.no_transform):
+        return response
+    length = response.content_length
+    if length is None and not response.is_streamed:
+        length = len(response.get_data())
+    if length is None or not app.config['COMPRESS_MIN_SIZE'] <= length <= app.config['COMPRESS_MAX_SIZE']:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+    body = compressed_body(response, encoding, etag and f'{etag}:{weak}')
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    response.headers.pop('Accept-Ranges', None)
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+    return response
+
+# Edge caching
+# Public responses carry s-maxage and stale-while-revalidate so a CDN in front
+# (Vercel, Cloudflare, Fastly) can answer them, along with Surrogate-Key and
+# Cache-Tag headers naming the content they were built from. Browsers still
+# revalidate with the ETag. Every commit that changes content collects the
+# tags it affects and, once committed, hands them to the configured purger,
+# so edits reach the edge without waiting for s-maxage to run out. With
+# MULTI_TENANT on, tags are prefixed with t<tenant_id>: on both sides.
+app.config['CDN_CACHE_ENABLED'] = os.environ.get('CDN_CACHE_ENABLED', 'true').lower() == 'true'
+app.config['CDN_PURGER'] = os.environ.get('CDN_PURGER', 'null')  # null, file, http or module:Class
+app.config['CDN_PURGE_FILE'] = os.environ.get('CDN_PURGE_FILE', os.path.join(app.instance_path, 'cdn-purges.log'))
+app.config['CDN_PURGE_URL'] = os.environ.get('CDN_PURGE_URL')
+app.config['CDN_PURGE_TOKEN'] = os.environ.get('CDN_PURGE_TOKEN')
+app.config['CDN_PURGE_TIMEOUT'] = 5
+app.config['CDN_PURGE_MAX_TAGS'] = 30   # more than this purges everything instead
+# Without a purger, edits may only reach the edge when s-maxage runs out
+app.config['CDN_S_MAXAGE'] = int(os.environ.get('CDN_S_MAXAGE',
+                                                60 if app.config['CDN_PURGER'] == 'null' else 86400))
+app.config['CDN_STALE_WHILE_REVALIDATE'] = int(os.environ.get('CDN_STALE_WHILE_REVALIDATE', 60))
+app.config['CDN_TAG_HEADERS'] = {'Surrogate-Key': ' ', 'Cache-Tag': ','}
+
+ALL_CONTENT_TAG = 'portfolio'   # on every tagged response, for full purges
+
+def tenant_tags(tags):
+    if not app.config['MULTI_TENANT']:
+        return list(tags)
+    prefix = f't{current_tenant_id()}:'
+    return [prefix + tag for tag in tags]
+
+def resume_tags(view_args):
+    return (f"resume:{view_args['id']}",)
+
+def upload_tags(view_args):
+    filename = view_args.get('filename', '')
+    # Immutable uploads and assets are cached for a year by
+    # cache_immutable_uploads. This hook runs before that one, so it checks
+    # the name rather than the response.
+    if is_immutable_static(filename):
+        return None
+    if filename.startswith('uploads/'):
+        return (f"upload:{filename[len('uploads/'):]}",)
+    return None
+
+EDGE_CACHE_TAGS = {
+    # The home page shows every section
+    'index': lambda view_args: tuple(SECTION_MODELS),
+    'api_projects': lambda view_args: ('projects',),
+    'api_certificates': lambda view_args: ('certificates',),
+    'view_resume': resume_tags,
+    'download_resume': resume_tags,
+    'static': upload_tags,
+}
+UPLOAD_COLUMNS = {source.table: source.column for source in UPLOAD_SOURCES}
+
+@app.after_request
+def edge_cache_headers(response):
+    tags_for = EDGE_CACHE_TAGS.get(request.endpoint)
+    if (tags_for is None or not app.config['CDN_CACHE_ENABLED']
+            or request.method not in ('GET', 'HEAD')
+            or response.status_code not in (200, 206, 304)
+            or session.modified):
+        return response
+    tags = tags_for(request.view_args)
+    if not tags:
+        return response
+
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = 0
+    response.cache_control.s_maxage = app.config['CDN_S_MAXAGE']
+    response.cache_control['stale-while-revalidate'] = str(app.config['CDN_STALE_WHILE_REVALIDATE'])
+    tags = tenant_tags((ALL_CONTENT_TAG, *tags))
+    for header, separator in app.config['CDN_TAG_HEADERS'].items():
+        response.headers[header] = separator.join(tags)
+    return response
+
+def keep_cookies_off_the_edge(response):
+    # The session cookie is set after every after_request hook has run, and
+    # also when an unchanged session is refreshed. A shared cache would hand
+    # it to the next visitor, so any response that sets a cookie is private.
+    if 'Set-Cookie' not in response.headers:
+        return
+    if response.cache_control.public or response.cache_control.s_maxage is not None:
+        response.cache_control.public = False
+        response.cache_control.s_maxage = None
+        response.cache_control.max_age = None
+        response.cache_control.pop('stale-while-revalidate', None)
+        response.cache_control.immutable = False
+        response.cache_control.private = True
+        response.cache_control.no_store = True
+        for header in app.config['CDN_TAG_HEADERS']:
+            response.headers.pop(header, None)
+
+def content_tags(obj, section, deleted):
+    tags = {section}
+    if section == 'resumes':
+        tags.add(f'resume:{obj.id}')
+    column = UPLOAD_COLUMNS.get(obj.__tablename__)
+    if column:
+        # A replaced or deleted file may still be served from the edge
+        names = (getattr(obj, column),) if deleted else db.inspect(obj).attrs[column].history.deleted
+        tags.update(f'upload:{name}' for name in names if name)
+    return tags
+
+@event.listens_for(db.session, 'after_flush')
+def collect_purge_tags(session, flush_context):
+    for objects, deleted in ((session.new, False), (session.dirty, False), (session.deleted, True)):
+        for obj in objects:
+            section = SECTION_BY_MODEL.get(type(obj))
+            if section:
+                session.info.setdefault('purge_tags', set()).update(content_tags(obj, section, deleted))
+
+@event.listens_for(db.session, 'after_commit')
+def purge_committed_tags(session):
+    tags = session.info.pop('purge_tags', None)
+    if tags:
+        purge_edge_cache(tags)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_purge_tags(session):
+    session.info.pop('purge_tags', None)
+
+class NullPurger:
+    def __init__(self, config):
+        pass
+
+    def purge(self, tags):
+        pass
+
+class FilePurger:
+    # Appends each purge to a file as a JSON line; stands in for a CDN locally
+    def __init__(self, config):
+        self.path = config['CDN_PURGE_FILE']
+
+    def purge(self, tags):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'at': time.time(), 'tags': tags}) + '\n')
+
+class HttpPurger:
+    # POSTs {"tags": [...]}, the body of Cloudflare's purge_cache API, with the
+    # tags repeated in a Surrogate-Key header for Fastly-style endpoints
+    def __init__(self, config):
+        if not config['CDN_PURGE_URL']:
+            raise RuntimeError('CDN_PURGER=http needs CDN_PURGE_URL')
+        self.url = config['CDN_PURGE_URL']
+        self.token = config['CDN_PURGE_TOKEN']
+        self.timeout = config['CDN_PURGE_TIMEOUT']
+
+    def purge(self, tags):
+        headers = {'Content-Type': 'application/json', 'Surrogate-Key': ' '.join(tags)}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        purge_request = urllib.request.Request(self.url, data=json.dumps({'tags': tags}).encode(),
+                                               headers=headers, method='POST')
+        with urllib.request.urlopen(purge_request, timeout=self.timeout) as response:
+            response.read()
+
+PURGERS = {'null': NullPurger, 'file': FilePurger, 'http': HttpPurger}
+purger_state = {'name': None, 'purger': None}
+
+def get_purger():
+    name = app.config['CDN_PURGER']
+    if purger_state['name'] != name:
+        if name in PURGERS:
+            purger_class = PURGERS[name]
+        else:
+            import importlib
+            module, _, attribute = name.partition(':')
+            purger_class = getattr(importlib.import_module(module), attribute)
+        purger_state['purger'] = purger_class(app.config)
+        purger_state['name'] = name
+    return purger_state['purger']
+
+def purge_edge_cache(tags):
+    # Runs after the commit; a failed purge leaves pages stale until s-maxage
+    # runs out but never fails the write
+    tags = sorted(tags)
+    if len(tags) > app.config['CDN_PURGE_MAX_TAGS']:
+        tags = [ALL_CONTENT_TAG]
+    tags = tenant_tags(tags)
+    try:
+        get_purger().purge(tags)
+    except Exception as e:
+        print(f"CDN purge error for {' '.join(tags)}: {e}")
+
+@app.cli.command("purge-cdn")
+@click.argument('tags', nargs=-1)
+def purge_cdn(tags):
+    purge_edge_cache(tags or [ALL_CONTENT_TAG])
+    click.echo(f"Purged {' '.join(tags or [ALL_CONTENT_TAG])} with the {app.config['CDN_PURGER']} purger")
+
+# Request metrics
+# With METRICS_ENABLED, each request records its latency, the number and
+# duration of SQL statements and the time spent rendering templates. The
+# per-request numbers go out in a Server-Timing header and the totals are
+# exposed in Prometheus text format at /admin/metrics. When disabled the
+# hooks only check a thread-local and return.
+app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', 'false').lower() == 'true'
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+metrics_local = threading.local()
+metrics_lock = threading.Lock()
+route_metrics = {}
+template_metrics = {}
+
+def new_route_metrics():
+    return {'buckets': [0] * len(METRICS_BUCKETS), 'count': 0, 'sum': 0.0, 'statuses': {},
+            'sql_count': 0, 'sql_time': 0.0, 'template_time': 0.0}
+
+@request_started.connect_via(app)
+def start_request_timing(sender, **extra):
+    if not app.config['METRICS_ENABLED']:
+        metrics_local.timing = None
+        return
+    metrics_local.timing = {'started': time.perf_counter(), 'sql_count': 0, 'sql_time': 0.0,
+                            'template_time': 0.0, 'templates': []}
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timing(conn, cursor, statement, parameters, context, executemany):
+    if getattr(metrics_local, 'timing', None) is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query_timing(conn, cursor, statement, parameters, context, executemany):
+    timing = getattr(metrics_local, 'timing', None)
+    if timing is not None and conn.info.get('query_started'):
+        timing['sql_count'] += 1
+        timing['sql_time'] += time.perf_counter() - conn.info['query_started'].pop()
+
+@before_render_template.connect_via(app)
+def start_template_timing(sender, template, context, **extra):
+    timing = getattr(metrics_local, 'timing', None)
+    if timing is not None:
+        timing['templates'].append(time.perf_counter())
+
+@template_rendered.connect_via(app)
+def record_template_timing(sender, template, context, **extra):
+    timing = getattr(metrics_local, 'timing', None)
+    if timing is None or not timing['templates']:
+        return
+    elapsed = time.perf_counter() - timing['templates'].pop()
+    if not timing['templates']:
+        # Nested renders are already part of the outer one
+        timing['template_time'] += elapsed
+    with metrics_lock:
+        stats = template_metrics.setdefault(template.name or '<string>', [0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+
+@request_finished.connect_via(app)
+def finish_request_timing(sender, response, **extra):
+    timing = getattr(metrics_local, 'timing', None)
+    if timing is None:
+        return
+    metrics_local.timing = None
+    elapsed = time.perf_counter() - timing['started']
+    response.headers['Server-Timing'] = ', '.join((
+        f"db;desc=\"{timing['sql_count']} queries\";dur={timing['sql_time'] * 1000:.2f}",
+        f"tpl;dur={timing['template_time'] * 1000:.2f}",
+        f"app;dur={elapsed * 1000:.2f}",
+    ))
+
+    key = (request.endpoint or 'none', request.method)
+    status = str(response.status_code)
+
+    def record():
+        # Runs once the body has been sent, so streamed files count in full
+        duration = time.perf_counter() - timing['started']
+        with metrics_lock:
+            stats = route_metrics.get(key)
+            if stats is None:
+                stats = route_metrics[key] = new_route_metrics()
+            stats['count'] += 1
+            stats['sum'] += duration
+            for i, bound in enumerate(METRICS_BUCKETS):
+                if duration <= bound:
+                    stats['buckets'][i] += 1
+                    break
+            stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+            stats['sql_count'] += timing['sql_count']
+            stats['sql_time'] += timing['sql_time']
+            stats['template_time'] += timing['template_time']
+
+    response.call_on_close(record)
+
+def prometheus_labels(**labels):
+    values = ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                      for name, value in labels.items())
+    return '{' + values + '}'
+
+def render_metrics():
+    with metrics_lock:
+        routes = {key: dict(stats, buckets=list(stats['buckets']), statuses=dict(stats['statuses']))
+                  for key, stats in route_metrics.items()}
+        templates = {name: tuple(stats) for name, stats in template_metrics.items()}
+
+    lines = [
+        '# HELP portfolio_request_duration_seconds Request latency including the response body.',
+        '# TYPE portfolio_request_duration_seconds histogram',
+    ]
+    for (endpoint, method), stats in sorted(routes.items()):
+        cumulative = 0
+        for bound, count in zip(METRICS_BUCKETS, stats['buckets']):
+            cumulative += count
+            lines.append(f"portfolio_request_duration_seconds_bucket"
+                         f"{prometheus_labels(endpoint=endpoint, method=method, le=bound)} {cumulative}")
+        lines.append(f"portfolio_request_duration_seconds_bucket"
+                     f"{prometheus_labels(endpoint=endpoint, method=method, le='+Inf')} {stats['count']}")
+        lines.append(f"portfolio_request_duration_seconds_sum"
+                     f"{prometheus_labels(endpoint=endpoint, method=method)} {stats['sum']:.6f}")
+        lines.append(f"portfolio_request_duration_seconds_count"
+                     f"{prometheus_labels(endpoint=endpoint, method=method)} {stats['count']}")
+
+    counters = (
+        ('portfolio_requests_total', 'Requests by response status.', None),
+        ('portfolio_sql_queries_total', 'SQL statements executed while handling requests.', 'sql_count'),
+        ('portfolio_sql_duration_seconds_total', 'Time spent executing SQL statements.', 'sql_time'),
+        ('portfolio_template_duration_seconds_total', 'Time spent rendering templates.', 'template_time'),
+    )
+    for name, help_text, field in counters:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for (endpoint, method), stats in sorted(routes.items()):
+            if field is None:
+                for status, count in sorted(stats['statuses'].items()):
+                    lines.append(f"{name}{prometheus_labels(endpoint=endpoint, method=method, status=status)} {count}")
+            else:
+                lines.append(f"{name}{prometheus_labels(endpoint=endpoint, method=method)} {stats[field]:g}")
+
+    lines += ['# HELP portfolio_template_renders_total Template renders by template.',
+              '# TYPE portfolio_template_renders_total counter']
+    lines += [f"portfolio_template_renders_total{prometheus_labels(template=name)} {count}"
+              for name, (count, total) in sorted(templates.items())]
+    lines += ['# HELP portfolio_template_render_seconds_total Render time by template.',
+              '# TYPE portfolio_template_render_seconds_total counter']
+    lines += [f"portfolio_template_render_seconds_total{prometheus_labels(template=name)} {total:.6f}"
+              for name, (count, total) in sorted(templates.items())]
+    return '\n'.join(lines) + '\n'
+
+@app.route('/admin/metrics')
+@login_required
+def admin_metrics():
+    response = make_response(render_metrics())
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    response.cache_control.no_store = True
+    return response
+
+# Static site export
+# Renders the public page and copies every file it references into a folder
+# that a CDN can serve directly. A manifest of content hashes from the last
+# run means only changed pages and assets are rewritten, and files that are
+# no longer referenced are removed.
+app.config['EXPORT_FOLDER'] = os.environ.get('EXPORT_FOLDER', 'public')
+EXPORT_MANIFEST = '.export-manifest.json'
+STATIC_REFERENCE = re.compile(r'''(?:src|href|srcset)="([^"]+)"''')
+
+def referenced_static_files(html):
+    static_prefix = app.static_url_path + '/'
+    paths = set()
+    for attribute in STATIC_REFERENCE.findall(html):
+        # srcset holds "url width, url width"
+        for candidate in attribute.split(','):
+            url = candidate.strip().split(' ', 1)[0]
+            if url.startswith(static_prefix):
+                paths.add(url[len(static_prefix):].split('?', 1)[0])
+    return paths
+
+def static_source(path):
+    if path.startswith('uploads/'):
+        return os.path.join(app.config['UPLOAD_FOLDER'], path[len('uploads/'):])
+    return os.path.join(app.static_folder, path)
+
+def file_sha256(path, previous=None):
+    # Reuse the recorded hash while size and mtime are unchanged
+    stat = os.stat(path)
+    if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+        return previous['sha256'], stat
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest(), stat
+
+@app.cli.command("export")
+@click.option('--output', default=None, help='Output folder (default: EXPORT_FOLDER)')
+def export_site(output):
+    output = output or app.config['EXPORT_FOLDER']
+    manifest_path = os.path.join(output, EXPORT_MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    prepare_database()
+    snapshot = current_snapshot()
+    with app.test_request_context('/'):
+        html = render_index(snapshot, static_export=True)
+    pages = {'index.html': html.encode('utf-8')}
+
+    manifest = {}
+    written = unchanged = 0
+    for name, body in pages.items():
+        sha256 = hashlib.sha256(body).hexdigest()
+        manifest[name] = {'sha256': sha256}
+        target = os.path.join(output, name)
+        if previous.get(name, {}).get('sha256') == sha256 and os.path.exists(target):
+            unchanged += 1
+            continue
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        with open(target + '.tmp', 'wb') as f:
+            f.write(body)
+        os.replace(target + '.tmp', target)
+        written += 1
+
+    static_paths = referenced_static_files(html)
+    for path in [p for p in static_paths if FINGERPRINTED_ASSET.match(p) and p.endswith('.css')]:
+        # Fonts and images pulled in by the built stylesheets
+        with open(static_source(path), encoding='utf-8') as f:
+            static_paths.update('dist/' + m.group(2) for m in CSS_URL.finditer(f.read())
+                                if FINGERPRINTED_ASSET.match('dist/' + m.group(2)))
+    if snapshot.resume:
+        static_paths.add('uploads/' + snapshot.resume.file_name)
+    for path in sorted(static_paths):
+        source = static_source(path)
+        if not os.path.isfile(source):
+            print(f"Missing referenced file: {path}")
+            continue
+        name = 'static/' + path
+        sha256, stat = file_sha256(source, previous.get(name))
+        manifest[name] = {'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        target = os.path.join(output, name)
+        if previous.get(name, {}).get('sha256') == sha256 and os.path.exists(target):
+            unchanged += 1
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(source, target + '.tmp')
+        os.replace(target + '.tmp', target)
+        written += 1
+
+    removed = 0
+    for name in set(previous) - set(manifest):
+        try:
+            os.remove(os.path.join(output, name))
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    print(f"Exported to {output}: {written} written, {unchanged} unchanged, {removed} removed")
+
 # Initialize database and create admin user
 @app.cli.command("init-db")
 def init_db():
-    db.create_all()
+    prepare_database()
     
     # Create admin user if it doesn't exist
     admin = Admin.query.filter_by(username='admin').first()
@@ -673,9 +3357,295 @@ def init_db():
         db.session.commit()
         print("Admin user created: username='admin', password='admin123'")
 
+# Bulk import/export
+# Portfolio content moves as NDJSON, one row per line tagged with its section,
+# e.g. {"section": "projects", "title": "..."}. A JSON document keyed by
+# section ({"projects": [...], ...}) is accepted for import too. Imports run
+# in one transaction with batched executemany inserts; exports stream rows
+# from the database instead of loading whole tables.
+IMPORT_BATCH_SIZE = 1000
+
+# What the admin forms insist on, so imported rows render the same way:
+# the templates format these dates without checking for None
+IMPORT_REQUIRED = {
+    'profile': ('name',),
+    'skills': ('name', 'percentage'),
+    'projects': ('title',),
+    'experience': ('title', 'start_date'),
+    'education': ('degree', 'start_date'),
+    'certificates': ('name', 'date_earned'),
+    'resumes': ('file_name', 'original_name'),
+}
+IMPORT_RANGES = {
+    ('skills', 'percentage'): (0, 100),
+}
+
+def convert_import_value(column, value):
+    if value is None:
+        if not column.nullable and not column.primary_key:
+            raise ValueError(f"{column.key} cannot be null")
+        return None
+    kind = column.type.python_type
+    if kind is datetime:
+        return datetime.fromisoformat(value)
+    if kind is date:
+        return date.fromisoformat(value)
+    if kind is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"{column.key} must be true or false")
+        return value
+    if kind is int:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{column.key} must be an integer")
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"{column.key} must be a string")
+    length = getattr(column.type, 'length', None)
+    if length and len(value) > length:
+        raise ValueError(f"{column.key} is longer than {length} characters")
+    return value
+
+def import_row(section, table, row):
+    # Rows always go to the tenant the command runs as, under new ids: ids are
+    # global, so an exported id may already belong to this or another tenant
+    row = {key: value for key, value in row.items() if key != 'id'}
+    unknown = (set(row) - set(table.columns.keys())) | ({'tenant_id'} & set(row))
+    if unknown:
+        raise ValueError(f"unknown field(s) {', '.join(sorted(unknown))}")
+    required = IMPORT_REQUIRED.get(section, ())
+    values = {}
+    for column in table.columns:
+        if column.key in row:
+            # An explicit null would skip the default the templates rely on
+            if row[column.key] is None and column.default is not None:
+                raise ValueError(f"{column.key} cannot be null")
+            values[column.key] = convert_import_value(column, row[column.key])
+        elif not column.nullable and not column.primary_key and column.default is None:
+            raise ValueError(f"{column.key} is required")
+    for key in required:
+        value = values.get(key)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            raise ValueError(f"{key} is required")
+    for key, value in values.items():
+        low, high = IMPORT_RANGES.get((section, key), (None, None))
+        if value is not None and low is not None and not low <= value <= high:
+            raise ValueError(f"{key} must be between {low} and {high}")
+        if key == 'position' and value is not None and value < 0:
+            raise ValueError("position cannot be negative")
+    # Past entries show an end date, ongoing ones show "Present"
+    if section in ('experience', 'education') and not values.get('current') and values.get('end_date') is None:
+        raise ValueError("end_date is required unless current is true")
+    return values
+
+def read_import_rows(file, format):
+    # Yields (location, section, row)
+    if format == 'json':
+        document = json.load(file)
+        if not isinstance(document, dict):
+            raise click.ClickException("A JSON import must be an object keyed by section")
+        for section, rows in document.items():
+            for number, row in enumerate(rows if isinstance(rows, list) else [rows], 1):
+                yield f"{section}[{number}]", section, row
+        return
+    for number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise click.ClickException(f"line {number}: invalid JSON ({e})")
+        if not isinstance(row, dict):
+            raise click.ClickException(f"line {number}: expected an object")
+        yield f"line {number}", row.pop('section', None), row
+
+def flush_import_batch(conn, table, batch):
+    # executemany needs the same keys in every row
+    groups = {}
+    for values in batch:
+        groups.setdefault(tuple(values), []).append(values)
+    for rows in groups.values():
+        try:
+            conn.execute(table.insert(), rows)
+        except IntegrityError as e:
+            # Leaving the transaction rolls back everything imported so far
+            raise click.ClickException(f"{table.name}: {e.orig}")
+    batch.clear()
+
+@app.cli.command("import-portfolio")
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--format', 'format', type=click.Choice(['auto', 'ndjson', 'json']), default='auto')
+@click.option('--replace', is_flag=True, help='Delete existing portfolio content first')
+@click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True)
+def import_portfolio(source, format, replace, batch_size):
+    if format == 'auto':
+        format = 'json' if source.name.endswith('.json') else 'ndjson'
+    prepare_database()
+    started = time.perf_counter()
+    counts = {}
+    batches = {}
+
+    tenant_id = current_tenant_id()
+
+    # One transaction: a bad row anywhere leaves the database untouched
+    with db.engine.begin() as conn:
+        if replace:
+            for model in CONTENT_MODELS:
+                conn.execute(model.__table__.delete().where(model.tenant_id == tenant_id))
+            if conn.execute(select(func.count()).select_from(Tenant)).scalar() <= 1:
+                # Start from an empty index: the row-by-row deletes above leave
+                # tombstones that make the inserts below several times slower.
+                # (After the DELETEs, so the DDL runs inside the transaction.)
+                # Other tenants' entries would be lost, so only with one tenant.
+                conn.exec_driver_sql('DROP TABLE IF EXISTS search_index')
+                conn.exec_driver_sql(SEARCH_INDEX_DDL)
+        for location, section, row in read_import_rows(source, format):
+            model = SECTION_MODELS.get(section)
+            if model is None:
+                raise click.ClickException(f"{location}: unknown section {section!r}")
+            if not isinstance(row, dict):
+                raise click.ClickException(f"{location}: expected an object")
+            try:
+                values = import_row(section, model.__table__, row)
+            except (ValueError, TypeError) as e:
+                raise click.ClickException(f"{location}: {e}")
+            values['tenant_id'] = tenant_id
+            batch = batches.setdefault(section, [])
+            batch.append(values)
+            counts[section] = counts.get(section, 0) + 1
+            if len(batch) >= batch_size:
+                flush_import_batch(conn, model.__table__, batch)
+        for section, batch in batches.items():
+            flush_import_batch(conn, SECTION_MODELS[section].__table__, batch)
+        # Bulk inserts bypass the session hooks; recount below
+        conn.execute(section_stat_table.delete().where(section_stat_table.c.tenant_id == tenant_id))
+        conn.execute(bump_version_stmt, {'tenant_id': tenant_id})
+
+    ensure_section_stats()
+    expire_snapshot(tenant_id)
+    purge_edge_cache([ALL_CONTENT_TAG])
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    for section, count in sorted(counts.items()):
+        print(f"  {section}: {count}")
+    print(f"Imported {total} rows in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s)")
+
+def export_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+@app.cli.command("export-portfolio")
+@click.option('--output', type=click.File('w', encoding='utf-8'), default='-', help='NDJSON file (default: stdout)')
+def export_portfolio(output):
+    prepare_database()
+    started = time.perf_counter()
+    tenant_id = current_tenant_id()
+    total = 0
+    with db.engine.connect() as conn:
+        for section, model in SECTION_MODELS.items():
+            table = model.__table__
+            columns = [column for column in table.columns if column.key != 'tenant_id']
+            # stream_results fetches in chunks instead of the whole table
+            result = conn.execution_options(yield_per=IMPORT_BATCH_SIZE).execute(
+                select(*columns).where(table.c.tenant_id == tenant_id).order_by(*table.primary_key.columns))
+            for row in result:
+                output.write(json.dumps({'section': section, **row._asdict()}, default=export_value) + '\n')
+                total += 1
+    output.flush()
+    elapsed = time.perf_counter() - started
+    click.echo(f"Exported {total} rows in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s)", err=True)
+
+# Startup profiling
+# Templates are compiled to Python on first render, which is most of the
+# first request after a cold start. `flask compile-templates` stores the
+# compiled code in TEMPLATE_CACHE_FOLDER, and `flask startup-profile` times
+# the import and first request in fresh interpreters with and without LAZY_INIT.
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    # Keyed by template name rather than absolute path so a cache built in one
+    # checkout is valid in the deployed copy; the source checksum still
+    # catches edited templates.
+    def get_cache_key(self, name, filename=None):
+        return super().get_cache_key(name)
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            # Read-only deployments keep serving with the in-memory template
+            print(f"Template cache error: {e}")
+
+if app.config['TEMPLATE_CACHE_FOLDER']:
+    app.jinja_env.bytecode_cache = TemplateBytecodeCache(app.config['TEMPLATE_CACHE_FOLDER'])
+
+@app.cli.command("compile-templates")
+def compile_templates():
+    folder = app.config['TEMPLATE_CACHE_FOLDER']
+    if not folder:
+        raise click.ClickException('Set TEMPLATE_CACHE_FOLDER to the folder the compiled templates should go in')
+    os.makedirs(folder, exist_ok=True)
+    app.jinja_env.bytecode_cache.clear()
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    click.echo(f"Compiled {len(names)} templates into {folder}")
+
+STARTUP_PROBE = """
+import json, time
+started = time.perf_counter()
+from {module} import app
+imported = time.perf_counter()
+status = app.test_client().get({path!r}).status_code
+print(json.dumps({{'import': imported - started, 'request': time.perf_counter() - imported, 'status': status}}))
+"""
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \| ( *)(\S+)$')
+
+def run_startup_probe(path, lazy, *options):
+    env = {**os.environ, 'LAZY_INIT': 'true' if lazy else 'false'}
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, *options, '-c', STARTUP_PROBE.format(module=app.import_name, path=path)],
+                            cwd=app.root_path, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise click.ClickException(f"Startup probe failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process'] = elapsed
+    return timings, result.stderr
+
+@app.cli.command("startup-profile")
+@click.option('--path', default='/', show_default=True, help='URL requested after the import')
+@click.option('--runs', default=5, show_default=True, type=click.IntRange(1), help='Cold starts per mode; the median is reported')
+@click.option('--top', default=15, show_default=True, help='Number of packages to list')
+def startup_profile(path, runs, top):
+    results = {}
+    for lazy in (False, True):
+        samples = [run_startup_probe(path, lazy)[0] for _ in range(runs)]
+        results[lazy] = {key: sorted(s[key] for s in samples)[runs // 2] for key in ('import', 'request', 'process')}
+        results[lazy]['status'] = samples[-1]['status']
+
+    click.echo(f"Cold start, median of {runs} runs (GET {path} -> {results[True]['status']})")
+    click.echo(f"{'':<16}{'eager':>10}{'LAZY_INIT':>12}")
+    for key, label in (('import', f'import {app.import_name}'), ('request', 'first request'),
+                       ('process', 'whole process')):
+        click.echo(f"{label:<16}{results[False][key] * 1000:>8.1f}ms{results[True][key] * 1000:>10.1f}ms")
+
+    # -X importtime writes one line per module with its own (self) time;
+    # add them up per top-level package to see what the import is made of.
+    _, report = run_startup_probe(path, app.config['LAZY_INIT'], '-X', 'importtime')
+    packages = {}
+    for line in report.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            package = match.group(3).split('.')[0]
+            packages[package] = packages.get(package, 0) + int(match.group(1))
+    total = sum(packages.values())
+    click.echo(f"\nImport time by package (self time, LAZY_INIT={'on' if app.config['LAZY_INIT'] else 'off'}, "
+               f"{total / 1000:.1f}ms in total)")
+    for package, micros in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        click.echo(f"  {package:<24}{micros / 1000:>8.1f}ms {micros * 100 / total:>5.1f}%")
+
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        prepare_database()
         
         # Create admin user if it doesn't exist
         admin = Admin.query.filter_by(username='admin').first()
@@ -0,0 +1,189 @@
+import asyncio
+import contextvars
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.wsgi import FileWrapper
+
+from app import app as flask_app
+
+# ASGI entry point: uvicorn asgi:app
+# Under wsgi.py a worker thread is held for the whole request, so a client
+# trickling a contact form in or reading a resume slowly pins it. Here the
+# request body is read and the response written on the event loop; Flask
+# only runs in a pool thread to build the response and, for file downloads,
+# to read each chunk. Every route, admin included, goes through the same
+# Flask app, so behaviour matches wsgi.py.
+THREADS = int(os.environ.get('ASGI_THREADS', 8))
+STREAM_CHUNK = 64 * 1024
+BODY_MEMORY = 1024 * 1024     # larger request bodies are spooled to disk
+
+executor = ThreadPoolExecutor(max_workers=THREADS, thread_name_prefix='asgi')
+
+
+def file_wrapper(file, buffer_size=8192):
+    # send_file's default 8 KB reads would mean a thread hop per 8 KB
+    return FileWrapper(file, max(buffer_size, STREAM_CHUNK))
+
+
+def build_environ(scope, body, size):
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+        'wsgi.file_wrapper': file_wrapper,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+        environ['REMOTE_PORT'] = str(scope['client'][1])
+    for name, value in scope['headers']:
+        name = name.decode('latin-1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    # The whole body is buffered, so its length is known even when the client
+    # sent it chunked; without this Flask would read a chunked body as empty
+    environ['CONTENT_LENGTH'] = str(size)
+    environ['wsgi.input_terminated'] = True
+    environ.pop('HTTP_TRANSFER_ENCODING', None)
+    return environ
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+async def read_body(receive):
+    # Returns (body, size), or None if the client went away. Stops reading as
+    # soon as the body passes MAX_CONTENT_LENGTH, whatever Content-Length said
+    limit = flask_app.config['MAX_CONTENT_LENGTH']
+    body = SpooledTemporaryFile(max_size=BODY_MEMORY)
+    size = 0
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return None
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if limit is not None and size > limit:
+                raise BodyTooLarge()
+            body.write(chunk)
+            if not message.get('more_body'):
+                body.seek(0)
+                return body, size
+    except BaseException:
+        body.close()
+        raise
+
+
+async def send_too_large(send):
+    # The same page Flask sends for an oversized Content-Length
+    response = RequestEntityTooLarge().get_response()
+    await send({'type': 'http.response.start', 'status': response.status_code,
+                'headers': [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                            for k, v in response.headers.items()]})
+    await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+def call_app(environ):
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and started:
+            raise exc_info[1].with_traceback(exc_info[2])
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]
+        return started.setdefault('written', []).append
+
+    iterable = flask_app(environ, start_response)
+    iterator = iter(iterable)
+    # Small responses come back in one hop together with the headers
+    chunk, done = read_chunk(iterator)
+    return started, iterable, iterator, b''.join(started.get('written', [])) + chunk, done
+
+
+def read_chunk(iterator):
+    parts, size = [], 0
+    for part in iterator:
+        if part:
+            parts.append(part)
+            size += len(part)
+            if size >= STREAM_CHUNK:
+                return b''.join(parts), False
+    return b''.join(parts), True
+
+
+def close_iterable(iterable):
+    if hasattr(iterable, 'close'):
+        iterable.close()
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    try:
+        received = await read_body(receive)
+    except BodyTooLarge:
+        await send_too_large(send)
+        return
+    if received is None:
+        return
+    body, size = received
+    loop = asyncio.get_running_loop()
+    # One context for the call and every chunk, so streamed responses that
+    # push an app context see it on each read
+    context = contextvars.copy_context()
+
+    def in_pool(func, *args):
+        return loop.run_in_executor(executor, context.run, func, *args)
+
+    try:
+        started, iterable, iterator, chunk, done = await in_pool(call_app, build_environ(scope, body, size))
+        try:
+            await send({'type': 'http.response.start', 'status': started['status'],
+                        'headers': started['headers']})
+            while not done:
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                chunk, done = await in_pool(read_chunk, iterator)
+            await send({'type': 'http.response.body', 'body': chunk})
+        finally:
+            await in_pool(close_iterable, iterable)
+    finally:
+        body.close()
@@ -0,0 +1,150 @@
+"""Measure public page latency during a credential-stuffing burst on /admin/login.
+
+Runs the app on a local threaded WSGI server in its own process, against a
+throwaway database. Visitor threads fetch / while attacker threads post wrong
+passwords for the admin account at a fixed combined rate, each from its own
+loopback address (127.0.x.y) so the per-IP buckets see many clients. The
+burst is run with login throttling off and on, and each run reports the
+visitors' latency and how many password hashes the attack cost. A rejected
+attempt still costs about as much as a page view, so keep --rate within what
+the machine could serve as ordinary requests.
+
+    python benchmarks/login_burst.py --visitors 4 --attackers 32 --rate 50 --seconds 5
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--visitors', type=int, default=4, help='threads fetching the public page')
+    parser.add_argument('--attackers', type=int, default=32, help='threads posting to /admin/login')
+    parser.add_argument('--rate', type=float, default=50, help='login attempts per second across all attackers')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+
+    print(f"{'phase':<22} {'page req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'logins/s':>9} {'429s':>7} {'hashes':>7}")
+    for name, attackers, throttled in (('no attack', 0, True), ('attack, unthrottled', args.attackers, False),
+                                        ('attack, throttled', args.attackers, True)):
+        # A fresh server process per phase, so the load generator's threads
+        # don't share its interpreter and every phase starts without lockouts
+        ready = multiprocessing.Queue()
+        hashes = multiprocessing.Value('i', 0)
+        server = multiprocessing.Process(target=serve, args=(throttled, ready, hashes), daemon=True)
+        server.start()
+        port = ready.get(timeout=60)
+        page, attempts, rejected = run_burst(port, args.visitors, attackers, args.rate, args.seconds)
+        server.terminate()
+        server.join()
+        page.sort()
+
+        def percentile(p):
+            return page[min(len(page) - 1, int(len(page) * p))] * 1000
+
+        print(f"{name:<22} {len(page) / args.seconds:>10.1f} {percentile(0.50):>8.2f} {percentile(0.95):>8.2f} "
+              f"{percentile(0.99):>8.2f} {attempts / args.seconds:>9.1f} {rejected:>7} {hashes.value:>7}")
+
+
+def serve(throttled, ready, hashes):
+    sys.path.insert(0, ROOT)
+    import app as portfolio
+    from werkzeug.security import generate_password_hash
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    with portfolio.app.app_context():
+        portfolio.prepare_database()
+        if not portfolio.Admin.query.filter_by(username='admin').first():
+            portfolio.db.session.add(portfolio.Admin(username='admin', password_hash=generate_password_hash('secret')))
+            portfolio.db.session.add(portfolio.Profile(name='Bench', title='Developer', about='About'))
+            portfolio.db.session.commit()
+        with portfolio.db.engine.begin() as conn:
+            conn.execute(portfolio.login_throttle_table.delete())
+    portfolio.app.config['LOGIN_THROTTLE_ENABLED'] = throttled
+
+    # Count the hashes the attack makes the server compute
+    check_password_hash = portfolio.check_password_hash
+
+    def counting_check(*a, **kw):
+        with hashes.get_lock():
+            hashes.value += 1
+        return check_password_hash(*a, **kw)
+
+    portfolio.check_password_hash = counting_check
+
+    server = make_server('127.0.0.1', 0, portfolio.app, threaded=True, request_handler=QuietHandler)
+    ready.put(server.server_port)
+    server.serve_forever()
+
+
+def run_burst(port, visitors, attackers, rate, seconds):
+    deadline = time.monotonic() + seconds
+    latencies = []
+    totals = {'attempts': 0, 'rejected': 0}
+    lock = threading.Lock()
+
+    def visitor():
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        timings = []
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            timings.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(timings)
+
+    def attacker(n):
+        # A distinct source address per attacker stands in for a botnet
+        conn = http.client.HTTPConnection('127.0.0.1', port, source_address=(f'127.0.{n // 250}.{n % 250 + 2}', 0))
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        interval = attackers / rate
+        next_attempt = time.monotonic() + interval * n / attackers
+        attempts = rejected = 0
+        while time.monotonic() < deadline:
+            # Attacks arrive at a fixed rate; a saturated server falls behind
+            # instead of being given breathing room
+            delay = next_attempt - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_attempt += interval
+            body = urlencode({'username': 'admin', 'password': f'guess-{n}-{attempts}'})
+            conn.request('POST', '/admin/login', body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            attempts += 1
+            rejected += response.status == 429
+        conn.close()
+        with lock:
+            totals['attempts'] += attempts
+            totals['rejected'] += rejected
+
+    threads = [threading.Thread(target=visitor) for _ in range(visitors)]
+    threads += [threading.Thread(target=attacker, args=(n,)) for n in range(attackers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, totals['attempts'], totals['rejected']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Compare resume download throughput with and without proxy offload.
+
+Runs the app on a local threaded WSGI server against a throwaway database
+and upload folder, then hammers /download/resume/<id> from several client
+threads. With offload enabled the worker only sends headers and the front
+proxy (nginx/Apache) would stream the body, so the numbers show how much
+worker time a download costs in each mode.
+
+    python benchmarks/resume_offload.py --size 262144 --clients 16 --seconds 5
+"""
+import argparse
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=256 * 1024, help='resume size in bytes')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    sys.path.insert(0, ROOT)
+    import app as portfolio
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    with portfolio.app.app_context():
+        portfolio.db.create_all()
+        portfolio.ensure_content_version()
+        with open(os.path.join(os.environ['UPLOAD_FOLDER'], 'resume.pdf'), 'wb') as f:
+            f.write(os.urandom(args.size))
+        resume = portfolio.Resume(file_name='resume.pdf', original_name='resume.pdf')
+        portfolio.db.session.add(resume)
+        portfolio.db.session.commit()
+        path = f'/download/resume/{resume.id}'
+
+    server = make_server('127.0.0.1', 0, portfolio.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"{'mode':<18} {'req/s':>10} {'MB/s':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode in (None, 'x-accel-redirect', 'x-sendfile'):
+        portfolio.app.config['RESUME_OFFLOAD'] = mode
+        requests, received, latencies = run_clients(server.server_port, path, args.clients, args.seconds)
+        latencies.sort()
+        print(f"{mode or 'worker streams':<18} {requests / args.seconds:>10.1f} "
+              f"{received / args.seconds / 1e6:>10.1f} "
+              f"{latencies[len(latencies) // 2] * 1000:>8.2f} "
+              f"{latencies[int(len(latencies) * 0.95)] * 1000:>8.2f}")
+
+    server.shutdown()
+
+
+def run_clients(port, path, clients, seconds):
+    deadline = time.monotonic() + seconds
+    totals = {'requests': 0, 'bytes': 0}
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        count = size = 0
+        timings = []
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            conn.request('GET', path)
+            body = conn.getresponse().read()
+            timings.append(time.perf_counter() - started)
+            count += 1
+            size += len(body)
+        conn.close()
+        with lock:
+            totals['requests'] += count
+            totals['bytes'] += size
+            latencies.extend(timings)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return totals['requests'], totals['bytes'], latencies
+
+
+if __name__ == '__main__':
+    main()
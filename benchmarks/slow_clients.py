@@ -0,0 +1,235 @@
+"""Compare how many slow clients the sync and ASGI deployments can hold.
+
+Runs the app against a throwaway database in a server process: first behind a
+WSGI server with a fixed pool of worker threads (like gunicorn's gthread
+worker, --threads), then as asgi.py under uvicorn. In each run --slow clients
+open connections that either read a large resume download a few KB at a time
+or trickle a contact form in, while a probe fetches the portfolio page twice a
+second. The table shows how many of the slow downloads were still streaming
+at the end, whether the probe got through, and how many threads the server
+needed.
+
+    pip install uvicorn
+    python benchmarks/slow_clients.py --slow 2000 --threads 8 --seconds 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import socket
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME_SIZE = 32 * 1024 * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slow', type=int, default=1000, help='slow connections to open')
+    parser.add_argument('--threads', type=int, default=8, help='worker threads in both deployments')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    # Every slow client is a socket on both ends
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, min(hard, 4 * args.slow + 256)), hard))
+
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    os.environ['ASGI_THREADS'] = str(args.threads)
+    # Messages stay in the outbox instead of going to a real mail server
+    os.environ['OUTBOX_WORKERS'] = '0'
+    resume_id = seed()
+    # Fresh interpreters, so neither server inherits this process's connections
+    spawn = multiprocessing.get_context('spawn')
+
+    print(f"{'deployment':<16} {'streaming':>10} {'probe ok':>9} {'timeouts':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'threads':>8}")
+    for name, target in (('sync threads', serve_sync), ('asgi (uvicorn)', serve_asgi)):
+        port = free_port()
+        server = spawn.Process(target=target, args=(port, args.threads), daemon=True)
+        server.start()
+        if not wait_for(port, server):
+            print(f"{name:<16} did not start (is uvicorn installed?)")
+            continue
+        streaming, probes, timeouts, threads = asyncio.run(
+            run_clients(port, server.pid, resume_id, args.slow, args.seconds))
+        server.terminate()
+        server.join()
+        probes.sort()
+
+        def percentile(p):
+            return probes[min(len(probes) - 1, int(len(probes) * p))] * 1000 if probes else float('nan')
+
+        print(f"{name:<16} {streaming:>10} {len(probes):>9} {timeouts:>9} "
+              f"{percentile(0.50):>8.1f} {percentile(0.95):>8.1f} {threads:>8}")
+
+
+def seed():
+    sys.path.insert(0, ROOT)
+    import app as portfolio
+
+    with portfolio.app.app_context():
+        portfolio.prepare_database()
+        os.makedirs(os.environ['UPLOAD_FOLDER'], exist_ok=True)
+        with open(os.path.join(os.environ['UPLOAD_FOLDER'], 'resume.pdf'), 'wb') as f:
+            f.write(os.urandom(RESUME_SIZE))
+        resume = portfolio.Resume(file_name='resume.pdf', original_name='resume.pdf')
+        portfolio.db.session.add(resume)
+        portfolio.db.session.add(portfolio.Profile(name='Bench', title='Developer', about='About'))
+        portfolio.db.session.commit()
+        return resume.id
+
+
+def serve_sync(port, threads):
+    sys.path.insert(0, ROOT)
+    import app as portfolio
+    from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    class PooledServer(BaseWSGIServer):
+        # Each request keeps its thread until the client has everything
+        request_queue_size = 4096
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(max_workers=threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self.process_request_thread, request, client_address)
+
+        def process_request_thread(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    PooledServer('127.0.0.1', port, portfolio.app, handler=QuietHandler).serve_forever()
+
+
+def serve_asgi(port, threads):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import uvicorn
+    uvicorn.run('asgi:app', host='127.0.0.1', port=port, log_level='warning', backlog=4096)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and server.is_alive():
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def server_threads(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('Threads:'):
+                return int(line.split()[1])
+    return 0
+
+
+async def open_slow(port):
+    # A small receive buffer keeps the kernel from soaking up the download
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ('127.0.0.1', port))
+    return await asyncio.open_connection(sock=sock)
+
+
+async def slow_download(port, resume_id, deadline, state):
+    reader, writer = await open_slow(port)
+    writer.write(f'GET /download/resume/{resume_id} HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n'.encode())
+    await writer.drain()
+    received = 0
+    try:
+        while True:
+            data = await asyncio.wait_for(reader.read(2048), deadline - time.monotonic())
+            if not data:
+                break
+            received += len(data)
+            await asyncio.sleep(0.5)
+    except asyncio.TimeoutError:
+        # Still receiving the body at the deadline means the server is holding it
+        state['streaming'] += received > 0
+    writer.close()
+
+
+async def slow_contact(port, deadline):
+    reader, writer = await open_slow(port)
+    body = b'name=Slow&email=slow%40example.com&subject=Hello&message=' + b'x' * 4096
+    writer.write(b'POST /contact HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n'
+                 b'Content-Type: application/x-www-form-urlencoded\r\n'
+                 b'Content-Length: %d\r\n\r\n' % len(body))
+    sent = 0
+    while time.monotonic() < deadline and sent < len(body) - 1:
+        writer.write(body[sent:sent + 16])
+        sent += 16
+        await writer.drain()
+        await asyncio.sleep(0.5)
+    # The last byte is never sent, so the request stays unfinished to the end
+    writer.close()
+
+
+async def probe(port, deadline, state):
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), 5)
+            writer.write(b'GET / HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n')
+            status = await asyncio.wait_for(reader.readline(), 5)
+            await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            if b' 200 ' in status:
+                state['probes'].append(time.perf_counter() - started)
+        except (asyncio.TimeoutError, OSError):
+            state['timeouts'] += 1
+        await asyncio.sleep(max(0.0, 0.5 - (time.perf_counter() - started)))
+
+
+async def run_clients(port, pid, resume_id, slow, seconds):
+    deadline = time.monotonic() + seconds
+    state = {'streaming': 0, 'probes': [], 'timeouts': 0, 'threads': 0}
+
+    async def watch_threads():
+        while time.monotonic() < deadline:
+            state['threads'] = max(state['threads'], server_threads(pid))
+            await asyncio.sleep(0.25)
+
+    clients = []
+    for n in range(slow):
+        if n % 2:
+            clients.append(slow_contact(port, deadline))
+        else:
+            clients.append(slow_download(port, resume_id, deadline, state))
+    results = await asyncio.gather(probe(port, deadline, state), watch_threads(), *clients,
+                                   return_exceptions=True)
+    failed = sum(isinstance(result, Exception) for result in results)
+    if failed:
+        print(f"  {failed} slow clients could not connect")
+    return state['streaming'], state['probes'], state['timeouts'], state['threads']
+
+
+if __name__ == '__main__':
+    main()
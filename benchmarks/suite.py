@@ -0,0 +1,355 @@
+"""Load-test the portfolio app and compare the results against a baseline.
+
+Seeds a throwaway SQLite database with a given number of projects, skills
+and certificates, then drives the public page, resume view/download, the
+contact form (against a local SMTP stub) and the admin skill CRUD routes.
+Each volume is measured twice: in-process through the Flask test client,
+where SQL statements per request are counted, and over HTTP against a real
+threaded WSGI server. Results are written as JSON; `check` runs the suite
+again and fails if throughput, latency, SQL counts or peak RSS regressed.
+
+    python benchmarks/suite.py run --volumes 10,1000,10000 --output benchmarks/baseline.json
+    python benchmarks/suite.py check benchmarks/baseline.json --tolerance 0.25
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import resource
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from urllib.parse import urlencode
+
+from sqlalchemy import event, insert
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADMIN_PASSWORD = 'bench-password'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the suite and write the results')
+    run_parser.add_argument('--output', default=None, help='write results JSON here (default: stdout)')
+    check_parser = commands.add_parser('check', help='run the suite and compare with a baseline')
+    check_parser.add_argument('baseline')
+    check_parser.add_argument('--results', default=None, help='compare this results file instead of running')
+    check_parser.add_argument('--tolerance', type=float, default=0.25,
+                              help='allowed relative slowdown before failing (default 0.25)')
+    for command in (run_parser, check_parser):
+        command.add_argument('--volumes', default='10,1000', help='comma-separated row counts to seed')
+        command.add_argument('--requests', type=int, default=200, help='test client requests per scenario')
+        command.add_argument('--clients', type=int, default=8, help='HTTP client threads')
+        command.add_argument('--seconds', type=float, default=3.0, help='HTTP run time per scenario')
+    args = parser.parse_args()
+
+    if args.command == 'check' and args.results:
+        with open(args.results) as f:
+            results = json.load(f)
+    else:
+        results = run_suite([int(v) for v in args.volumes.split(',')], args)
+
+    if args.command == 'run':
+        output = json.dumps(results, indent=1, sort_keys=True)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(output + '\n')
+            print(f"Wrote {args.output}")
+        else:
+            print(output)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(baseline, results, args.tolerance)
+    for line in regressions:
+        print(line)
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+
+def run_suite(volumes, args):
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    smtp = start_smtp_stub()
+    os.environ.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(workdir, 'bench.db'),
+        'UPLOAD_FOLDER': os.path.join(workdir, 'uploads'),
+        'MAIL_SERVER': '127.0.0.1',
+        'MAIL_PORT': str(smtp.server_address[1]),
+        'MAIL_USE_TLS': 'false',
+        'MAIL_USERNAME': '',
+        'MAIL_DEFAULT_SENDER': 'owner@example.com',
+    })
+    sys.path.insert(0, ROOT)
+    import app as portfolio
+    from werkzeug.security import generate_password_hash
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    statements = {'count': 0}
+
+    with portfolio.app.app_context():
+        portfolio.prepare_database()
+        portfolio.db.session.add(portfolio.Admin(username='bench', password_hash=generate_password_hash(ADMIN_PASSWORD)))
+        portfolio.db.session.commit()
+
+        @event.listens_for(portfolio.db.engine, 'before_cursor_execute')
+        def count_statement(*args):
+            statements['count'] += 1
+
+    server = make_server('127.0.0.1', 0, portfolio.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': datetime.utcnow().isoformat(timespec='seconds'),
+            'requests': args.requests,
+            'clients': args.clients,
+            'seconds': args.seconds,
+        },
+        'volumes': {},
+    }
+    for volume in volumes:
+        print(f"Seeding {volume} rows per section", file=sys.stderr)
+        resume_id = seed(portfolio, volume)
+        results['volumes'][str(volume)] = {
+            'client': run_test_client(portfolio, resume_id, args.requests, statements),
+            'server': run_server(server.server_port, resume_id, args.clients, args.seconds),
+            'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+        print(format_volume(volume, results['volumes'][str(volume)]), file=sys.stderr)
+
+    server.shutdown()
+    smtp.shutdown()
+    results['meta']['smtp_messages'] = smtp.messages
+    return results
+
+
+def seed(portfolio, volume):
+    with portfolio.app.app_context():
+        session = portfolio.db.session
+        for model in portfolio.CONTENT_MODELS:
+            session.query(model).delete()
+        session.add(portfolio.Profile(name='Bench Person', title='Engineer', about='About ' * 50,
+                                      email='bench@example.com', location='Earth'))
+        session.execute(insert(portfolio.Skill), [
+            {'name': f'Skill {i}', 'percentage': i % 100, 'category': f'Category {i % 8}'}
+            for i in range(volume)])
+        session.execute(insert(portfolio.Project), [
+            {'title': f'Project {i}', 'description': 'Description ' * 20, 'link': 'https://example.com',
+             'github_link': 'https://github.com/example', 'technologies': 'Python, Flask, SQLite'}
+            for i in range(volume)])
+        session.execute(insert(portfolio.Certificate), [
+            {'name': f'Certificate {i}', 'issuer': 'Issuer', 'date_earned': date(2020, 1, 1 + i % 28),
+             'link': 'https://example.com'}
+            for i in range(volume)])
+        session.add(portfolio.Experience(title='Engineer', company='Example', start_date=date(2020, 1, 1), current=True))
+        session.add(portfolio.Education(degree='BSc', institution='University', start_date=date(2015, 1, 1),
+                                        end_date=date(2019, 1, 1)))
+
+        with open(os.path.join(portfolio.app.config['UPLOAD_FOLDER'], 'bench-resume.pdf'), 'wb') as f:
+            f.write(b'%PDF-1.4\n' + os.urandom(128 * 1024))
+        resume = portfolio.Resume(file_name='bench-resume.pdf', original_name='resume.pdf')
+        session.add(resume)
+        session.commit()
+        # Bulk inserts skip the session hooks, so recount the dashboard
+        # statistics and bump the content version by hand
+        session.query(portfolio.SectionStat).delete()
+        session.commit()
+        portfolio.ensure_section_stats()
+        portfolio.touch_content()
+        return resume.id
+
+
+def run_test_client(portfolio, resume_id, requests, statements):
+    client = portfolio.app.test_client()
+    response = client.post('/admin/login', data={'username': 'bench', 'password': ADMIN_PASSWORD})
+    assert response.status_code == 302, 'admin login failed'
+
+    contact = {'name': 'Bench', 'email': 'visitor@example.com', 'subject': 'Hello', 'message': 'Hi there'}
+    skill = {'name': 'Bench CRUD', 'percentage': '50', 'category': 'Bench'}
+    created = []
+
+    def add_skill():
+        client.post('/admin/skills/add', data=skill)
+
+    def edit_skill():
+        client.post(f'/admin/skills/edit/{created.pop()}', data=dict(skill, percentage='75'))
+
+    def delete_skill():
+        client.get(f'/admin/skills/delete/{created.pop()}')
+
+    def created_skills():
+        with portfolio.app.app_context():
+            ids = [s.id for s in portfolio.Skill.query.filter_by(category='Bench')]
+        created[:] = ids * 2  # each id is edited once, then deleted once
+
+    scenarios = [
+        ('index', lambda: client.get('/')),
+        ('resume_view', lambda: client.get(f'/resume/{resume_id}')),
+        ('resume_download', lambda: client.get(f'/download/resume/{resume_id}')),
+        ('contact', lambda: client.post('/contact', data=contact)),
+        ('admin_dashboard', lambda: client.get('/admin/dashboard')),
+        ('admin_skills', lambda: client.get('/admin/skills')),
+        ('admin_add_skill', add_skill),
+        ('admin_edit_skill', edit_skill),
+        ('admin_delete_skill', delete_skill),
+    ]
+    results = {}
+    for name, send in scenarios:
+        if name == 'admin_edit_skill':
+            created_skills()
+        latencies = []
+        before = statements['count']
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            send()
+            latencies.append(time.perf_counter() - request_started)
+        elapsed = time.perf_counter() - started
+        results[name] = summarize(latencies, elapsed)
+        results[name]['sql_per_request'] = round((statements['count'] - before) / requests, 2)
+    return results
+
+
+def run_server(port, resume_id, clients, seconds):
+    contact = urlencode({'name': 'Bench', 'email': 'visitor@example.com', 'subject': 'Hello', 'message': 'Hi'})
+    scenarios = [
+        ('index', 'GET', '/', None),
+        ('resume_view', 'GET', f'/resume/{resume_id}', None),
+        ('resume_download', 'GET', f'/download/resume/{resume_id}', None),
+        ('contact', 'POST', '/contact', contact),
+    ]
+    results = {}
+    for name, method, path, body in scenarios:
+        latencies, elapsed = run_clients(port, method, path, body, clients, seconds)
+        results[name] = summarize(latencies, elapsed)
+    return results
+
+
+def run_clients(port, method, path, body, clients, seconds):
+    deadline = time.monotonic() + seconds
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'} if body else {}
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        timings = []
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            conn.request(method, path, body=body, headers=headers)
+            conn.getresponse().read()
+            timings.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(timings)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+
+def summarize(latencies, elapsed):
+    latencies = sorted(latencies)
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3)
+
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def format_volume(volume, result):
+    lines = [f"\n{volume} rows, peak RSS {result['peak_rss_kb'] / 1024:.1f} MB",
+             f"{'mode':<7} {'scenario':<20} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'SQL/req':>8}"]
+    for mode in ('client', 'server'):
+        for name, stats in result[mode].items():
+            lines.append(f"{mode:<7} {name:<20} {stats['rps']:>9.1f} {stats['p50_ms']:>8.2f} "
+                         f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats.get('sql_per_request', ''):>8}")
+    return '\n'.join(lines)
+
+
+def compare(baseline, results, tolerance):
+    regressions = []
+    for volume, expected in baseline['volumes'].items():
+        actual = results['volumes'].get(volume)
+        if actual is None:
+            continue
+        if actual['peak_rss_kb'] > expected['peak_rss_kb'] * (1 + tolerance):
+            regressions.append(f"{volume} rows: peak RSS {expected['peak_rss_kb']} -> {actual['peak_rss_kb']} KB")
+        for mode in ('client', 'server'):
+            for name, old in expected[mode].items():
+                new = actual[mode].get(name)
+                if new is None:
+                    continue
+                label = f"{volume} rows {mode} {name}"
+                if new['rps'] < old['rps'] * (1 - tolerance):
+                    regressions.append(f"{label}: throughput {old['rps']} -> {new['rps']} req/s")
+                if new['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+                    regressions.append(f"{label}: p95 {old['p95_ms']} -> {new['p95_ms']} ms")
+                if new.get('sql_per_request', 0) > old.get('sql_per_request', 0):
+                    regressions.append(f"{label}: SQL/request {old['sql_per_request']} -> {new['sql_per_request']}")
+    return regressions
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    """Accepts and discards mail so /contact can be exercised end to end."""
+    daemon_threads = True
+    allow_reuse_address = True
+    messages = 0
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.reply('220 bench ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip().upper()
+            if command.startswith('EHLO'):
+                self.reply('250-bench\r\n250 8BITMIME')
+            elif command == 'DATA':
+                self.reply('354 end with .')
+                while self.rfile.readline() not in (b'.\r\n', b'.\n', b''):
+                    pass
+                self.server.messages += 1
+                self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+    def reply(self, text):
+        self.wfile.write(text.encode('ascii') + b'\r\n')
+
+
+def start_smtp_stub():
+    server = SMTPStub(('127.0.0.1', 0), SMTPHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    sys.exit(main())
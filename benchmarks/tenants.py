@@ -0,0 +1,104 @@
+"""Measure how the public page holds up as one process serves more tenants.
+
+For each tenant count, a fresh interpreter seeds a throwaway database with
+that many portfolios (--rows entries per section each) and fetches / through
+the test client, cycling through the tenants' hosts in turn. The table shows
+throughput, latency, peak RSS, how much the snapshot and page caches hold and
+how many entries they evicted to stay within --cache-mb.
+
+    python benchmarks/tenants.py --tenants 1,100,1000 --requests 5000 --cache-mb 16
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tenants', default='1,100,1000', help='comma-separated tenant counts')
+    parser.add_argument('--rows', type=int, default=10, help='entries per section per tenant')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--cache-mb', type=int, default=64, help='limit for each of the snapshot and page caches')
+    args = parser.parse_args()
+
+    print(f"{'tenants':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'RSS MB':>8} "
+          f"{'snap MB':>8} {'page MB':>8} {'evicted':>8}")
+    # A fresh interpreter per run, so RSS and the caches start from nothing
+    spawn = multiprocessing.get_context('spawn')
+    for count in (int(n) for n in args.tenants.split(',')):
+        with spawn.Pool(1) as pool:
+            row = pool.apply(run, (count, args.rows, args.requests, args.cache_mb))
+        print(f"{count:>8} {row['rps']:>8.1f} {row['p50']:>8.2f} {row['p95']:>8.2f} {row['rss']:>8.1f} "
+              f"{row['snapshot_mb']:>8.1f} {row['page_mb']:>8.1f} {row['evictions']:>8}")
+
+
+def run(count, rows, requests, cache_mb):
+    workdir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    os.environ['MULTI_TENANT'] = 'true'
+    os.environ['SNAPSHOT_CACHE_MB'] = os.environ['PAGE_CACHE_MB'] = str(cache_mb)
+    sys.path.insert(0, ROOT)
+    import app as portfolio
+
+    hosts = seed(portfolio, count, rows)
+    client = portfolio.app.test_client()
+    timings = []
+    started = time.perf_counter()
+    for n in range(requests):
+        request_started = time.perf_counter()
+        response = client.get('/', headers={'Host': hosts[n % count]})
+        timings.append(time.perf_counter() - request_started)
+        assert response.status_code == 200, response.status_code
+    elapsed = time.perf_counter() - started
+    timings.sort()
+
+    return {
+        'rps': requests / elapsed,
+        'p50': timings[len(timings) // 2] * 1000,
+        'p95': timings[int(len(timings) * 0.95)] * 1000,
+        'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'snapshot_mb': portfolio.tenant_content.size / 1024 / 1024,
+        'page_mb': portfolio.page_cache.size / 1024 / 1024,
+        'evictions': portfolio.tenant_content.evictions + portfolio.page_cache.evictions,
+    }
+
+
+def seed(portfolio, count, rows):
+    hosts = [f'tenant{n}.example' for n in range(1, count + 1)]
+    with portfolio.app.app_context():
+        portfolio.prepare_database()
+        today = date.today()
+        with portfolio.db.engine.begin() as conn:
+            conn.execute(portfolio.Tenant.__table__.update().where(portfolio.Tenant.id == 1).values(host=hosts[0]))
+            if count > 1:
+                conn.execute(portfolio.Tenant.__table__.insert(),
+                             [{'id': n, 'host': hosts[n - 1]} for n in range(2, count + 1)])
+                conn.execute(portfolio.ContentVersion.__table__.insert(),
+                             [{'id': n, 'version': 1} for n in range(2, count + 1)])
+            for tenant_id in range(1, count + 1):
+                conn.execute(portfolio.Profile.__table__.insert(), {
+                    'tenant_id': tenant_id, 'name': f'Tenant {tenant_id}', 'title': 'Developer',
+                    'about': 'About me ' * 20, 'email': f'me@{hosts[tenant_id - 1]}'})
+                conn.execute(portfolio.Skill.__table__.insert(), [
+                    {'tenant_id': tenant_id, 'name': f'Skill {n}', 'percentage': 50, 'category': 'Languages',
+                     'position': n} for n in range(rows)])
+                conn.execute(portfolio.Project.__table__.insert(), [
+                    {'tenant_id': tenant_id, 'title': f'Project {n}', 'description': 'A project. ' * 10,
+                     'technologies': 'Python, Flask', 'position': n} for n in range(rows)])
+                conn.execute(portfolio.Experience.__table__.insert(), [
+                    {'tenant_id': tenant_id, 'title': 'Engineer', 'company': f'Company {n}',
+                     'start_date': today, 'current': True, 'description': 'Built things. ' * 10} for n in range(rows)])
+        portfolio.ensure_section_stats()
+    return hosts
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+// Multi-select for the batch toolbar on admin list pages
+document.querySelectorAll("[data-batch-form]").forEach((form) => {
+  const boxes = document.querySelectorAll('input[name="ids"][form="' + form.id + '"]');
+  const selectAll = form.querySelector("[data-select-all]");
+  const count = form.querySelector("[data-selected-count]");
+
+  function update() {
+    const selected = Array.from(boxes).filter((box) => box.checked).length;
+    count.textContent = selected + " selected";
+    selectAll.checked = selected > 0 && selected === boxes.length;
+    selectAll.indeterminate = selected > 0 && selected < boxes.length;
+    form.querySelectorAll("[data-batch-action]").forEach((button) => {
+      button.disabled = selected === 0;
+    });
+  }
+
+  selectAll.addEventListener("change", () => {
+    boxes.forEach((box) => {
+      box.checked = selectAll.checked;
+    });
+    update();
+  });
+  boxes.forEach((box) => box.addEventListener("change", update));
+
+  form.addEventListener("submit", (e) => {
+    const message = e.submitter && e.submitter.dataset.confirm;
+    if (message && !confirm(message)) {
+      e.preventDefault();
+    }
+  });
+});
+
+// Drag-to-reorder; the new order is saved in one request
+document.querySelectorAll("[data-reorder-url]").forEach((list) => {
+  let dragged = null;
+
+  list.querySelectorAll("[data-id]").forEach((item) => {
+    item.draggable = true;
+    item.addEventListener("dragstart", (e) => {
+      dragged = item;
+      item.classList.add("opacity-50");
+      e.dataTransfer.effectAllowed = "move";
+    });
+    item.addEventListener("dragover", (e) => {
+      if (!dragged || dragged === item) {
+        return;
+      }
+      e.preventDefault();
+      const rect = item.getBoundingClientRect();
+      const before = list.tagName === "TBODY"
+        ? e.clientY < rect.top + rect.height / 2
+        : e.clientX < rect.left + rect.width / 2;
+      item.parentNode.insertBefore(dragged, before ? item : item.nextSibling);
+    });
+    item.addEventListener("dragend", () => {
+      item.classList.remove("opacity-50");
+      dragged = null;
+      const ids = Array.from(list.querySelectorAll("[data-id]")).map((el) => Number(el.dataset.id));
+      fetch(list.dataset.reorderUrl, {
+        method: "POST",
+        headers: { "Content-Type": "application/json", Accept: "application/json" },
+        body: JSON.stringify({ action: "reorder", ids: ids }),
+      }).then((response) => {
+        if (!response.ok) {
+          alert("Could not save the new order. Please reload the page.");
+        }
+      });
+    });
+  });
+});
+
+// Chunked uploads: on submit, files are sent in slices with a SHA-256 each
+// and the form posts the upload token instead of the file. A dropped
+// connection only repeats the missing slices, even after a page reload.
+async function sha256Hex(blob) {
+  const digest = await crypto.subtle.digest("SHA-256", await blob.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, "0")).join("");
+}
+
+async function putChunk(url, blob, checksum) {
+  for (let attempt = 0; ; attempt++) {
+    let response = null;
+    try {
+      response = await fetch(url, {
+        method: "PUT",
+        headers: { "Content-Type": "application/octet-stream", "X-Chunk-SHA256": checksum },
+        body: blob,
+      });
+    } catch (e) {
+      // Network error; retried below
+    }
+    if (response && response.ok) {
+      return;
+    }
+    const retryable = !response || response.status >= 500 || response.status === 422;
+    if (!retryable || attempt === 5) {
+      throw new Error("Upload failed" + (response ? " (" + response.status + ")" : ""));
+    }
+    await new Promise((resolve) => setTimeout(resolve, 500 * 2 ** attempt));
+  }
+}
+
+async function chunkedUpload(input, progress) {
+  const file = input.files[0];
+  const url = input.dataset.chunkedUpload;
+  const key = ["upload", input.dataset.uploadKind, file.name, file.size, file.lastModified].join(":");
+  let upload = null;
+
+  const saved = localStorage.getItem(key);
+  if (saved) {
+    const response = await fetch(url + "/" + saved, { headers: { Accept: "application/json" } });
+    if (response.ok) {
+      upload = await response.json();
+    }
+  }
+  if (!upload) {
+    const response = await fetch(url, {
+      method: "POST",
+      headers: { "Content-Type": "application/json", Accept: "application/json" },
+      body: JSON.stringify({ kind: input.dataset.uploadKind, filename: file.name, size: file.size }),
+    });
+    upload = await response.json();
+    if (!response.ok) {
+      throw new Error(upload.error || "Upload failed");
+    }
+    localStorage.setItem(key, upload.token);
+  }
+
+  if (!upload.file) {
+    const received = new Set(upload.received);
+    const count = Math.ceil(file.size / upload.chunk_size);
+    for (let index = 0; index < count; index++) {
+      if (!received.has(index)) {
+        const blob = file.slice(index * upload.chunk_size, (index + 1) * upload.chunk_size);
+        await putChunk(url + "/" + upload.token + "/" + index, blob, await sha256Hex(blob));
+      }
+      progress((index + 1) / count);
+    }
+    const response = await fetch(url + "/" + upload.token + "/complete", { method: "POST" });
+    if (!response.ok) {
+      throw new Error("Upload could not be completed");
+    }
+  }
+  localStorage.removeItem(key);
+  return upload.token;
+}
+
+document.querySelectorAll("form").forEach((form) => {
+  const inputs = Array.from(form.querySelectorAll("input[type=file][data-chunked-upload]"));
+  // Without SubtleCrypto (plain http) the file is posted with the form as before
+  if (!inputs.length || !window.crypto || !crypto.subtle) {
+    return;
+  }
+
+  form.addEventListener("submit", async (e) => {
+    const pending = inputs.filter((input) => input.files.length && !input.disabled);
+    if (!pending.length) {
+      return;
+    }
+    e.preventDefault();
+    const buttons = form.querySelectorAll("[type=submit]");
+    buttons.forEach((button) => {
+      button.disabled = true;
+    });
+
+    for (const input of pending) {
+      let status = input.parentNode.querySelector("[data-upload-progress]");
+      if (!status) {
+        status = document.createElement("div");
+        status.className = "form-text";
+        status.dataset.uploadProgress = "";
+        input.after(status);
+      }
+      try {
+        const token = await chunkedUpload(input, (fraction) => {
+          status.textContent = "Uploading… " + Math.round(fraction * 100) + "%";
+        });
+        const hidden = document.createElement("input");
+        hidden.type = "hidden";
+        hidden.name = input.name + "_upload";
+        hidden.value = token;
+        form.appendChild(hidden);
+        input.disabled = true;
+        status.textContent = "Uploaded";
+      } catch (error) {
+        status.textContent = error.message + ". Submit again to resume.";
+        buttons.forEach((button) => {
+          button.disabled = false;
+        });
+        return;
+      }
+    }
+    form.submit();
+  });
+});
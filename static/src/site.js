@@ -0,0 +1,162 @@
+// Initialize AOS
+AOS.init({
+  duration: 1000,
+  easing: "ease-in-out",
+  once: true,
+  mirror: false,
+});
+
+// Navbar scroll effect
+window.addEventListener("scroll", function () {
+  const navbar = document.querySelector(".navbar");
+  if (window.scrollY > 50) {
+    navbar.style.background =
+      "linear-gradient(135deg, rgba(102, 126, 234, 0.95) 0%, rgba(118, 75, 162, 0.95) 100%)";
+    navbar.style.boxShadow = "0 2px 20px rgba(0, 0, 0, 0.3)";
+  } else {
+    navbar.style.background =
+      "linear-gradient(135deg, #667eea 0%, #764ba2 100%)";
+    navbar.style.boxShadow = "0 2px 20px rgba(0, 0, 0, 0.2)";
+  }
+});
+
+// Smooth scrolling for navigation links
+document.querySelectorAll('a[href^="#"]').forEach((anchor) => {
+  anchor.addEventListener("click", function (e) {
+    e.preventDefault();
+    const target = document.querySelector(this.getAttribute("href"));
+    if (target) {
+      target.scrollIntoView({
+        behavior: "smooth",
+        block: "start",
+      });
+    }
+  });
+});
+
+// Scroll to top functionality
+function scrollToTop() {
+  window.scrollTo({
+    top: 0,
+    behavior: "smooth",
+  });
+}
+
+// Show/hide scroll to top button
+window.addEventListener("scroll", function () {
+  const scrollBtn = document.querySelector(".scroll-to-top");
+  if (window.scrollY > 300) {
+    scrollBtn.classList.add("show");
+  } else {
+    scrollBtn.classList.remove("show");
+  }
+});
+
+// Progress bar animation on scroll
+function animateProgressBars() {
+  const progressBars = document.querySelectorAll(".progress-bar");
+  progressBars.forEach((bar) => {
+    const percentage = bar.style.width;
+    bar.style.width = "0%";
+    setTimeout(() => {
+      bar.style.width = percentage;
+    }, 500);
+  });
+}
+
+// Intersection Observer for progress bars; without it, animate right away
+if ("IntersectionObserver" in window) {
+  const progressObserver = new IntersectionObserver((entries) => {
+    entries.forEach((entry) => {
+      if (entry.isIntersecting) {
+        animateProgressBars();
+        progressObserver.unobserve(entry.target);
+      }
+    });
+  });
+
+  document.querySelectorAll(".progress").forEach((progress) => {
+    progressObserver.observe(progress);
+  });
+} else {
+  animateProgressBars();
+}
+
+// Add loading animation to elements
+function addLoadingAnimation() {
+  const elements = document.querySelectorAll(
+    ".skill-item, .project-card, .experience-item, .education-item, .certificate-card"
+  );
+  elements.forEach((element, index) => {
+    element.classList.add("loading");
+    setTimeout(() => {
+      element.classList.add("loaded");
+    }, index * 100);
+  });
+}
+
+// Call loading animation when page loads
+window.addEventListener("load", addLoadingAnimation);
+
+// Each list ends with a plain "More" link to the next page. With script it
+// loads the next items in place, and with IntersectionObserver it does so
+// as the end of the list comes into view.
+document.querySelectorAll("[data-feed]").forEach((list) => {
+  const more = list.parentNode.querySelector("[data-feed-more]");
+  if (!more || !list.dataset.nextCursor) {
+    return;
+  }
+  let loading = false;
+  let feedObserver = null;
+
+  function loadMore() {
+    if (loading) {
+      return;
+    }
+    loading = true;
+    const url = list.dataset.feed + "?cursor=" + encodeURIComponent(list.dataset.nextCursor);
+    fetch(url, { headers: { Accept: "application/json" } })
+      .then((response) => (response.ok ? response.json() : Promise.reject(response.status)))
+      .then((page) => {
+        page.items.forEach((item) => list.insertAdjacentHTML("beforeend", item.html));
+        list.dataset.nextCursor = page.next_cursor || "";
+        if (page.next_cursor) {
+          const next = new URL(more.href);
+          next.searchParams.set("cursor", page.next_cursor);
+          more.href = next.toString();
+        } else {
+          if (feedObserver) {
+            feedObserver.disconnect();
+          }
+          more.parentNode.remove();
+        }
+      })
+      .catch(() => {
+        // Leave the link to work as a normal page load
+        if (feedObserver) {
+          feedObserver.disconnect();
+        }
+        more.dataset.feedFailed = "true";
+      })
+      .finally(() => {
+        loading = false;
+      });
+  }
+
+  more.addEventListener("click", (event) => {
+    if (more.dataset.feedFailed) {
+      return;
+    }
+    event.preventDefault();
+    loadMore();
+  });
+
+  if ("IntersectionObserver" in window) {
+    feedObserver = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) {
+        loadMore();
+      }
+    }, { rootMargin: "400px 0px" });
+    feedObserver.observe(more);
+  }
+});
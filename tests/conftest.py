@@ -0,0 +1,50 @@
+"""Shared test setup.
+
+app.py reads its configuration when it is first imported, and that happens
+once per process, so every test shares one throwaway database and upload
+folder. Tests get the module through the `portfolio` fixture and clean up
+the tables they use.
+
+    pip install pytest aiosmtpd
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def portfolio(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp('portfolio')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + str(workdir / 'test.db')
+    os.environ['UPLOAD_FOLDER'] = str(workdir / 'uploads')
+    os.environ['OUTBOX_WORKERS'] = '0'
+    os.environ['MULTI_TENANT'] = 'false'
+    sys.path.insert(0, ROOT)
+    import app
+    with app.app.app_context():
+        app.prepare_database()
+    return app
+
+
+@pytest.fixture
+def admin_client(portfolio):
+    from werkzeug.security import generate_password_hash
+
+    with portfolio.app.app_context():
+        admin = portfolio.Admin.query.filter_by(username='admin').first()
+        if admin is None:
+            admin = portfolio.Admin(username='admin')
+            portfolio.db.session.add(admin)
+        admin.password_hash = generate_password_hash('secret')
+        # Every test logs in from the same address
+        portfolio.db.session.execute(portfolio.login_throttle_table.delete())
+        portfolio.db.session.commit()
+    portfolio.login_lockouts.clear()
+    client = portfolio.app.test_client()
+    response = client.post('/admin/login', data={'username': 'admin', 'password': 'secret'})
+    assert response.status_code == 302
+    return client
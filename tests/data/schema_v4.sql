@@ -0,0 +1,184 @@
+-- A database at schema version 4, before tenants (migrations 5 and 6).
+-- Written by the app as of the upload reference index, with a few rows.
+BEGIN;
+CREATE TABLE admin (
+	id INTEGER NOT NULL, 
+	username VARCHAR(80) NOT NULL, 
+	password_hash VARCHAR(120) NOT NULL, 
+	PRIMARY KEY (id), 
+	UNIQUE (username)
+);
+CREATE TABLE profile (
+	id INTEGER NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	title VARCHAR(200), 
+	about TEXT, 
+	email VARCHAR(120), 
+	phone VARCHAR(20), 
+	location VARCHAR(100), 
+	photo VARCHAR(200), 
+	linkedin VARCHAR(200), 
+	github VARCHAR(200), 
+	twitter VARCHAR(200), 
+	PRIMARY KEY (id)
+);
+CREATE TABLE skill (
+	id INTEGER NOT NULL, 
+	name VARCHAR(100) NOT NULL, 
+	percentage INTEGER, 
+	category VARCHAR(50), 
+	position INTEGER NOT NULL, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE project (
+	id INTEGER NOT NULL, 
+	title VARCHAR(200) NOT NULL, 
+	description TEXT, 
+	image VARCHAR(200), 
+	link VARCHAR(200), 
+	github_link VARCHAR(200), 
+	technologies VARCHAR(200), 
+	position INTEGER NOT NULL, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE experience (
+	id INTEGER NOT NULL, 
+	title VARCHAR(200) NOT NULL, 
+	company VARCHAR(200), 
+	location VARCHAR(100), 
+	start_date DATE, 
+	end_date DATE, 
+	current BOOLEAN, 
+	description TEXT, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE education (
+	id INTEGER NOT NULL, 
+	degree VARCHAR(200) NOT NULL, 
+	institution VARCHAR(200), 
+	location VARCHAR(100), 
+	start_date DATE, 
+	end_date DATE, 
+	current BOOLEAN, 
+	description TEXT, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE certificate (
+	id INTEGER NOT NULL, 
+	name VARCHAR(200) NOT NULL, 
+	issuer VARCHAR(200), 
+	date_earned DATE, 
+	link VARCHAR(200), 
+	image VARCHAR(200), 
+	PRIMARY KEY (id)
+);
+CREATE TABLE resume (
+	id INTEGER NOT NULL, 
+	file_name VARCHAR(200) NOT NULL, 
+	original_name VARCHAR(200) NOT NULL, 
+	upload_date DATETIME, 
+	description TEXT, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE content_version (
+	id INTEGER NOT NULL, 
+	version INTEGER NOT NULL, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE section_stat (
+	section VARCHAR(50) NOT NULL, 
+	row_count INTEGER NOT NULL, 
+	last_modified DATETIME, 
+	PRIMARY KEY (section)
+);
+CREATE TABLE outbox_message (
+	id INTEGER NOT NULL, 
+	subject VARCHAR(300) NOT NULL, 
+	recipient VARCHAR(200) NOT NULL, 
+	body TEXT NOT NULL, 
+	status VARCHAR(20) NOT NULL, 
+	attempts INTEGER NOT NULL, 
+	next_attempt_at DATETIME NOT NULL, 
+	claim_token VARCHAR(32), 
+	claimed_at DATETIME, 
+	last_error TEXT, 
+	created_at DATETIME, 
+	sent_at DATETIME, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE upload_session (
+	token VARCHAR(32) NOT NULL, 
+	kind VARCHAR(20) NOT NULL, 
+	original_name VARCHAR(200) NOT NULL, 
+	size BIGINT NOT NULL, 
+	chunk_size INTEGER NOT NULL, 
+	file_name VARCHAR(200), 
+	created_at DATETIME NOT NULL, 
+	PRIMARY KEY (token)
+);
+CREATE TABLE upload_reference (
+	source VARCHAR(20) NOT NULL, 
+	row_id INTEGER NOT NULL, 
+	file_name VARCHAR(200) NOT NULL, 
+	PRIMARY KEY (source, row_id)
+);
+CREATE TABLE login_throttle (
+	"key" VARCHAR(200) NOT NULL, 
+	tokens FLOAT NOT NULL, 
+	updated_at FLOAT NOT NULL, 
+	strikes INTEGER NOT NULL, 
+	locked_until FLOAT NOT NULL, 
+	PRIMARY KEY ("key")
+);
+CREATE TABLE upload_chunk (
+	token VARCHAR(32) NOT NULL, 
+	"index" INTEGER NOT NULL, 
+	sha256 VARCHAR(64) NOT NULL, 
+	PRIMARY KEY (token, "index"), 
+	FOREIGN KEY(token) REFERENCES upload_session (token)
+);
+CREATE TABLE schema_migration (version INTEGER PRIMARY KEY, name VARCHAR(200), applied_at DATETIME);
+CREATE VIRTUAL TABLE search_index USING fts5(title, body, tokenize='unicode61 remove_diacritics 2', prefix='2 3');
+CREATE INDEX ix_skill_position ON skill (position, id);
+CREATE INDEX ix_project_position ON project (position, id);
+CREATE INDEX ix_experience_start_date ON experience (start_date);
+CREATE INDEX ix_education_start_date ON education (start_date);
+CREATE INDEX ix_certificate_date_earned ON certificate (date_earned);
+CREATE INDEX ix_resume_upload_date ON resume (upload_date);
+CREATE INDEX ix_outbox_message_status_next_attempt ON outbox_message (status, next_attempt_at);
+CREATE INDEX ix_upload_reference_file_name ON upload_reference (file_name);
+CREATE TRIGGER search_project_insert AFTER INSERT ON project BEGIN INSERT INTO search_index (rowid, title, body) VALUES (new.id * 8 + 0, new.title, coalesce(new.description, '') || ' ' || coalesce(new.technologies, '')); END;
+CREATE TRIGGER search_project_update AFTER UPDATE OF title, description, technologies ON project BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 0; INSERT INTO search_index (rowid, title, body) VALUES (new.id * 8 + 0, new.title, coalesce(new.description, '') || ' ' || coalesce(new.technologies, '')); END;
+CREATE TRIGGER search_project_delete AFTER DELETE ON project BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 0; END;
+CREATE TRIGGER search_experience_insert AFTER INSERT ON experience BEGIN INSERT INTO search_index (rowid, title, body) VALUES (new.id * 8 + 1, new.title, coalesce(new.company, '') || ' ' || coalesce(new.description, '')); END;
+CREATE TRIGGER search_experience_update AFTER UPDATE OF title, company, description ON experience BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 1; INSERT INTO search_index (rowid, title, body) VALUES (new.id * 8 + 1, new.title, coalesce(new.company, '') || ' ' || coalesce(new.description, '')); END;
+CREATE TRIGGER search_experience_delete AFTER DELETE ON experience BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 1; END;
+CREATE TRIGGER search_education_insert AFTER INSERT ON education BEGIN INSERT INTO search_index (rowid, title, body) VALUES (new.id * 8 + 2, new.degree, coalesce(new.institution, '')); END;
+CREATE TRIGGER search_education_update AFTER UPDATE OF degree, institution ON education BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 2; INSERT INTO search_index (rowid, title, body) VALUES (new.id * 8 + 2, new.degree, coalesce(new.institution, '')); END;
+CREATE TRIGGER search_education_delete AFTER DELETE ON education BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 2; END;
+CREATE TRIGGER search_skill_insert AFTER INSERT ON skill BEGIN INSERT INTO search_index (rowid, title, body) VALUES (new.id * 8 + 3, new.name, coalesce(new.category, '')); END;
+CREATE TRIGGER search_skill_update AFTER UPDATE OF name, category ON skill BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 3; INSERT INTO search_index (rowid, title, body) VALUES (new.id * 8 + 3, new.name, coalesce(new.category, '')); END;
+CREATE TRIGGER search_skill_delete AFTER DELETE ON skill BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 3; END;
+CREATE TRIGGER upload_profile_insert AFTER INSERT ON profile BEGIN INSERT INTO upload_reference (source, row_id, file_name) SELECT 'profile', new.id, new.photo WHERE coalesce(new.photo, '') != ''; END;
+CREATE TRIGGER upload_profile_update AFTER UPDATE OF photo ON profile BEGIN DELETE FROM upload_reference WHERE source = 'profile' AND row_id = old.id; INSERT INTO upload_reference (source, row_id, file_name) SELECT 'profile', new.id, new.photo WHERE coalesce(new.photo, '') != ''; END;
+CREATE TRIGGER upload_profile_delete AFTER DELETE ON profile BEGIN DELETE FROM upload_reference WHERE source = 'profile' AND row_id = old.id; END;
+CREATE TRIGGER upload_project_insert AFTER INSERT ON project BEGIN INSERT INTO upload_reference (source, row_id, file_name) SELECT 'project', new.id, new.image WHERE coalesce(new.image, '') != ''; END;
+CREATE TRIGGER upload_project_update AFTER UPDATE OF image ON project BEGIN DELETE FROM upload_reference WHERE source = 'project' AND row_id = old.id; INSERT INTO upload_reference (source, row_id, file_name) SELECT 'project', new.id, new.image WHERE coalesce(new.image, '') != ''; END;
+CREATE TRIGGER upload_project_delete AFTER DELETE ON project BEGIN DELETE FROM upload_reference WHERE source = 'project' AND row_id = old.id; END;
+CREATE TRIGGER upload_certificate_insert AFTER INSERT ON certificate BEGIN INSERT INTO upload_reference (source, row_id, file_name) SELECT 'certificate', new.id, new.image WHERE coalesce(new.image, '') != ''; END;
+CREATE TRIGGER upload_certificate_update AFTER UPDATE OF image ON certificate BEGIN DELETE FROM upload_reference WHERE source = 'certificate' AND row_id = old.id; INSERT INTO upload_reference (source, row_id, file_name) SELECT 'certificate', new.id, new.image WHERE coalesce(new.image, '') != ''; END;
+CREATE TRIGGER upload_certificate_delete AFTER DELETE ON certificate BEGIN DELETE FROM upload_reference WHERE source = 'certificate' AND row_id = old.id; END;
+CREATE TRIGGER upload_resume_insert AFTER INSERT ON resume BEGIN INSERT INTO upload_reference (source, row_id, file_name) SELECT 'resume', new.id, new.file_name WHERE coalesce(new.file_name, '') != ''; END;
+CREATE TRIGGER upload_resume_update AFTER UPDATE OF file_name ON resume BEGIN DELETE FROM upload_reference WHERE source = 'resume' AND row_id = old.id; INSERT INTO upload_reference (source, row_id, file_name) SELECT 'resume', new.id, new.file_name WHERE coalesce(new.file_name, '') != ''; END;
+CREATE TRIGGER upload_resume_delete AFTER DELETE ON resume BEGIN DELETE FROM upload_reference WHERE source = 'resume' AND row_id = old.id; END;
+INSERT INTO schema_migration (version, name, applied_at) VALUES (1, 'index sort columns', '2026-10-18 19:33:13.422593');
+INSERT INTO schema_migration (version, name, applied_at) VALUES (2, 'full-text search index', '2026-10-18 19:33:13.424417');
+INSERT INTO schema_migration (version, name, applied_at) VALUES (3, 'manual ordering for skills and projects', '2026-10-18 19:33:13.424590');
+INSERT INTO schema_migration (version, name, applied_at) VALUES (4, 'upload reference index', '2026-10-18 19:33:13.425573');
+INSERT INTO admin (id, username, password_hash) VALUES (1, 'admin', 'pbkdf2:sha256:old-hash');
+INSERT INTO profile (id, name, title, about, email, phone, location, photo, linkedin, github, twitter) VALUES (1, 'Ada Lovelace', NULL, NULL, NULL, NULL, NULL, 'ab/bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb.png', NULL, NULL, NULL);
+INSERT INTO skill (id, name, percentage, category, position) VALUES (1, 'Python', 90, 'Languages', 1);
+INSERT INTO project (id, title, description, image, link, github_link, technologies, position) VALUES (1, 'Analytical Engine', 'Notes on the engine', NULL, NULL, NULL, NULL, 1);
+INSERT INTO experience (id, title, company, location, start_date, end_date, current, description) VALUES (1, 'Engineer', 'Babbage & Co', NULL, '1842-01-01', NULL, 1, NULL);
+INSERT INTO certificate (id, name, issuer, date_earned, link, image) VALUES (1, 'Mathematics', NULL, '1840-06-01', NULL, NULL);
+COMMIT;
@@ -0,0 +1,65 @@
+"""Batch delete, bulk edit and reorder on the admin list pages."""
+import pytest
+
+
+@pytest.fixture
+def skills(portfolio):
+    # Six skills, positions 1..6 in id order
+    with portfolio.app.app_context():
+        portfolio.Skill.query.delete()
+        rows = [portfolio.Skill(name=f'Skill {n}', percentage=50, category='Languages', position=n)
+                for n in range(1, 7)]
+        portfolio.db.session.add_all(rows)
+        portfolio.db.session.commit()
+        return [row.id for row in rows]
+
+
+def skill_order(portfolio):
+    with portfolio.app.app_context():
+        rows = portfolio.Skill.query.order_by(portfolio.Skill.position, portfolio.Skill.id).all()
+        return [(row.id, row.position) for row in rows]
+
+
+def test_delete(portfolio, admin_client, skills):
+    response = admin_client.post('/admin/skills/batch', json={'action': 'delete', 'ids': skills[:2]})
+    assert response.json == {'updated': 2}
+    assert [id for id, _ in skill_order(portfolio)] == skills[2:]
+
+
+def test_bulk_edit(portfolio, admin_client, skills):
+    response = admin_client.post('/admin/skills/batch',
+                                 json={'action': 'update', 'ids': skills[:3], 'category': 'Tools'})
+    assert response.json == {'updated': 3}
+    with portfolio.app.app_context():
+        categories = {row.id: row.category for row in portfolio.Skill.query.all()}
+    assert [categories[id] for id in skills] == ['Tools'] * 3 + ['Languages'] * 3
+
+
+def test_full_reorder(portfolio, admin_client, skills):
+    new_order = skills[::-1]
+    assert admin_client.post('/admin/skills/batch', json={'action': 'reorder', 'ids': new_order}).status_code == 200
+    assert skill_order(portfolio) == [(id, n) for n, id in enumerate(new_order, 1)]
+
+
+def test_partial_reorder_keeps_positions_unique(portfolio, admin_client, skills):
+    # Swap the 3rd and 5th entries without sending the others
+    response = admin_client.post('/admin/skills/batch',
+                                 json={'action': 'reorder', 'ids': [skills[4], skills[2]]})
+    assert response.status_code == 200
+    a, b, c, d, e, f = skills
+    assert skill_order(portfolio) == [(a, 1), (b, 2), (e, 3), (d, 4), (c, 5), (f, 6)]
+
+
+@pytest.mark.parametrize('payload', [
+    [1, 2],
+    'delete',
+    {'action': 'delete', 'ids': '12'},
+    {'action': 'delete', 'ids': ['1']},
+    {'action': 'delete', 'ids': [True]},
+    {'action': 'delete', 'ids': 1},
+    {'action': 'explode', 'ids': []},
+])
+def test_bad_payload_is_rejected(portfolio, admin_client, skills, payload):
+    response = admin_client.post('/admin/skills/batch', json=payload)
+    assert response.status_code == 400
+    assert len(skill_order(portfolio)) == 6
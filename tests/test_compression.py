@@ -0,0 +1,36 @@
+"""The compressed-response cache is limited by bytes, not entries."""
+import os
+
+import pytest
+
+
+@pytest.fixture
+def small_cache(portfolio):
+    limit = portfolio.app.config['COMPRESS_CACHE_MAX_BYTES']
+    portfolio.app.config['COMPRESS_CACHE_MAX_BYTES'] = 64 * 1024
+    portfolio.compressed_cache.clear()
+    yield portfolio.compressed_cache
+    portfolio.app.config['COMPRESS_CACHE_MAX_BYTES'] = limit
+    portfolio.compressed_cache.clear()
+
+
+def test_cache_stays_under_byte_limit(portfolio, small_cache):
+    with portfolio.app.test_request_context():
+        for n in range(20):
+            # Random bytes don't compress, so each entry is ~16 KB
+            response = portfolio.app.response_class(os.urandom(16 * 1024))
+            portfolio.compressed_body(response, 'gzip', f'"asset-{n}"')
+    assert 0 < small_cache.size <= 64 * 1024
+    assert len(small_cache.entries) == 3
+    assert small_cache.evictions == 17
+    # The most recent bodies are the ones kept
+    assert small_cache.get(('"asset-19"', 'gzip')) is not None
+    assert small_cache.get(('"asset-0"', 'gzip')) is None
+
+
+def test_cached_body_is_reused(portfolio, small_cache):
+    with portfolio.app.test_request_context():
+        first = portfolio.compressed_body(portfolio.app.response_class(b'a' * 4096), 'gzip', '"page"')
+        # Same ETag, so the cached copy is returned without compressing again
+        second = portfolio.compressed_body(portfolio.app.response_class(b'b' * 4096), 'gzip', '"page"')
+    assert second == first
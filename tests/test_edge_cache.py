@@ -0,0 +1,57 @@
+"""Cache headers a CDN sees on the final response."""
+from datetime import timedelta
+
+import pytest
+
+DIGEST = 'ab' + 'c' * 62
+
+
+@pytest.fixture
+def static_folder(portfolio, tmp_path, monkeypatch):
+    for name in (f'uploads/ab/{DIGEST}.png', 'uploads/legacy.png'):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'image')
+    monkeypatch.setattr(portfolio.app, 'static_folder', str(tmp_path))
+    return tmp_path
+
+
+def test_content_addressed_upload_is_immutable_and_untagged(portfolio, static_folder):
+    response = portfolio.app.test_client().get(f'/static/uploads/ab/{DIGEST}.png')
+    assert response.status_code == 200
+    cache_control = response.cache_control
+    assert cache_control.public and cache_control.immutable
+    assert cache_control.max_age == 31536000
+    assert cache_control.s_maxage is None
+    assert 'stale-while-revalidate' not in cache_control
+    assert 'Surrogate-Key' not in response.headers
+    assert 'Cache-Tag' not in response.headers
+
+
+def test_legacy_upload_is_tagged_for_purges(portfolio, static_folder):
+    response = portfolio.app.test_client().get('/static/uploads/legacy.png')
+    assert response.status_code == 200
+    assert not response.cache_control.immutable
+    assert response.cache_control.s_maxage == portfolio.app.config['CDN_S_MAXAGE']
+    assert 'upload:legacy.png' in response.headers['Surrogate-Key'].split()
+
+
+@pytest.fixture
+def short_sessions(portfolio, monkeypatch):
+    monkeypatch.setattr(portfolio.app, 'permanent_session_lifetime', timedelta(seconds=4))
+
+
+# short_sessions comes first so the login below already uses it
+def test_refreshed_session_cookie_is_never_shared(portfolio, short_sessions, admin_client, monkeypatch):
+    # Past half its lifetime, the unchanged session is saved again and its
+    # cookie re-sent on a page that is otherwise cached at the edge
+    now = portfolio.time.time() + 3
+    monkeypatch.setattr(portfolio.time, 'time', lambda: now)
+    response = admin_client.get('/')
+    assert response.status_code == 200
+    assert 'Set-Cookie' in response.headers
+    assert response.cache_control.private and response.cache_control.no_store
+    assert not response.cache_control.public
+    assert response.cache_control.s_maxage is None
+    assert 'Surrogate-Key' not in response.headers
+    assert 'Cache-Tag' not in response.headers
@@ -0,0 +1,50 @@
+"""The "More" links under the project list work without script."""
+import re
+
+import pytest
+
+
+@pytest.fixture
+def projects(portfolio):
+    # One more project than fits on the first page
+    count = portfolio.app.config['API_PAGE_SIZE'] + 1
+    with portfolio.app.app_context():
+        portfolio.Project.query.delete()
+        portfolio.db.session.add_all(portfolio.Project(title=f'Project {n}', position=n)
+                                     for n in range(1, count + 1))
+        portfolio.db.session.commit()
+    yield count
+    with portfolio.app.app_context():
+        portfolio.Project.query.delete()
+        portfolio.db.session.commit()
+
+
+def more_link(html):
+    match = re.search(r'href="([^"]+)"\s+data-feed-more', html)
+    return match and match.group(1).replace('&amp;', '&')
+
+
+def test_index_links_to_next_page(portfolio, projects):
+    client = portfolio.app.test_client()
+    html = client.get('/').get_data(as_text=True)
+    assert 'Project 1<' in html
+    assert f'Project {projects}<' not in html
+    link = more_link(html)
+    assert link.startswith('/api/projects?') and 'format=html' in link
+
+    page = client.get(link)
+    assert page.mimetype == 'text/html'
+    html = page.get_data(as_text=True)
+    assert f'Project {projects}<' in html
+    assert 'Project 1<' not in html
+    # Last page: nothing further to link to
+    assert more_link(html) is None
+
+
+def test_json_feed_is_unchanged(portfolio, projects):
+    client = portfolio.app.test_client()
+    first = client.get('/api/projects').json
+    assert first['next_cursor']
+    second = client.get('/api/projects', query_string={'cursor': first['next_cursor']}).json
+    assert [item['title'] for item in second['items']] == [f'Project {projects}']
+    assert second['next_cursor'] is None
@@ -0,0 +1,113 @@
+"""flask gc-uploads: what it removes from UPLOAD_FOLDER and what it keeps."""
+import os
+import shutil
+import time
+from datetime import datetime
+
+import pytest
+
+HOUR = 3600
+KEPT = 'aa/' + 'a' * 64 + '.png'
+ORPHAN = 'bb/' + 'b' * 64 + '.png'
+OTHER_TENANT = 'tenants/2/cc/' + 'c' * 64 + '.png'
+UNCLAIMED = 'tenants/2/dd/' + 'd' * 64 + '.png'
+PARTIAL_TOKEN = 'e' * 32
+
+
+@pytest.fixture
+def uploads(portfolio):
+    folder = portfolio.app.config['UPLOAD_FOLDER']
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+    clear_uploads(portfolio)
+    yield folder
+    clear_uploads(portfolio)
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+def clear_uploads(portfolio):
+    with portfolio.app.app_context(), portfolio.db.engine.begin() as conn:
+        conn.execute(portfolio.Project.__table__.delete())
+        conn.execute(portfolio.upload_session_table.delete())
+
+
+def write(folder, name, age=2 * HOUR):
+    path = os.path.join(folder, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * 10)
+    os.utime(path, (time.time() - age,) * 2)
+
+
+def files(folder):
+    return sorted(os.path.relpath(os.path.join(root, name), folder).replace(os.sep, '/')
+                  for root, _, names in os.walk(folder) for name in names)
+
+
+def gc(portfolio, *args):
+    result = portfolio.app.test_cli_runner().invoke(args=['gc-uploads', *args])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def add_project(portfolio, image):
+    with portfolio.app.app_context():
+        portfolio.db.session.add(portfolio.Project(title='Engine', image=image))
+        portfolio.db.session.commit()
+
+
+def test_referenced_files_and_their_variants_are_kept(portfolio, uploads):
+    add_project(portfolio, KEPT)
+    for name in (KEPT, ORPHAN, f'variants/{KEPT[:-4]}-320.webp', f'variants/{KEPT[:-4]}.json',
+                 f'variants/{ORPHAN[:-4]}-320.webp', f'variants/{ORPHAN[:-4]}.json', '.upload-123', '.gitkeep'):
+        write(uploads, name)
+
+    output = gc(portfolio)
+    assert files(uploads) == ['.gitkeep', KEPT, f'variants/{KEPT[:-4]}-320.webp', f'variants/{KEPT[:-4]}.json']
+    assert 'removed 4' in output
+
+
+def test_files_inside_the_grace_window_are_kept(portfolio, uploads):
+    write(uploads, ORPHAN, age=60)
+    gc(portfolio)
+    assert files(uploads) == [ORPHAN]
+    gc(portfolio, '--grace', '30')
+    assert files(uploads) == []
+
+
+def test_dry_run_deletes_nothing(portfolio, uploads):
+    write(uploads, ORPHAN)
+    output = gc(portfolio, '--dry-run')
+    assert f'Would remove {ORPHAN}' in output
+    assert files(uploads) == [ORPHAN]
+
+
+def test_rebuild_index_restores_lost_references(portfolio, uploads):
+    add_project(portfolio, KEPT)
+    write(uploads, KEPT)
+    with portfolio.app.app_context(), portfolio.db.engine.begin() as conn:
+        conn.execute(portfolio.UploadReference.__table__.delete())
+
+    gc(portfolio, '--rebuild-index')
+    assert files(uploads) == [KEPT]
+    with portfolio.app.app_context():
+        assert portfolio.upload_references(KEPT) == 1
+
+
+def test_other_tenants_uploads_survive(portfolio, uploads):
+    # Referenced by another tenant's row, or by its upload sessions: a file
+    # that finished uploading but no form has claimed yet, and one in progress
+    with portfolio.app.app_context(), portfolio.db.engine.begin() as conn:
+        conn.execute(portfolio.Project.__table__.insert().values(tenant_id=2, title='Other', image=OTHER_TENANT,
+                                                                position=1))
+        conn.execute(portfolio.upload_session_table.insert(), [
+            {'token': 'f' * 32, 'tenant_id': 2, 'kind': 'image', 'original_name': 'a.png', 'size': 10,
+             'chunk_size': 10, 'file_name': UNCLAIMED, 'created_at': datetime.utcnow()},
+            {'token': PARTIAL_TOKEN, 'tenant_id': 2, 'kind': 'image', 'original_name': 'b.png', 'size': 10,
+             'chunk_size': 10, 'file_name': None, 'created_at': datetime.utcnow()},
+        ])
+    for name in (OTHER_TENANT, UNCLAIMED, f'.partial/{PARTIAL_TOKEN}', ORPHAN):
+        write(uploads, name)
+
+    gc(portfolio)
+    assert files(uploads) == [f'.partial/{PARTIAL_TOKEN}', OTHER_TENANT, UNCLAIMED]
@@ -0,0 +1,70 @@
+"""import-portfolio rejects rows the public page could not render."""
+import json
+
+import pytest
+
+
+def import_document(portfolio, tmp_path, document):
+    path = tmp_path / 'import.json'
+    path.write_text(json.dumps(document), encoding='utf-8')
+    return portfolio.app.test_cli_runner().invoke(args=['import-portfolio', str(path)])
+
+
+def certificate_count(portfolio):
+    with portfolio.app.app_context():
+        return portfolio.db.session.query(portfolio.Certificate).count()
+
+
+@pytest.mark.parametrize('document, message', [
+    ({'certificates': [{'name': 'No date'}]}, 'certificates[1]: date_earned is required'),
+    ({'experience': [{'title': 'Dev', 'start_date': '2020-01-01'}]},
+     'experience[1]: end_date is required unless current is true'),
+    ({'education': [{'degree': 'BSc'}]}, 'education[1]: start_date is required'),
+    ({'skills': [{'name': 'Python', 'percentage': 150}]}, 'skills[1]: percentage must be between 0 and 100'),
+    ({'projects': [{'title': ' '}]}, 'projects[1]: title is required'),
+])
+def test_bad_row_rejects_the_whole_import(portfolio, tmp_path, document, message):
+    before = certificate_count(portfolio)
+    document = {'certificates': [{'name': 'Good', 'date_earned': '2021-05-01'}], **document}
+    result = import_document(portfolio, tmp_path, document)
+    assert result.exit_code == 1
+    assert message in result.output
+    assert certificate_count(portfolio) == before
+
+
+def test_valid_rows_render(portfolio, tmp_path):
+    result = import_document(portfolio, tmp_path, {
+        'certificates': [{'name': 'Cert', 'date_earned': '2021-05-01'}],
+        'experience': [{'title': 'Dev', 'start_date': '2020-01-01', 'current': True}],
+        'education': [{'degree': 'BSc', 'start_date': '2015-09-01', 'end_date': '2019-06-01'}],
+    })
+    assert result.exit_code == 0, result.output
+    assert portfolio.app.test_client().get('/').status_code == 200
+
+
+@pytest.mark.parametrize('document', [{'skills': [1]}, {'skills': 'Python'}, {'skills': [['Python']]}])
+def test_rows_must_be_objects(portfolio, tmp_path, document):
+    result = import_document(portfolio, tmp_path, document)
+    assert result.exit_code == 1
+    assert 'skills[1]: expected an object' in result.output
+
+
+def test_export_imports_into_a_database_that_has_it_already(portfolio, tmp_path):
+    assert import_document(portfolio, tmp_path, {
+        'profile': {'name': 'Ada'},
+        'skills': [{'name': 'Python', 'percentage': 90}],
+        'certificates': [{'name': 'Cert', 'date_earned': '2021-05-01'}],
+    }).exit_code == 0
+    runner = portfolio.app.test_cli_runner()
+    exported = tmp_path / 'export.ndjson'
+    result = runner.invoke(args=['export-portfolio', '--output', str(exported)])
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in exported.read_text(encoding='utf-8').splitlines()]
+    assert all('id' in row for row in rows)
+
+    # The exported ids are all taken; the rows come in as new ones
+    result = runner.invoke(args=['import-portfolio', str(exported)])
+    assert result.exit_code == 0, result.output
+    with portfolio.app.app_context():
+        assert portfolio.db.session.query(portfolio.Skill).filter_by(name='Python').count() >= 2
+    assert portfolio.app.test_client().get('/').status_code == 200
@@ -0,0 +1,45 @@
+"""Login throttling: Retry-After must be a promise the server keeps."""
+import pytest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(portfolio, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(portfolio.time, 'time', clock)
+    with portfolio.app.app_context():
+        portfolio.db.session.execute(portfolio.login_throttle_table.delete())
+        portfolio.db.session.commit()
+    portfolio.login_lockouts.clear()
+    yield clock
+    portfolio.login_lockouts.clear()
+
+
+def attempt(client, username='nobody'):
+    return client.post('/admin/login', data={'username': username, 'password': 'wrong'})
+
+
+def test_retry_after_is_honoured(portfolio, clock):
+    client = portfolio.app.test_client()
+    # The username bucket (5 attempts, one back per minute) runs dry first
+    for _ in range(portfolio.app.config['LOGIN_USER_BURST']):
+        assert attempt(client).status_code == 200
+    locked = attempt(client)
+    assert locked.status_code == 429
+
+    # The lockout (30s) is shorter than one refill (60s), but waiting it out
+    # is enough for the next attempt to go through
+    clock.now += int(locked.headers['Retry-After'])
+    assert attempt(client).status_code == 200
+
+    # Hammering straight away locks the key out again, for twice as long
+    again = attempt(client)
+    assert again.status_code == 429
+    assert int(again.headers['Retry-After']) > int(locked.headers['Retry-After'])
@@ -0,0 +1,57 @@
+"""Migrating a database written before tenants (schema version 4)."""
+import os
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+SCHEMA_V4 = os.path.join(os.path.dirname(__file__), 'data', 'schema_v4.sql')
+
+
+@pytest.fixture
+def old_database(portfolio, tmp_path):
+    path = tmp_path / 'v4.db'
+    with sqlite3.connect(path) as conn, open(SCHEMA_V4, encoding='utf-8') as f:
+        conn.executescript(f.read())
+    # What prepare_database does first: add the tables the old schema lacks
+    engine = create_engine(f'sqlite:///{path}')
+    portfolio.db.metadata.create_all(engine)
+    engine.dispose()
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def test_tenant_migrations(portfolio, old_database):
+    with portfolio.app.app_context():
+        done = portfolio.apply_migrations(old_database)
+    assert [version for version, _ in done] == [5, 6]
+
+    cursor = old_database.cursor()
+    # Existing content, admins and counters belong to the first tenant
+    assert cursor.execute('SELECT id, host FROM tenant').fetchall() == [(1, 'localhost')]
+    for table in ('profile', 'skill', 'project', 'experience', 'certificate', 'admin'):
+        assert cursor.execute(f'SELECT DISTINCT tenant_id FROM {table}').fetchall() == [(1,)], table
+    assert cursor.execute('SELECT username, password_hash FROM admin').fetchall() == [
+        ('admin', 'pbkdf2:sha256:old-hash')]
+    # The same username may now exist once per tenant
+    cursor.execute("INSERT INTO tenant (id, host, created_at) VALUES (2, 'b.example', '2026-01-01')")
+    cursor.execute("INSERT INTO admin (tenant_id, username, password_hash) VALUES (2, 'admin', 'x')")
+    with pytest.raises(sqlite3.IntegrityError):
+        cursor.execute("INSERT INTO admin (tenant_id, username, password_hash) VALUES (2, 'admin', 'y')")
+
+    # Old entries are searchable per tenant, and new rows are indexed with theirs
+    def search(term, tenant):
+        return cursor.execute('SELECT title FROM search_index WHERE search_index MATCH ?',
+                              (f'{term} AND tenant:t{tenant}',)).fetchall()
+    assert search('engine', 1) == [('Analytical Engine',)]
+    cursor.execute("INSERT INTO skill (tenant_id, name, percentage, category, position) "
+                   "VALUES (2, 'Zebracoding', 50, 'Languages', 1)")
+    assert search('zebracoding', 2) == [('Zebracoding',)]
+    assert search('zebracoding', 1) == []
+
+
+def test_migrations_are_applied_once(portfolio, old_database):
+    with portfolio.app.app_context():
+        portfolio.apply_migrations(old_database)
+        assert portfolio.apply_migrations(old_database) == []
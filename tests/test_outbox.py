@@ -0,0 +1,99 @@
+"""Mail outbox delivery against a local SMTP server (needs aiosmtpd)."""
+import socket
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+
+REFUSED = 'refused@example.com'
+
+
+class Recorder:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REFUSED:
+            return '550 No such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, envelope.content))
+        return '250 Message accepted'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def mail_config(portfolio):
+    config = portfolio.app.config
+    saved = {key: config[key] for key in ('MAIL_SERVER', 'MAIL_PORT', 'MAIL_USE_TLS',
+                                          'MAIL_USERNAME', 'MAIL_PASSWORD')}
+    portfolio.mail_state['mail'] = None
+    with portfolio.app.app_context():
+        portfolio.db.session.execute(portfolio.outbox_table.delete())
+        portfolio.db.session.commit()
+        yield config
+    config.update(saved)
+    portfolio.mail_state['mail'] = None
+
+
+@pytest.fixture
+def smtp(mail_config):
+    recorder = Recorder()
+    controller = aiosmtpd_controller.Controller(recorder, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    mail_config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=controller.port, MAIL_USE_TLS=False,
+                       MAIL_USERNAME=None, MAIL_PASSWORD=None)
+    yield recorder
+    controller.stop()
+
+
+def queue(portfolio, *messages):
+    for subject, recipient in messages:
+        portfolio.db.session.add(portfolio.OutboxMessage(subject=subject, recipient=recipient, body='Hello'))
+    portfolio.db.session.commit()
+
+
+def statuses(portfolio):
+    rows = portfolio.db.session.execute(
+        portfolio.select(portfolio.outbox_table).order_by(portfolio.outbox_table.c.id)).all()
+    return [(row.recipient, row.status, row.attempts) for row in rows]
+
+
+def test_bad_header_fails_alone_and_nothing_is_resent(portfolio, smtp):
+    queue(portfolio, ('Hi', 'first@example.com'), ('Bad\r\nBcc: victim@example.com', 'bad@example.com'),
+          ('Hi', 'last@example.com'))
+
+    assert portfolio.drain_outbox() == 3
+    assert statuses(portfolio) == [('first@example.com', 'sent', 1), ('bad@example.com', 'failed', 1),
+                                   ('last@example.com', 'sent', 1)]
+    assert sorted(rcpt for rcpts, _ in smtp.messages for rcpt in rcpts) == ['first@example.com',
+                                                                           'last@example.com']
+
+    # Nothing is left claimed, so a later drain has nothing to send again
+    assert portfolio.drain_outbox() == 0
+    assert len(smtp.messages) == 2
+
+
+def test_refused_recipient_is_not_retried(portfolio, smtp):
+    queue(portfolio, ('Hi', REFUSED), ('Hi', 'good@example.com'))
+
+    portfolio.drain_outbox()
+    assert statuses(portfolio) == [(REFUSED, 'failed', 1), ('good@example.com', 'sent', 1)]
+    assert len(smtp.messages) == 1
+
+
+def test_unreachable_server_does_not_use_up_attempts(portfolio, mail_config):
+    # Nothing listens here, so no message is ever handed to a server
+    mail_config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=free_port(), MAIL_USE_TLS=False,
+                       MAIL_USERNAME=None, MAIL_PASSWORD=None)
+    queue(portfolio, ('Hi', 'first@example.com'), ('Hi', 'second@example.com'))
+
+    assert portfolio.drain_outbox() == 2
+    assert statuses(portfolio) == [('first@example.com', 'pending', 0), ('second@example.com', 'pending', 0)]
@@ -0,0 +1,101 @@
+"""Several portfolios from one deployment (MULTI_TENANT)."""
+import pytest
+
+HOST = 'b.example'
+
+
+@pytest.fixture(scope='module')
+def tenant(portfolio):
+    # A second tenant with its own admin, removed again after these tests
+    result = portfolio.app.test_cli_runner().invoke(
+        args=['add-tenant', HOST, '--admin-username', 'bob', '--admin-password', 'bob-secret'])
+    assert result.exit_code == 0, result.output
+    with portfolio.app.app_context():
+        tenant_id = portfolio.Tenant.query.filter_by(host=HOST).one().id
+    yield tenant_id
+    with portfolio.app.app_context(), portfolio.db.engine.begin() as conn:
+        for model in (*portfolio.CONTENT_MODELS, portfolio.Admin):
+            conn.execute(model.__table__.delete().where(model.__table__.c.tenant_id == tenant_id))
+        conn.execute(portfolio.Tenant.__table__.delete().where(portfolio.Tenant.id == tenant_id))
+    portfolio.tenant_state['loaded_at'] = float('-inf')
+
+
+@pytest.fixture
+def multi_tenant(portfolio, tenant, monkeypatch):
+    monkeypatch.setitem(portfolio.app.config, 'MULTI_TENANT', True)
+    portfolio.tenant_state['loaded_at'] = float('-inf')
+    yield tenant
+    portfolio.tenant_state['loaded_at'] = float('-inf')
+
+
+def tenant_client(portfolio):
+    client = portfolio.app.test_client()
+    response = client.post('/admin/login', data={'username': 'bob', 'password': 'bob-secret'},
+                           headers={'Host': HOST})
+    assert response.status_code == 302
+    return client
+
+
+def test_content_and_search_stay_with_their_tenant(portfolio, admin_client, multi_tenant):
+    client = tenant_client(portfolio)
+    response = client.post('/admin/skills/add', headers={'Host': HOST},
+                           data={'name': 'Zebracoding', 'category': 'Languages', 'percentage': '50'})
+    assert response.status_code == 302
+
+    assert b'Zebracoding' in client.get('/', headers={'Host': HOST}).data
+    assert len(client.get('/search?q=zebracoding', headers={'Host': HOST}).json['results']) == 1
+    assert b'Zebracoding' not in admin_client.get('/').data
+    assert admin_client.get('/search?q=zebracoding').json['results'] == []
+    with portfolio.app.app_context():
+        assert portfolio.Skill.query.filter_by(name='Zebracoding').count() == 0
+
+
+def test_unknown_host_is_not_found(portfolio, multi_tenant):
+    assert portfolio.app.test_client().get('/', headers={'Host': 'nobody.example'}).status_code == 404
+
+
+def test_admins_cannot_cross_tenants(portfolio, admin_client, multi_tenant):
+    # The first tenant's password doesn't open the second tenant's admin
+    other = portfolio.app.test_client()
+    response = other.post('/admin/login', data={'username': 'admin', 'password': 'secret'},
+                          headers={'Host': HOST})
+    assert response.status_code == 200
+
+    # Nor does a session from the first tenant's host
+    response = admin_client.get('/admin/dashboard', headers={'Host': HOST})
+    assert response.status_code == 302
+    assert '/admin/login' in response.location
+    assert admin_client.get('/admin/dashboard').status_code == 200
+
+
+def test_moved_host_reaches_running_workers(portfolio, multi_tenant, monkeypatch):
+    client = portfolio.app.test_client()
+    assert client.get('/', headers={'Host': HOST}).status_code == 200
+
+    # Another process moves the host; this worker's copy is now stale
+    with portfolio.app.app_context(), portfolio.db.engine.begin() as conn:
+        conn.execute(portfolio.Tenant.__table__.update().where(portfolio.Tenant.id == multi_tenant)
+                     .values(host='c.example'))
+    try:
+        now = portfolio.time.monotonic() + portfolio.app.config['TENANT_HOSTS_RELOAD'] + 1
+        monkeypatch.setattr(portfolio.time, 'monotonic', lambda: now)
+        assert client.get('/', headers={'Host': HOST}).status_code == 404
+        assert client.get('/', headers={'Host': 'c.example'}).status_code == 200
+    finally:
+        with portfolio.app.app_context(), portfolio.db.engine.begin() as conn:
+            conn.execute(portfolio.Tenant.__table__.update().where(portfolio.Tenant.id == multi_tenant)
+                         .values(host=HOST))
+
+
+def test_uploads_are_served_on_their_own_host_only(portfolio, multi_tenant, tmp_path, monkeypatch):
+    for name in (f'uploads/tenants/{multi_tenant}/ab/photo.png',
+                 f'uploads/variants/tenants/{multi_tenant}/ab/photo-320.webp'):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b'image')
+    monkeypatch.setattr(portfolio.app, 'static_folder', str(tmp_path))
+    client = portfolio.app.test_client()
+    for url in (f'/static/uploads/tenants/{multi_tenant}/ab/photo.png',
+                f'/static/uploads/variants/tenants/{multi_tenant}/ab/photo-320.webp'):
+        assert client.get(url, headers={'Host': HOST}).status_code == 200
+        assert client.get(url).status_code == 404
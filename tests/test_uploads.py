@@ -0,0 +1,26 @@
+"""Starting a chunked upload."""
+import pytest
+
+
+def test_upload_session_is_created(admin_client):
+    response = admin_client.post('/admin/uploads', json={'kind': 'image', 'filename': 'photo.png', 'size': 10})
+    assert response.status_code == 201
+    assert response.json['token']
+
+
+@pytest.mark.parametrize('payload', [
+    [],
+    ['image', 'photo.png', 10],
+    'photo.png',
+    {'kind': 'image', 'filename': 'photo.png'},
+    {'kind': 'image', 'filename': 'photo.png', 'size': -1},
+    {'kind': 'image', 'filename': 'photo.png', 'size': 0},
+    {'kind': 'image', 'filename': 'photo.png', 'size': '10'},
+    {'kind': 'image', 'filename': 'photo.png', 'size': 10.5},
+    {'kind': 'image', 'filename': 'photo.png', 'size': True},
+    {'kind': 'image', 'filename': 'script.exe', 'size': 10},
+])
+def test_bad_payload_is_rejected(admin_client, payload):
+    response = admin_client.post('/admin/uploads', json=payload)
+    assert response.status_code == 400
+    assert 'error' in response.json